@@ -0,0 +1,159 @@
+"""
+Analysis & Training CLI
+=======================
+One entry point for the offline pipelines, with every path configurable:
+
+    python cli.py analyze    --data <dir> --labels <csv> [--output-dir <dir>] [--no-plots]
+    python cli.py train      --data <dir> --labels <csv> [--features <matrix>] [--search] [--onnx]
+    python cli.py thresholds --data DSL-StrongPasswordData.csv [--stream] [--timings]
+    python cli.py export     --data <dir> --labels <csv> [--artifact-dir <dir>] [--onnx]
+
+analyze   ETDD70 statistics, thresholds, distribution plots, web_thresholds_config.js
+train     RF + LR training, feature importance, plots, web_feature_weights.js, artifact
+          (no artifact with --features: the service can't map web metrics onto it)
+thresholds  CMU keystroke thresholds (JSON + keystrokeThresholds.js)
+export    fit the reading classifier and write only the versioned service artifact
+
+Runs are headless by default (Agg backend, figures saved and closed);
+--show opens plot windows instead. Each subcommand imports only what it
+needs, so `thresholds` and `export` never load matplotlib or seaborn.
+Default ETDD70 paths come from ETDD70_DATA_PATH / ETDD70_LABELS_PATH and
+the CMU CSV from KEYSTROKE_DATA_PATH.
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import plotting
+
+ANALYSIS_DIR = Path(__file__).resolve().parent
+BACKEND_SCRIPTS_DIR = ANALYSIS_DIR.parent / 'backend' / 'scripts'
+
+
+def _given(**kwargs):
+    """Only the options set on the command line; the pipelines supply their own defaults."""
+    return {key: value for key, value in kwargs.items() if value is not None}
+
+
+def _add_etdd70_paths(parser):
+    parser.add_argument('--data', type=Path, help='Directory with the Subject_* CSV files (ETDD70_DATA_PATH)')
+    parser.add_argument('--labels', type=Path, help='Path to dyslexia_class_label.csv (ETDD70_LABELS_PATH)')
+    parser.add_argument('--no-cache', action='store_true', help='Re-read every CSV instead of the loader cache')
+
+
+def _add_plot_flags(parser):
+    parser.add_argument('--no-plots', action='store_true', help='Skip plotting entirely')
+    parser.add_argument('--show', action='store_true', help='Open plot windows (needs a display)')
+
+
+def _add_model_flags(parser):
+    parser.add_argument('--artifact-dir', type=Path,
+                        help='Where the versioned reading artifact is written (default ml-models/saved_models)')
+    parser.add_argument('--search', action='store_true', help='Run cross-validated model search')
+    parser.add_argument('--halving', action='store_true', help='Use successive halving in the search')
+    parser.add_argument('--onnx', action='store_true', help='Also export the model as ONNX')
+
+
+def run_analyze(args):
+    import etdd70_analysis
+
+    etdd70_analysis.main(
+        **_given(data_path=args.data, labels_path=args.labels),
+        output_dir=args.output_dir,
+        plots=not args.no_plots,
+        show=args.show,
+        use_cache=not args.no_cache
+    )
+
+
+def run_train(args):
+    import train_ml_model
+
+    train_ml_model.main(
+        search=args.search,
+        halving=args.halving,
+        onnx=args.onnx,
+        **_given(data_path=args.data, labels_path=args.labels, artifact_dir=args.artifact_dir),
+        output_dir=args.output_dir,
+        feature_matrix=args.features,
+        plots=not args.no_plots,
+        show=args.show,
+        export=not args.no_export,
+        use_cache=not args.no_cache
+    )
+
+
+def run_thresholds(args):
+    sys.path.insert(0, str(BACKEND_SCRIPTS_DIR))
+    import analyze_cmu_dataset
+
+    analyze_cmu_dataset.run(
+        **_given(data_path=args.data, json_output=args.json_output, js_output=args.js_output),
+        stream=args.stream, chunksize=args.chunksize, timings=args.timings
+    )
+
+
+def run_export(args):
+    import train_ml_model
+
+    train_ml_model.export_artifact(
+        **_given(data_path=args.data, labels_path=args.labels, artifact_dir=args.artifact_dir),
+        search=args.search,
+        halving=args.halving,
+        onnx=args.onnx,
+        use_cache=not args.no_cache
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Dyslexia detection analysis and training pipelines')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help='ETDD70 statistics, thresholds and web thresholds config')
+    _add_etdd70_paths(analyze)
+    analyze.add_argument('--output-dir', type=Path, default=ANALYSIS_DIR)
+    _add_plot_flags(analyze)
+    analyze.set_defaults(handler=run_analyze)
+
+    train = commands.add_parser('train', help='Train and evaluate the reading classifier')
+    _add_etdd70_paths(train)
+    train.add_argument('--output-dir', type=Path, default=ANALYSIS_DIR,
+                       help='Reports, plots and web_feature_weights.js')
+    train.add_argument('--features', type=Path,
+                       help='Wide feature matrix from etdd70_features.py (evaluation only, not exported)')
+    _add_model_flags(train)
+    train.add_argument('--no-export', action='store_true', help="Don't write the service artifact")
+    _add_plot_flags(train)
+    train.set_defaults(handler=run_train)
+
+    thresholds = commands.add_parser('thresholds', help='Keystroke thresholds from the CMU dataset')
+    thresholds.add_argument('--data', help='Path to DSL-StrongPasswordData.csv (KEYSTROKE_DATA_PATH)')
+    thresholds.add_argument('--json-output', help='Default backend/config/keystrokeThresholds_CMU_DERIVED.json')
+    thresholds.add_argument('--js-output', help='Default backend/config/keystrokeThresholds.js')
+    thresholds.add_argument('--stream', action='store_true', help='Chunked, constant-memory statistics')
+    thresholds.add_argument('--chunksize', type=int, default=100_000, help='Rows per chunk with --stream')
+    thresholds.add_argument('--timings', action='store_true', help='Print wall-clock time per stage')
+    thresholds.set_defaults(handler=run_thresholds)
+
+    export = commands.add_parser('export', help='Fit the reading classifier and write only its artifact')
+    _add_etdd70_paths(export)
+    _add_model_flags(export)
+    export.set_defaults(handler=run_export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not getattr(args, 'show', False):
+        plotting.use_headless()
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
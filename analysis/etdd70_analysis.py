@@ -10,15 +10,14 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 import warnings
+
+import plotting
+from etdd70_loader import DEFAULT_DATA_PATH, DEFAULT_LABELS_PATH, load_subject_features
 warnings.filterwarnings('ignore')
 
-# Set plotting style
-sns.set_style('whitegrid')
-plt.rcParams['figure.figsize'] = (12, 6)
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent
 
 class ETDD70Analyzer:
     def __init__(self, data_path, labels_path):
@@ -45,45 +44,15 @@ class ETDD70Analyzer:
         print(f"  - Non-Dyslexic: {(self.labels_df['class_id'] == 0).sum()}")
         return self.labels_df
     
-    def load_meaningful_text_metrics(self):
+    def load_meaningful_text_metrics(self, use_cache=True):
         """
         Load trial-level metrics from T4_Meaningful_Text for all subjects.
         This is the most relevant task for our web-based reading test.
         """
         print("\nLoading T4_Meaningful_Text metrics...")
-        all_metrics = []
-        
-        for subject_id in self.labels_df['subject_id']:
-            metrics_file = self.data_path / f"Subject_{subject_id}_T4_Meaningful_Text_metrics.csv"
-            
-            if not metrics_file.exists():
-                print(f"  Warning: Missing file for subject {subject_id}")
-                continue
-            
-            try:
-                # Read metrics file
-                df = pd.read_csv(metrics_file)
-                
-                # Extract trial-level features (first row contains trial-level data)
-                trial_data = df.iloc[0][[
-                    'sid', 'n_fix_trial', 'sum_fix_dur_trial', 'mean_fix_dur_trial',
-                    'n_sacc_trial', 'mean_sacc_ampl_trial', 'n_regress_trial',
-                    'n_within_line_regress_trial', 'n_between_line_regress_trial',
-                    'ratio_progress_regress_trial', 'dwell_time_trial'
-                ]].to_dict()
-                
-                # Add label information
-                label_info = self.labels_df[self.labels_df['subject_id'] == subject_id].iloc[0]
-                trial_data['class_id'] = label_info['class_id']
-                trial_data['label'] = label_info['label']
-                
-                all_metrics.append(trial_data)
-                
-            except Exception as e:
-                print(f"  Error processing subject {subject_id}: {e}")
-                continue
-        
-        self.metrics_df = pd.DataFrame(all_metrics)
+        self.metrics_df = load_subject_features(
+            self.data_path, self.labels_path, use_cache=use_cache
+        )
         print(f"✓ Loaded metrics for {len(self.metrics_df)} subjects")
         
         # Separate by class
@@ -182,7 +151,7 @@ class ETDD70Analyzer:
         
         return threshold_df
     
-    def plot_distributions(self, save_path=None):
+    def plot_distributions(self, save_path=None, show=False):
         """Plot distributions of key features for both groups."""
         features = [
             ('n_regress_trial', 'Number of Regressions'),
@@ -191,6 +160,7 @@ class ETDD70Analyzer:
             ('n_fix_trial', 'Number of Fixations')
         ]
         
+        plt = plotting.pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         axes = axes.flatten()
         
@@ -222,13 +192,7 @@ class ETDD70Analyzer:
             ax.grid(alpha=0.3)
         
         plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"\n✓ Saved distribution plots to {save_path}")
-        
-        plt.show()
-        return fig
+        return plotting.finish(fig, save_path, show, label='distribution plots')
     
     def generate_web_thresholds_config(self, output_path=None):
         """
@@ -308,24 +272,22 @@ module.exports = readingThresholds;
         return config
 
 
-def main():
+def main(data_path=DEFAULT_DATA_PATH, labels_path=DEFAULT_LABELS_PATH,
+         output_dir=DEFAULT_OUTPUT_DIR, plots=True, show=False, use_cache=True):
     """Main analysis pipeline."""
     print("="*80)
     print("ETDD70 DYSLEXIA DATASET ANALYSIS")
     print("="*80)
     
-    # Paths
-    data_path = Path("D:/FYP/Code/Eye_Dataset/13332134/data/data")
-    labels_path = Path("D:/FYP/Code/Eye_Dataset/13332134/dyslexia_class_label.csv")
-    output_dir = Path("D:/FYP/Code/dyslexia-detection-system/analysis")
-    output_dir.mkdir(exist_ok=True)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Initialize analyzer
     analyzer = ETDD70Analyzer(data_path, labels_path)
     
     # Step 1: Load data
     analyzer.load_labels()
-    analyzer.load_meaningful_text_metrics()
+    analyzer.load_meaningful_text_metrics(use_cache=use_cache)
     
     # Step 2: Calculate statistics
     stats_df = analyzer.calculate_descriptive_stats()
@@ -336,7 +298,8 @@ def main():
     threshold_df.to_csv(output_dir / "ETDD70_thresholds.csv", index=False)
     
     # Step 4: Generate plots
-    analyzer.plot_distributions(save_path=output_dir / "ETDD70_distributions.png")
+    if plots:
+        analyzer.plot_distributions(save_path=output_dir / "ETDD70_distributions.png", show=show)
     
     # Step 5: Generate web config
     analyzer.generate_web_thresholds_config(
@@ -350,4 +313,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    from cli import main as cli_main
+    sys.exit(cli_main(['analyze', *sys.argv[1:]]))
@@ -0,0 +1,237 @@
+"""
+ETDD70 Multi-Task Feature Extraction
+====================================
+Builds a wide per-subject feature matrix from every task (T1 syllables,
+T4 meaningful text, T5 pseudo-text) and every file type (metrics,
+fixations, saccades and optionally raw samples), instead of only the
+first row of T4 metrics.
+
+Every file is streamed in chunks and reduced with mergeable running
+statistics, so peak memory is bounded by `chunksize` rows per worker
+regardless of how large the raw 250 Hz recordings are. The result is
+written to a columnar store (Parquet when pyarrow is available).
+
+Feature columns are named `<task>__<kind>__<column>__<stat>`; trial-level
+metrics (the `*_trial` columns in the first metrics row) are kept as
+`<task>__trial__<column>`.
+
+Usage:
+    python etdd70_features.py --data <data dir> --labels <label csv> --output features.parquet
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etdd70_loader import has_pyarrow, write_table
+
+TASKS = ['T1_Syllables', 'T4_Meaningful_Text', 'T5_Pseudo_Text']
+FILE_KINDS = ['metrics', 'fixations', 'saccades']
+ALL_FILE_KINDS = FILE_KINDS + ['raw']
+
+STATS = ['mean', 'std', 'min', 'max']
+DEFAULT_CHUNKSIZE = 50_000
+
+# Columns that identify rows rather than describe behaviour
+ID_COLUMNS = {'sid', 'subject_id', 'trial', 'trial_id', 'task'}
+
+
+class RunningStats:
+    """
+    Column-wise count/mean/variance/min/max that can be updated chunk by
+    chunk (Chan et al. parallel merge of Welford accumulators).
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.count = None
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update(self, chunk):
+        """Fold a DataFrame chunk of numeric columns into the accumulator."""
+        self.n_rows += len(chunk)
+        if chunk.shape[1] == 0:
+            return
+
+        count = chunk.count().astype(float)
+        mean = chunk.mean()
+        m2 = ((chunk - mean) ** 2).sum()
+
+        if self.count is None:
+            self.count, self.mean, self.m2 = count, mean.fillna(0.0), m2
+            self.min, self.max = chunk.min(), chunk.max()
+            return
+
+        # Align on the union of columns in case a chunk is missing one
+        cols = self.count.index.union(count.index)
+        n_a = self.count.reindex(cols, fill_value=0.0)
+        n_b = count.reindex(cols, fill_value=0.0)
+        mean_a = self.mean.reindex(cols, fill_value=0.0)
+        mean_b = mean.reindex(cols).fillna(0.0)
+        total = n_a + n_b
+        safe_total = total.where(total > 0, 1.0)
+
+        delta = mean_b - mean_a
+        self.mean = mean_a + delta * n_b / safe_total
+        self.m2 = (
+            self.m2.reindex(cols, fill_value=0.0)
+            + m2.reindex(cols, fill_value=0.0)
+            + delta ** 2 * n_a * n_b / safe_total
+        )
+        self.count = total
+        self.min = pd.concat([self.min.reindex(cols), chunk.min().reindex(cols)], axis=1).min(axis=1)
+        self.max = pd.concat([self.max.reindex(cols), chunk.max().reindex(cols)], axis=1).max(axis=1)
+
+    def to_features(self, prefix):
+        """Flatten into {prefix__column__stat: value}."""
+        features = {f"{prefix}__n_rows": float(self.n_rows)}
+        if self.count is None:
+            return features
+
+        valid = self.count > 0
+        std = np.sqrt(self.m2 / self.count.where(valid, np.nan))
+        mean = self.mean.where(valid, np.nan)
+        for col in self.count.index:
+            features[f"{prefix}__{col}__mean"] = mean[col]
+            features[f"{prefix}__{col}__std"] = std[col]
+            features[f"{prefix}__{col}__min"] = self.min[col]
+            features[f"{prefix}__{col}__max"] = self.max[col]
+        return features
+
+
+def subject_file(data_path, subject_id, task, kind):
+    return Path(data_path) / f"Subject_{subject_id}_{task}_{kind}.csv"
+
+
+def _numeric(chunk):
+    numeric = chunk.select_dtypes(include='number')
+    return numeric.drop(columns=[col for col in numeric.columns if col in ID_COLUMNS])
+
+
+def stream_file_features(path, task, kind, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Reduce one CSV to a flat feature dict without loading it whole.
+
+    For metrics files the trial-level columns come from the first row and
+    the remaining (AOI-level) columns are aggregated across all rows.
+    """
+    prefix = f"{task}__{kind}"
+    stats = RunningStats()
+    features = {}
+    first_chunk = True
+
+    for chunk in pd.read_csv(path, chunksize=chunksize, low_memory=False):
+        numeric = _numeric(chunk)
+
+        if kind == 'metrics':
+            trial_cols = [col for col in numeric.columns if col.endswith('_trial')]
+            if first_chunk and len(numeric):
+                for col, value in numeric.iloc[0][trial_cols].items():
+                    features[f"{task}__trial__{col}"] = value
+            numeric = numeric.drop(columns=trial_cols)
+
+        stats.update(numeric)
+        first_chunk = False
+
+    features.update(stats.to_features(prefix))
+    return features
+
+
+def extract_subject_features(data_path, subject_id, tasks=TASKS, kinds=FILE_KINDS,
+                             chunksize=DEFAULT_CHUNKSIZE):
+    """Wide feature dict for one subject across all tasks and file kinds."""
+    features = {'subject_id': subject_id}
+    for task in tasks:
+        for kind in kinds:
+            path = subject_file(data_path, subject_id, task, kind)
+            if not path.exists():
+                continue
+            try:
+                features.update(stream_file_features(path, task, kind, chunksize))
+            except Exception as e:
+                print(f"  Error processing {path.name}: {e}")
+    return features
+
+
+def build_feature_matrix(data_path, labels_path, tasks=TASKS, kinds=FILE_KINDS,
+                         chunksize=DEFAULT_CHUNKSIZE, max_workers=4, output_path=None):
+    """
+    Extract features for every labelled subject and join their labels.
+
+    Args:
+        data_path: Directory containing the Subject_* CSV files
+        labels_path: Path to dyslexia_class_label.csv
+        tasks: Tasks to include
+        kinds: File kinds to include (add 'raw' for raw gaze samples)
+        chunksize: Rows per CSV chunk; bounds memory per worker
+        max_workers: Subjects processed concurrently
+        output_path: Optional Parquet (or .pkl) path for the columnar store
+
+    Returns:
+        DataFrame with one row per subject, features plus class_id/label
+    """
+    labels_df = pd.read_csv(labels_path)
+    subject_ids = list(labels_df['subject_id'])
+    print(f"Extracting features for {len(subject_ids)} subjects "
+          f"({len(tasks)} tasks x {len(kinds)} file kinds)...")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = list(pool.map(
+            lambda subject_id: extract_subject_features(data_path, subject_id, tasks, kinds, chunksize),
+            subject_ids
+        ))
+
+    features_df = pd.DataFrame(rows)
+    label_cols = [col for col in ('subject_id', 'class_id', 'label') if col in labels_df.columns]
+    df = labels_df[label_cols].merge(features_df, on='subject_id', how='inner')
+
+    # Keep identifiers and labels first, features in a stable order after
+    feature_cols = sorted(col for col in df.columns if col not in label_cols)
+    df = df[label_cols + feature_cols]
+    print(f"✓ Built feature matrix: {df.shape[0]} subjects x {len(feature_cols)} features")
+
+    if output_path:
+        write_table(df, output_path)
+        print(f"✓ Saved feature matrix to {output_path}")
+
+    return df
+
+
+def feature_columns(df):
+    """Feature columns of a matrix produced by build_feature_matrix."""
+    return [col for col in df.columns if col not in ('subject_id', 'class_id', 'label')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract multi-task ETDD70 features')
+    parser.add_argument('--data', required=True, help='Directory with Subject_* CSV files')
+    parser.add_argument('--labels', required=True, help='Path to dyslexia_class_label.csv')
+    default_output = 'etdd70_features.parquet' if has_pyarrow() else 'etdd70_features.pkl'
+    parser.add_argument('--output', default=default_output, help='Columnar output file')
+    parser.add_argument('--tasks', nargs='+', default=TASKS, help='Tasks to include')
+    parser.add_argument('--include-raw', action='store_true', help='Also aggregate raw gaze samples')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='Rows per CSV chunk')
+    parser.add_argument('--workers', type=int, default=4, help='Subjects processed concurrently')
+    args = parser.parse_args()
+
+    build_feature_matrix(
+        args.data, args.labels,
+        tasks=args.tasks,
+        kinds=ALL_FILE_KINDS if args.include_raw else FILE_KINDS,
+        chunksize=args.chunksize,
+        max_workers=args.workers,
+        output_path=args.output
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+ETDD70 Subject Loader
+=====================
+Shared loader for per-subject trial metrics used by both
+etdd70_analysis.py and train_ml_model.py.
+
+Reads only the needed columns of each Subject_*_<task>_metrics.csv in a
+thread pool, joins labels with a single merge and caches the resulting
+feature table on disk. The cache key covers the task, the requested
+columns and the size/mtime of every input file, so re-runs skip CSV
+parsing until a file changes.
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_TASK = 'T4_Meaningful_Text'
+
+# Where the ETDD70 download lives; override with the env vars or --data/--labels
+DEFAULT_DATA_PATH = Path(os.environ.get(
+    'ETDD70_DATA_PATH', 'D:/FYP/Code/Eye_Dataset/13332134/data/data'
+))
+DEFAULT_LABELS_PATH = Path(os.environ.get(
+    'ETDD70_LABELS_PATH', 'D:/FYP/Code/Eye_Dataset/13332134/dyslexia_class_label.csv'
+))
+
+TRIAL_COLUMNS = [
+    'n_fix_trial', 'sum_fix_dur_trial', 'mean_fix_dur_trial',
+    'n_sacc_trial', 'mean_sacc_ampl_trial', 'n_regress_trial',
+    'n_within_line_regress_trial', 'n_between_line_regress_trial',
+    'ratio_progress_regress_trial', 'dwell_time_trial'
+]
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / '.cache'
+
+
+def metrics_file(data_path, subject_id, task=DEFAULT_TASK):
+    """Path of one subject's trial metrics file."""
+    return Path(data_path) / f"Subject_{subject_id}_{task}_metrics.csv"
+
+
+def has_pyarrow():
+    """Parquet support is optional; fall back to pickle without pyarrow."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _cache_key(files, labels_path, task, columns):
+    """Hash of everything that would change the loaded table."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([task, list(columns)]).encode())
+    for path in [Path(labels_path), *files]:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def read_table(path):
+    """Read a table written by write_table."""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def write_table(df, path):
+    """Write a table as Parquet (or pickle for a .pkl path), atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if path.suffix == '.parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    # Atomic rename so a crashed run never leaves a half-written file behind
+    os.replace(tmp_path, path)
+
+
+def _read_first_row(subject_id, path, columns):
+    """Read the trial-level row (first row) of one metrics file."""
+    try:
+        row = pd.read_csv(path, usecols=columns, nrows=1)
+    except Exception as e:
+        print(f"  Error processing subject {subject_id}: {e}")
+        return None
+    row.insert(0, 'subject_id', subject_id)
+    return row
+
+
+def load_subject_features(data_path, labels_path, task=DEFAULT_TASK, columns=None,
+                          cache_dir=DEFAULT_CACHE_DIR, max_workers=8, use_cache=True):
+    """
+    Load one trial-level feature row per labelled subject.
+
+    Args:
+        data_path: Directory containing the Subject_* CSV files
+        labels_path: Path to dyslexia_class_label.csv
+        task: Task name in the file pattern (default T4_Meaningful_Text)
+        columns: Trial columns to read (default TRIAL_COLUMNS + 'sid')
+        cache_dir: Where to keep the cached table, None disables caching
+        max_workers: Thread pool size for CSV reads
+        use_cache: Set False to force re-reading every CSV
+
+    Returns:
+        DataFrame with subject_id, the requested columns, class_id and label,
+        in label-file order
+    """
+    columns = list(columns) if columns else ['sid'] + TRIAL_COLUMNS
+    labels_df = pd.read_csv(labels_path)
+
+    files = {}
+    for subject_id in labels_df['subject_id']:
+        path = metrics_file(data_path, subject_id, task)
+        if path.exists():
+            files[subject_id] = path
+        else:
+            print(f"  Warning: Missing file for subject {subject_id}")
+
+    cache_path = None
+    if use_cache and cache_dir is not None:
+        key = _cache_key(files.values(), labels_path, task, columns)
+        suffix = '.parquet' if has_pyarrow() else '.pkl'
+        cache_path = Path(cache_dir) / f"etdd70_{task}_{key}{suffix}"
+        if cache_path.exists():
+            print(f"✓ Using cached features from {cache_path}")
+            return read_table(cache_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = list(pool.map(
+            lambda item: _read_first_row(item[0], item[1], columns),
+            files.items()
+        ))
+
+    rows = [row for row in rows if row is not None]
+    if rows:
+        features_df = pd.concat(rows, ignore_index=True)
+    else:
+        features_df = pd.DataFrame(columns=['subject_id'] + columns)
+
+    label_cols = [col for col in ('subject_id', 'class_id', 'label') if col in labels_df.columns]
+    df = labels_df[label_cols].merge(features_df, on='subject_id', how='inner')
+    df = df[['subject_id'] + columns + label_cols[1:]]
+
+    if cache_path is not None:
+        write_table(df, cache_path)
+
+    return df
@@ -0,0 +1,174 @@
+"""
+Model Artifact Export
+=====================
+Writes the trained ETDD70 reading classifier as a single versioned
+artifact that the FastAPI service can load (ml-models/reading/artifact.py).
+
+Artifact layout (joblib, uncompressed so numpy arrays can be memory-mapped):
+    {
+        'format_version': 1,
+        'name': 'reading_classifier',
+        'version': '20260115-142301-048213',
+        'created_at': ISO timestamp,
+        'model_type': estimator class name,
+        'feature_names': [...],   # column order expected by the scaler
+        'scaler': fitted StandardScaler,
+        'model': fitted classifier,
+        'metrics': {...},
+        'proxy_constants': {...}  # web-proxy -> eye-tracking conversions
+    }
+
+A JSON sidecar with everything except the estimators is written next to it,
+plus an optional ONNX export of scaler + model.
+
+The service rebuilds exactly SERVICE_FEATURES from web metrics, so only a
+model trained on those columns can be exported; a model fitted on the wide
+etdd70_features.py matrix would be hot-reloaded and fail every request.
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+
+from etdd70_loader import TRIAL_COLUMNS
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_NAME = 'reading_classifier'
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parents[1] / 'ml-models' / 'saved_models'
+
+# Same list as MAPPED_FEATURES in ml-models/reading/features.py
+SERVICE_FEATURES = list(TRIAL_COLUMNS)
+
+
+def _to_builtin(value):
+    """numpy scalars -> plain Python for the JSON sidecar."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def compute_proxy_constants(df):
+    """
+    Conversion constants used by ml-models/reading/features.py to rebuild
+    eye-tracking features from web metrics, measured on the training data.
+    Constants the data can't inform keep the service-side defaults.
+    """
+    constants = {}
+    if {'sum_fix_dur_trial', 'dwell_time_trial'} <= set(df.columns):
+        constants['fixation_share_of_dwell'] = float(
+            df['sum_fix_dur_trial'].sum() / df['dwell_time_trial'].sum()
+        )
+    if 'mean_fix_dur_trial' in df.columns:
+        constants['mean_fix_dur'] = float(df['mean_fix_dur_trial'].mean())
+    if 'mean_sacc_ampl_trial' in df.columns:
+        constants['mean_sacc_ampl'] = float(df['mean_sacc_ampl_trial'].mean())
+    if {'n_within_line_regress_trial', 'n_regress_trial'} <= set(df.columns):
+        total_regress = df['n_regress_trial'].sum()
+        if total_regress > 0:
+            constants['within_line_regress_share'] = float(
+                df['n_within_line_regress_trial'].sum() / total_regress
+            )
+    return constants
+
+
+def export_onnx(scaler, model, n_features, path):
+    """Export scaler + model as one ONNX graph; needs skl2onnx."""
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        print("  Warning: skl2onnx not installed, skipping ONNX export")
+        return None
+
+    from sklearn.pipeline import make_pipeline
+
+    onnx_model = convert_sklearn(
+        make_pipeline(scaler, model),
+        initial_types=[('input', FloatTensorType([None, n_features]))],
+        options={id(model): {'zipmap': False}}
+    )
+    with open(path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    return path
+
+
+def export_reading_artifact(scaler, model, feature_names, metrics,
+                            output_dir=DEFAULT_OUTPUT_DIR, onnx=False, version=None,
+                            proxy_constants=None):
+    """
+    Save a versioned reading-classifier artifact.
+
+    Returns:
+        Path of the written .joblib artifact
+
+    Raises:
+        ValueError: if feature_names aren't SERVICE_FEATURES
+        FileExistsError: if that version already exists
+    """
+    if list(feature_names) != SERVICE_FEATURES:
+        raise ValueError(
+            f"The ML service can only score {SERVICE_FEATURES}; a model trained on "
+            f"{len(feature_names)} other columns must not be exported"
+        )
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    created_at = datetime.now()
+    # Microseconds so two exports in the same second don't collide
+    version = version or created_at.strftime('%Y%m%d-%H%M%S-%f')
+    stem = f"{ARTIFACT_NAME}_v{version}"
+    artifact_path = output_dir / f"{stem}.joblib"
+    sidecar_path = output_dir / f"{stem}.json"
+
+    # Same protocol as ml-models/serving/artifacts.py: creating the sidecar's
+    # temp file exclusively reserves the version against a concurrent export
+    sidecar_tmp = sidecar_path.with_name(sidecar_path.name + '.tmp')
+    try:
+        reservation = open(sidecar_tmp, 'x')
+    except FileExistsError:
+        raise FileExistsError(f"{stem} is already being written in {output_dir}") from None
+
+    metadata = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'name': ARTIFACT_NAME,
+        'version': version,
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'model_type': type(model).__name__,
+        'feature_names': list(feature_names),
+        'metrics': {k: _to_builtin(v) for k, v in metrics.items()},
+        'proxy_constants': dict(proxy_constants or {}),
+    }
+
+    tmp_path = artifact_path.with_name(artifact_path.name + '.tmp')
+    published = False
+    try:
+        with reservation:
+            if artifact_path.exists() or sidecar_path.exists():
+                raise FileExistsError(f"{stem} already exists in {output_dir}; refusing to overwrite it")
+
+            # compress=0 keeps arrays mmap-able at load time
+            joblib.dump({**metadata, 'scaler': scaler, 'model': model}, tmp_path, compress=0)
+
+            if onnx:
+                onnx_path = export_onnx(scaler, model, len(feature_names), output_dir / f"{stem}.onnx")
+                metadata['onnx_file'] = onnx_path.name if onnx_path else None
+
+            json.dump(metadata, reservation, indent=2)
+
+        os.replace(sidecar_tmp, sidecar_path)
+        # Publish the artifact last so a watcher never sees it without its sidecar
+        os.replace(tmp_path, artifact_path)
+        published = True
+    finally:
+        if not published:
+            sidecar_tmp.unlink(missing_ok=True)
+            tmp_path.unlink(missing_ok=True)
+    print(f"✓ Saved model artifact {stem} to {output_dir}")
+    return artifact_path
@@ -0,0 +1,159 @@
+"""
+Cross-Validated Model Search
+============================
+Randomized/grid search over Random Forest, Logistic Regression and
+Gradient Boosting for the ETDD70 classifier.
+
+- Repeated stratified K-fold CV, scaler fitted inside each fold
+- Candidates evaluated in parallel on all cores through joblib
+- Optional successive halving, using the number of CV repeats as the
+  budget (samples are too few at n=70 to halve on)
+- Each (model, params, repeats) score is cached with joblib.Memory, so an
+  interrupted search resumes where it stopped instead of restarting
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Memory, Parallel, delayed
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import (
+    ParameterGrid, ParameterSampler, RepeatedStratifiedKFold, cross_val_score
+)
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / '.cache' / 'model_search'
+
+MODEL_FACTORIES = {
+    'random_forest': lambda params: RandomForestClassifier(
+        random_state=42, class_weight='balanced', **params
+    ),
+    'logistic_regression': lambda params: LogisticRegression(
+        max_iter=1000, random_state=42, class_weight='balanced', **params
+    ),
+    'gradient_boosting': lambda params: GradientBoostingClassifier(
+        random_state=42, **params
+    ),
+}
+
+SEARCH_SPACES = {
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [None, 5, 10, 20],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 'log2', None],
+    },
+    'logistic_regression': {
+        'C': [0.01, 0.1, 1.0, 10.0, 100.0],
+        'penalty': ['l2'],
+        'solver': ['lbfgs', 'liblinear'],
+    },
+    'gradient_boosting': {
+        'n_estimators': [50, 100, 200],
+        'learning_rate': [0.01, 0.05, 0.1, 0.2],
+        'max_depth': [2, 3, 4],
+        'subsample': [0.7, 0.85, 1.0],
+    },
+}
+
+
+def build_pipeline(model_name, params):
+    """Scaler + estimator, so scaling is fitted inside every CV fold."""
+    return make_pipeline(StandardScaler(), MODEL_FACTORIES[model_name](params))
+
+
+def evaluate_candidate(model_name, params, X, y, n_splits, n_repeats, scoring, random_state):
+    """Repeated stratified CV scores for one parameter set."""
+    cv = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    scores = cross_val_score(build_pipeline(model_name, params), X, y, cv=cv, scoring=scoring, n_jobs=1)
+    return {'mean_score': float(np.mean(scores)), 'std_score': float(np.std(scores))}
+
+
+def generate_candidates(models=None, n_iter=None, random_state=42):
+    """
+    (model_name, params) pairs to evaluate.
+
+    Args:
+        models: Subset of SEARCH_SPACES keys (default all)
+        n_iter: Random samples per model; None means the full grid
+    """
+    candidates = []
+    for model_name in models or SEARCH_SPACES:
+        space = SEARCH_SPACES[model_name]
+        if n_iter is None:
+            param_sets = ParameterGrid(space)
+        else:
+            grid_size = len(ParameterGrid(space))
+            param_sets = ParameterSampler(space, n_iter=min(n_iter, grid_size), random_state=random_state)
+        candidates.extend((model_name, dict(params)) for params in param_sets)
+    return candidates
+
+
+def run_model_search(X, y, models=None, n_iter=20, n_splits=5, n_repeats=3,
+                     halving=False, halving_factor=3, min_repeats=1,
+                     scoring='roc_auc', n_jobs=-1, cache_dir=DEFAULT_CACHE_DIR,
+                     random_state=42, verbose=True):
+    """
+    Evaluate candidates and return a results table sorted best-first.
+
+    Args:
+        X, y: Feature matrix and labels (unscaled)
+        models: Model families to search (default all)
+        n_iter: Random candidates per family, None for the full grid
+        n_splits: Folds per CV repeat
+        n_repeats: CV repeats for the final (or only) round
+        halving: Use successive halving over CV repeats
+        halving_factor: Keep 1/factor of candidates each halving round
+        min_repeats: CV repeats in the first halving round
+        scoring: sklearn scoring name
+        n_jobs: joblib workers (-1 = all cores)
+        cache_dir: joblib.Memory location, None disables caching
+
+    Returns:
+        DataFrame with model, params, repeats, mean_score, std_score
+    """
+    memory = Memory(location=str(cache_dir) if cache_dir else None, verbose=0)
+    evaluate = memory.cache(evaluate_candidate)
+    candidates = generate_candidates(models, n_iter, random_state)
+
+    def score_round(round_candidates, repeats):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(evaluate)(name, params, X, y, n_splits, repeats, scoring, random_state)
+            for name, params in round_candidates
+        )
+        return [
+            {'model': name, 'params': params, 'repeats': repeats, **result}
+            for (name, params), result in zip(round_candidates, results)
+        ]
+
+    history = []
+    if halving:
+        repeats = max(1, min_repeats)
+        while True:
+            if verbose:
+                print(f"  Halving round: {len(candidates)} candidates x {repeats} CV repeats")
+            round_results = score_round(candidates, repeats)
+            history.extend(round_results)
+            if len(candidates) <= 1 or repeats >= n_repeats:
+                break
+            round_results.sort(key=lambda r: r['mean_score'], reverse=True)
+            keep = max(1, math.ceil(len(candidates) / halving_factor))
+            candidates = [(r['model'], r['params']) for r in round_results[:keep]]
+            repeats = min(n_repeats, repeats * halving_factor)
+    else:
+        if verbose:
+            print(f"  Evaluating {len(candidates)} candidates x {n_repeats} CV repeats")
+        history = score_round(candidates, n_repeats)
+
+    results_df = pd.DataFrame(history)
+    # Rank on the most thorough evaluation each candidate received
+    results_df = results_df.sort_values(['repeats', 'mean_score'], ascending=[False, False])
+    return results_df.reset_index(drop=True)
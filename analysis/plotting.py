@@ -0,0 +1,65 @@
+"""
+Plotting helpers shared by the analysis scripts.
+
+matplotlib and seaborn are only imported when the first figure is drawn,
+so loading, training and exporting never pay for them. Headless runs
+(no display, MPLBACKEND=Agg, or use_headless()) get the non-interactive
+Agg backend, and figures are closed after saving instead of blocking in
+plt.show() unless a window was explicitly asked for.
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import os
+import sys
+
+_plt = None
+
+
+def use_headless():
+    """Force the Agg backend; call before the first plot."""
+    os.environ['MPLBACKEND'] = 'Agg'
+    if 'matplotlib' in sys.modules:
+        sys.modules['matplotlib'].use('Agg')
+
+
+def is_headless():
+    if os.environ.get('MPLBACKEND', '').lower() == 'agg':
+        return True
+    if sys.platform.startswith('linux'):
+        return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return False
+
+
+def pyplot():
+    """matplotlib.pyplot with the project style applied (imported on first call)."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        if is_headless():
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        seaborn().set_style('whitegrid')
+        plt.rcParams['figure.figsize'] = (12, 6)
+        _plt = plt
+    return _plt
+
+
+def seaborn():
+    import seaborn as sns
+    return sns
+
+
+def finish(fig, save_path=None, show=False, label='plot'):
+    """Save `fig` if a path is given, then show it (interactive only) or close it."""
+    plt = pyplot()
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        print(f"✓ Saved {label} to {save_path}")
+    if show and not is_headless():
+        plt.show()
+    else:
+        plt.close(fig)
+    return fig
@@ -0,0 +1,194 @@
+"""
+Synthetic ETDD70 Dataset Generator
+==================================
+Writes data in the ETDD70 layout so the analysis and training pipelines
+can run (and be benchmarked) without the real recordings:
+
+    <output>/dyslexia_class_label.csv
+    <output>/data/Subject_<id>_T4_Meaningful_Text_metrics.csv
+
+Trial-level features are drawn per class around the published ETDD70
+group means and standard deviations. `separation` scales the gap between
+the classes: 0 makes them indistinguishable, 1 matches ETDD70, and
+larger values exaggerate it. Subjects are generated and written in blocks,
+so memory stays flat however many subjects are requested.
+
+Usage:
+    python synthetic_etdd70.py --output synthetic_etdd70 --subjects 7000 --separation 0.5
+
+Author: FYP Project
+Date: January 2026
+"""
+
+import argparse
+import csv
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etdd70_loader import DEFAULT_TASK, TRIAL_COLUMNS, metrics_file
+
+# ETDD70 group statistics (ETDD70_descriptive_stats.csv):
+# feature -> (dyslexic mean, dyslexic std, non-dyslexic mean, non-dyslexic std)
+ETDD70_CLASS_STATS = {
+    'n_fix_trial': (276.26, 82.36, 179.86, 25.17),
+    'sum_fix_dur_trial': (141971.16, 73438.00, 64419.05, 17245.60),
+    'mean_fix_dur_trial': (489.43, 113.36, 355.25, 63.00),
+    'n_regress_trial': (31.91, 11.49, 17.86, 6.97),
+    'mean_sacc_ampl_trial': (73.80, 17.41, 93.47, 18.60),
+    'dwell_time_trial': (151835.39, 77493.81, 70398.18, 17704.00),
+}
+
+AOI_COLUMNS = ['dwell_time_aoi', 'n_fix_aoi', 'n_revisits_aoi', 'skipped_aoi', 'first_fix_dur_aoi']
+LABELS = {0: 'non-dyslexic', 1: 'dyslexic'}
+FIRST_SUBJECT_ID = 1001
+DEFAULT_BLOCK_SIZE = 10_000
+
+
+def class_parameters(separation=1.0):
+    """Per-feature (dyslexic mean, dyslexic std, non-dyslexic mean, non-dyslexic std)."""
+    params = {}
+    for feature, (d_mean, d_std, n_mean, n_std) in ETDD70_CLASS_STATS.items():
+        params[feature] = (
+            n_mean + separation * (d_mean - n_mean),
+            max(n_std + separation * (d_std - n_std), n_std * 0.1),
+            n_mean,
+            n_std,
+        )
+    return params
+
+
+def class_ids(start, n, dyslexic_fraction):
+    """Deterministic interleaving that hits `dyslexic_fraction` exactly over any prefix."""
+    index = np.arange(start, start + n)
+    return (np.floor((index + 1) * dyslexic_fraction) > np.floor(index * dyslexic_fraction)).astype(np.int64)
+
+
+def subject_blocks(n_subjects, separation=1.0, dyslexic_fraction=0.5, seed=42,
+                   block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yield DataFrames of up to `block_size` subjects with subject_id, sid,
+    the TRIAL_COLUMNS, class_id and label, i.e. what load_subject_features
+    returns for the real data.
+    """
+    rng = np.random.default_rng(seed)
+    params = class_parameters(separation)
+
+    for start in range(0, n_subjects, block_size):
+        n = min(block_size, n_subjects - start)
+        class_id = class_ids(start, n, dyslexic_fraction)
+        dyslexic = class_id == 1
+
+        block = {'subject_id': np.arange(FIRST_SUBJECT_ID + start, FIRST_SUBJECT_ID + start + n)}
+        block['sid'] = block['subject_id']
+        for feature, (d_mean, d_std, n_mean, n_std) in params.items():
+            block[feature] = np.abs(rng.normal(np.where(dyslexic, d_mean, n_mean), np.where(dyslexic, d_std, n_std)))
+
+        n_fix = np.round(block['n_fix_trial'])
+        n_regress = np.round(block['n_regress_trial'])
+        within = np.round(n_regress * rng.uniform(0.7, 0.9, n))
+        block['n_fix_trial'] = n_fix
+        block['n_regress_trial'] = n_regress
+        block['n_sacc_trial'] = np.maximum(n_fix - 1, 0)
+        block['n_within_line_regress_trial'] = within
+        block['n_between_line_regress_trial'] = n_regress - within
+        block['ratio_progress_regress_trial'] = (block['n_sacc_trial'] - n_regress) / np.maximum(n_regress, 1)
+        # Fixations can't take longer than the time spent on the text
+        block['dwell_time_trial'] = np.maximum(block['dwell_time_trial'], block['sum_fix_dur_trial'])
+
+        block['class_id'] = class_id
+        block['label'] = np.where(dyslexic, LABELS[1], LABELS[0])
+        yield pd.DataFrame(block)[['subject_id', 'sid'] + TRIAL_COLUMNS + ['class_id', 'label']]
+
+
+def _fmt(value):
+    return '' if np.isnan(value) else f"{value:.4f}".rstrip('0').rstrip('.')
+
+
+def _write_metrics_file(path, sid, trial, aoi):
+    """First row holds the trial-level values, the remaining rows one AOI each."""
+    blank_trial = [''] * len(trial)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['sid', 'aoi'] + TRIAL_COLUMNS + AOI_COLUMNS)
+        writer.writerow([sid, 0] + [_fmt(v) for v in trial] + [''] * len(AOI_COLUMNS))
+        for i, row in enumerate(aoi, start=1):
+            writer.writerow([sid, i] + blank_trial + [_fmt(v) for v in row])
+
+
+def aoi_measures(block, aoi_rows, rng):
+    """(n_subjects, aoi_rows, len(AOI_COLUMNS)) per-word measures consistent with the trial totals."""
+    n = len(block)
+    share = rng.dirichlet(np.ones(aoi_rows), n)
+    dwell = share * block['dwell_time_trial'].to_numpy()[:, None]
+    n_fix = rng.poisson(share * block['n_fix_trial'].to_numpy()[:, None])
+    revisits = rng.poisson(share * block['n_regress_trial'].to_numpy()[:, None])
+    skipped = (n_fix == 0).astype(np.float64)
+    first_fix = np.where(
+        skipped == 1, np.nan,
+        rng.gamma(4.0, block['mean_fix_dur_trial'].to_numpy()[:, None] / 4, (n, aoi_rows))
+    )
+    return np.stack([dwell, n_fix, revisits, skipped, first_fix], axis=2)
+
+
+def write_etdd70_dataset(output_dir, n_subjects, separation=1.0, dyslexic_fraction=0.5,
+                         aoi_rows=5, task=DEFAULT_TASK, seed=42, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Write the label file and one metrics CSV per subject.
+
+    Returns:
+        (data_dir, labels_path)
+    """
+    output_dir = Path(output_dir)
+    data_dir = output_dir / 'data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    labels_path = output_dir / 'dyslexia_class_label.csv'
+    # Separate stream so the subject rows match subject_blocks(seed) exactly
+    aoi_rng = np.random.default_rng(seed + 1)
+
+    tmp_path = labels_path.with_name(labels_path.name + '.tmp')
+    with open(tmp_path, 'w', newline='') as labels_file:
+        labels = csv.writer(labels_file)
+        labels.writerow(['subject_id', 'class_id', 'label'])
+        for block in subject_blocks(n_subjects, separation, dyslexic_fraction, seed, block_size):
+            aoi = aoi_measures(block, aoi_rows, aoi_rng)
+            trial = block[TRIAL_COLUMNS].to_numpy(dtype=np.float64)
+            for i, (subject_id, sid, class_id, label) in enumerate(
+                block[['subject_id', 'sid', 'class_id', 'label']].itertuples(index=False)
+            ):
+                _write_metrics_file(metrics_file(data_dir, subject_id, task), sid, trial[i], aoi[i])
+                labels.writerow([subject_id, class_id, label])
+
+    # The label file appears last, so an interrupted run is never mistaken for a complete one
+    os.replace(tmp_path, labels_path)
+    return data_dir, labels_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic ETDD70-shaped dataset')
+    parser.add_argument('--output', required=True, help='Directory for data/ and dyslexia_class_label.csv')
+    parser.add_argument('--subjects', type=int, default=70)
+    parser.add_argument('--separation', type=float, default=1.0,
+                        help='Class gap relative to ETDD70 (0 = none, 1 = ETDD70)')
+    parser.add_argument('--dyslexic-fraction', type=float, default=0.5)
+    parser.add_argument('--aoi-rows', type=int, default=5, help='AOI rows per metrics file')
+    parser.add_argument('--task', default=DEFAULT_TASK)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    data_dir, labels_path = write_etdd70_dataset(
+        args.output, args.subjects,
+        separation=args.separation,
+        dyslexic_fraction=args.dyslexic_fraction,
+        aoi_rows=args.aoi_rows,
+        task=args.task,
+        seed=args.seed
+    )
+    print(f"✓ Wrote {args.subjects} subjects to {data_dir}")
+    print(f"✓ Labels: {labels_path}")
+
+
+if __name__ == "__main__":
+    main()
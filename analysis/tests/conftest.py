@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the analysis pipeline tests: a small synthetic ETDD70
+dataset (synthetic_etdd70.py) and a headless matplotlib backend.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ANALYSIS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ANALYSIS_DIR))
+os.environ['MPLBACKEND'] = 'Agg'
+
+
+@pytest.fixture(scope='session')
+def etdd70_dataset(tmp_path_factory):
+    """(data_dir, labels_path) of 80 synthetic subjects with ETDD70-like class separation."""
+    from synthetic_etdd70 import write_etdd70_dataset
+
+    return write_etdd70_dataset(tmp_path_factory.mktemp('etdd70'), 80, seed=7)
@@ -0,0 +1,91 @@
+import joblib
+import pytest
+from sklearn.metrics import accuracy_score, roc_auc_score
+
+from train_ml_model import load_classifier
+
+
+@pytest.fixture
+def classifier(etdd70_dataset):
+    data_dir, labels_path = etdd70_dataset
+    return load_classifier(data_dir, labels_path, use_cache=False)
+
+
+def test_export_without_search_describes_the_random_forest(classifier, tmp_path):
+    classifier.fit_random_forest()
+    path = classifier.export_model(output_dir=tmp_path)
+
+    artifact = joblib.load(path)
+    rf = classifier.rf_model
+    assert artifact['model_type'] == 'RandomForestClassifier'
+    assert artifact['metrics']['model'] == 'RandomForestClassifier'
+    assert artifact['metrics']['test_accuracy'] == pytest.approx(
+        accuracy_score(classifier.y_test, rf.predict(classifier.X_test_scaled))
+    )
+
+
+def test_export_after_search_describes_the_search_winner(classifier, tmp_path):
+    classifier.fit_random_forest()
+    classifier.evaluate_random_forest()
+    classifier.search_models(n_iter=1, n_repeats=1, n_jobs=1, cache_dir=tmp_path / 'search')
+    path = classifier.export_model(output_dir=tmp_path, extra_metrics={'logistic_regression_accuracy': 0.5})
+
+    artifact = joblib.load(path)
+    winner = classifier.best_model
+    metrics = artifact['metrics']
+    assert artifact['model_type'] == metrics['model'] == type(winner[-1]).__name__
+    assert metrics['test_accuracy'] == pytest.approx(
+        accuracy_score(classifier.y_test, winner.predict(classifier.X_test))
+    )
+    assert metrics['auc_roc'] == pytest.approx(
+        roc_auc_score(classifier.y_test, winner.predict_proba(classifier.X_test)[:, 1])
+    )
+    assert metrics['logistic_regression_accuracy'] == 0.5
+
+
+def test_export_refuses_features_the_service_cannot_build(classifier, tmp_path):
+    from model_export import export_reading_artifact
+
+    classifier.fit_random_forest()
+    wide_names = [f"T1_{name}" for name in classifier.feature_names]
+    with pytest.raises(ValueError, match='can only score'):
+        export_reading_artifact(classifier.scaler, classifier.rf_model, wide_names, {}, output_dir=tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_export_never_overwrites_a_version(classifier, tmp_path):
+    from model_export import SERVICE_FEATURES, export_reading_artifact
+
+    classifier.fit_random_forest()
+    args = (classifier.scaler, classifier.rf_model, SERVICE_FEATURES, {})
+    first = export_reading_artifact(*args, output_dir=tmp_path, version='1')
+    with pytest.raises(FileExistsError, match='already exists'):
+        export_reading_artifact(*args, output_dir=tmp_path, version='1')
+
+    # A concurrent export holding the reservation blocks this one
+    (tmp_path / 'reading_classifier_v2.json.tmp').touch()
+    with pytest.raises(FileExistsError, match='being written'):
+        export_reading_artifact(*args, output_dir=tmp_path, version='2')
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        first.name, 'reading_classifier_v1.json', 'reading_classifier_v2.json.tmp'
+    ]
+
+
+def test_train_with_a_wide_matrix_skips_the_artifact(classifier, etdd70_dataset, tmp_path):
+    from cli import main as cli_main
+    from etdd70_loader import write_table
+
+    data_dir, labels_path = etdd70_dataset
+    wide = classifier.df.rename(columns={name: f"T4_{name}_mean" for name in classifier.feature_names})
+    matrix_path = tmp_path / 'features.pkl'
+    write_table(wide, matrix_path)
+
+    artifact_dir = tmp_path / 'artifacts'
+    cli_main([
+        'train', '--data', str(data_dir), '--labels', str(labels_path), '--no-cache',
+        '--features', str(matrix_path), '--artifact-dir', str(artifact_dir),
+        '--output-dir', str(tmp_path / 'reports'), '--no-plots',
+    ])
+
+    assert (tmp_path / 'reports' / 'model_summary.csv').exists()
+    assert not artifact_dir.exists() or not list(artifact_dir.iterdir())
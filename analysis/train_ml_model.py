@@ -12,8 +12,6 @@ Date: January 2026
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.ensemble import RandomForestClassifier
@@ -26,9 +24,17 @@ from sklearn.metrics import (
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set plotting style
-sns.set_style('whitegrid')
-plt.rcParams['figure.figsize'] = (12, 6)
+import plotting
+from etdd70_loader import (
+    DEFAULT_DATA_PATH, DEFAULT_LABELS_PATH, TRIAL_COLUMNS, load_subject_features, read_table
+)
+from etdd70_features import feature_columns
+from model_export import (
+    export_reading_artifact, compute_proxy_constants, DEFAULT_OUTPUT_DIR as DEFAULT_ARTIFACT_DIR, SERVICE_FEATURES
+)
+from model_search import run_model_search, build_pipeline, DEFAULT_CACHE_DIR as DEFAULT_SEARCH_CACHE_DIR
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent
 
 
 class DyslexiaClassifier:
@@ -46,60 +52,49 @@ class DyslexiaClassifier:
         self.scaler = StandardScaler()
         self.rf_model = None
         self.lr_model = None
+        self.best_model = None
+        self.rf_metrics = None
+        self.search_results = None
         self.feature_names = None
         
-    def load_and_prepare_data(self):
+    def load_and_prepare_data(self, use_cache=True):
         """Load data and prepare features."""
         print("Loading data...")
         
-        # Load labels
-        labels_df = pd.read_csv(self.labels_path)
-        
-        # Load metrics for all subjects
-        all_data = []
-        for subject_id in labels_df['subject_id']:
-            metrics_file = self.data_path / f"Subject_{subject_id}_T4_Meaningful_Text_metrics.csv"
-            
-            if not metrics_file.exists():
-                continue
-                
-            try:
-                df = pd.read_csv(metrics_file)
-                trial_data = df.iloc[0][[
-                    'n_fix_trial', 'sum_fix_dur_trial', 'mean_fix_dur_trial',
-                    'n_sacc_trial', 'mean_sacc_ampl_trial', 'n_regress_trial',
-                    'n_within_line_regress_trial', 'n_between_line_regress_trial',
-                    'ratio_progress_regress_trial', 'dwell_time_trial'
-                ]].to_dict()
-                
-                # Add label
-                label_info = labels_df[labels_df['subject_id'] == subject_id].iloc[0]
-                trial_data['class_id'] = label_info['class_id']
-                trial_data['subject_id'] = subject_id
-                
-                all_data.append(trial_data)
-            except Exception as e:
-                print(f"  Error processing subject {subject_id}: {e}")
-                continue
-        
-        self.df = pd.DataFrame(all_data)
+        self.df = load_subject_features(
+            self.data_path, self.labels_path,
+            columns=TRIAL_COLUMNS, use_cache=use_cache
+        )
         print(f"✓ Loaded {len(self.df)} subjects")
         print(f"  - Dyslexic: {(self.df['class_id'] == 1).sum()}")
         print(f"  - Non-Dyslexic: {(self.df['class_id'] == 0).sum()}")
         
         # Prepare features and target
-        self.feature_names = [
-            'n_fix_trial', 'sum_fix_dur_trial', 'mean_fix_dur_trial',
-            'n_sacc_trial', 'mean_sacc_ampl_trial', 'n_regress_trial',
-            'n_within_line_regress_trial', 'n_between_line_regress_trial',
-            'ratio_progress_regress_trial', 'dwell_time_trial'
-        ]
+        self.feature_names = list(TRIAL_COLUMNS)
         
         self.X = self.df[self.feature_names].values
         self.y = self.df['class_id'].values
         
         return self.df
     
+    def load_feature_matrix(self, matrix_path):
+        """
+        Load a wide multi-task feature matrix written by etdd70_features.py
+        instead of the T4 trial-level columns.
+        """
+        print(f"Loading feature matrix from {matrix_path}...")
+        
+        self.df = read_table(matrix_path)
+        self.feature_names = feature_columns(self.df)
+        
+        # Not every subject has every task/file; impute with column medians
+        features = self.df[self.feature_names]
+        self.X = features.fillna(features.median()).fillna(0).values
+        self.y = self.df['class_id'].values
+        
+        print(f"✓ Loaded {len(self.df)} subjects x {len(self.feature_names)} features")
+        return self.df
+    
     def split_and_scale_data(self, test_size=0.3, random_state=42):
         """Split data into train/test and scale features."""
         print("\nSplitting and scaling data...")
@@ -121,6 +116,11 @@ class DyslexiaClassifier:
         print("TRAINING RANDOM FOREST CLASSIFIER")
         print("="*80)
         
+        self.fit_random_forest()
+        return self.evaluate_random_forest()
+    
+    def fit_random_forest(self):
+        """Fit the Random Forest on the scaled training split."""
         self.rf_model = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
@@ -129,14 +129,23 @@ class DyslexiaClassifier:
             random_state=42,
             class_weight='balanced'
         )
-        
-        # Train model
         self.rf_model.fit(self.X_train_scaled, self.y_train)
-        
+        return self.rf_model
+    
+    def evaluate_random_forest(self):
+        """Train/test accuracy, AUC-ROC and 5-fold CV accuracy of the fitted forest."""
+        self.rf_metrics = self.evaluate_model(self.rf_model, self.X_train_scaled, self.X_test_scaled)
+        return self.rf_metrics
+    
+    def evaluate_model(self, estimator, X_train, X_test):
+        """
+        Train/test accuracy, AUC-ROC and 5-fold CV accuracy of a fitted
+        estimator on the given (already transformed, if needed) splits.
+        """
         # Predictions
-        y_pred_train = self.rf_model.predict(self.X_train_scaled)
-        y_pred_test = self.rf_model.predict(self.X_test_scaled)
-        y_pred_proba = self.rf_model.predict_proba(self.X_test_scaled)[:, 1]
+        y_pred_train = estimator.predict(X_train)
+        y_pred_test = estimator.predict(X_test)
+        y_pred_proba = estimator.predict_proba(X_test)[:, 1]
         
         # Evaluate
         train_acc = accuracy_score(self.y_train, y_pred_train)
@@ -153,8 +162,8 @@ class DyslexiaClassifier:
         
         # Cross-validation
         cv_scores = cross_val_score(
-            self.rf_model, self.X_train_scaled, self.y_train, 
-            cv=StratifiedKFold(n_splits=5), scoring='accuracy'
+            estimator, X_train, self.y_train, 
+            cv=StratifiedKFold(n_splits=5), scoring='accuracy', n_jobs=-1
         )
         print(f"\nCross-Validation Accuracy: {cv_scores.mean():.3f} (+/- {cv_scores.std():.3f})")
         
@@ -190,6 +199,36 @@ class DyslexiaClassifier:
         
         return test_acc
     
+    def search_models(self, n_iter=20, n_repeats=3, halving=False, n_jobs=-1,
+                      cache_dir=DEFAULT_SEARCH_CACHE_DIR):
+        """
+        Cross-validated search over RF, LR and gradient boosting on the
+        training split. Scores are cached per parameter set, so re-running
+        after an interruption only evaluates the missing candidates.
+        """
+        print("\n" + "="*80)
+        print("MODEL SELECTION (REPEATED STRATIFIED CV)")
+        print("="*80)
+        
+        self.search_results = run_model_search(
+            self.X_train, self.y_train,
+            n_iter=n_iter, n_repeats=n_repeats, halving=halving,
+            n_jobs=n_jobs, cache_dir=cache_dir
+        )
+        
+        print("\nTop candidates (AUC-ROC):")
+        print("-" * 60)
+        for _, row in self.search_results.head(10).iterrows():
+            print(f"{row['model']:22s} {row['mean_score']:.3f} (+/- {row['std_score']:.3f})  {row['params']}")
+        
+        best = self.search_results.iloc[0]
+        self.best_model = build_pipeline(best['model'], best['params'])
+        self.best_model.fit(self.X_train, self.y_train)
+        test_auc = roc_auc_score(self.y_test, self.best_model.predict_proba(self.X_test)[:, 1])
+        print(f"\nBest model: {best['model']} - Test AUC-ROC: {test_auc:.3f}")
+        
+        return self.search_results
+    
     def extract_feature_importance(self):
         """Extract and display feature importance from Random Forest."""
         print("\n" + "="*80)
@@ -216,12 +255,13 @@ class DyslexiaClassifier:
         importance_df = pd.DataFrame(importance_data)
         return importance_df
     
-    def plot_feature_importance(self, save_path=None):
+    def plot_feature_importance(self, save_path=None, show=False):
         """Plot feature importance."""
         importance = self.rf_model.feature_importances_
         indices = np.argsort(importance)[::-1]
         
-        plt.figure(figsize=(12, 6))
+        plt = plotting.pyplot()
+        fig = plt.figure(figsize=(12, 6))
         plt.bar(range(len(importance)), importance[indices], color='steelblue')
         plt.xticks(range(len(importance)), 
                    [self.feature_names[i] for i in indices], 
@@ -231,20 +271,16 @@ class DyslexiaClassifier:
         plt.title('Feature Importance from Random Forest Model')
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"\n✓ Saved feature importance plot to {save_path}")
-        
-        plt.show()
-        return plt.gcf()
+        return plotting.finish(fig, save_path, show, label='feature importance plot')
     
-    def plot_confusion_matrix(self, save_path=None):
+    def plot_confusion_matrix(self, save_path=None, show=False):
         """Plot confusion matrix."""
         y_pred = self.rf_model.predict(self.X_test_scaled)
         cm = confusion_matrix(self.y_test, y_pred)
         
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
+        plt = plotting.pyplot()
+        fig = plt.figure(figsize=(8, 6))
+        plotting.seaborn().heatmap(cm, annot=True, fmt='d', cmap='Blues', 
                    xticklabels=['Non-Dyslexic', 'Dyslexic'],
                    yticklabels=['Non-Dyslexic', 'Dyslexic'])
         plt.ylabel('True Label')
@@ -252,12 +288,50 @@ class DyslexiaClassifier:
         plt.title('Confusion Matrix - Random Forest')
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Saved confusion matrix to {save_path}")
+        return plotting.finish(fig, save_path, show, label='confusion matrix')
+    
+    def exported_model_metrics(self):
+        """
+        Metrics of the estimator export_model writes: the model-search
+        winner when a search was run, otherwise the Random Forest.
+        """
+        if self.best_model is not None:
+            print("\nEvaluating the model-search winner for export...")
+            results = self.evaluate_model(self.best_model, self.X_train, self.X_test)
+            model_type = type(self.best_model[-1]).__name__
+        else:
+            results = self.rf_metrics or self.evaluate_random_forest()
+            model_type = type(self.rf_model).__name__
         
-        plt.show()
-        return plt.gcf()
+        return {
+            'model': model_type,
+            'train_accuracy': results['train_acc'],
+            'test_accuracy': results['test_acc'],
+            'auc_roc': results['auc'],
+            'cv_accuracy_mean': results['cv_mean'],
+            'cv_accuracy_std': results['cv_std'],
+            'n_samples': len(self.df),
+            'n_features': len(self.feature_names)
+        }
+    
+    def export_model(self, output_dir=DEFAULT_ARTIFACT_DIR, onnx=False, extra_metrics=None):
+        """
+        Persist scaler + model + feature order + metrics as a versioned
+        artifact for the ML service. Uses the model-search winner when a
+        search was run, otherwise the Random Forest; the stored metrics
+        always describe the exported estimator.
+        """
+        if self.best_model is not None:
+            scaler, model = self.best_model[0], self.best_model[-1]
+        else:
+            scaler, model = self.scaler, self.rf_model
+        metrics = {**(extra_metrics or {}), **self.exported_model_metrics()}
+        
+        return export_reading_artifact(
+            scaler, model, self.feature_names, metrics,
+            output_dir=output_dir, onnx=onnx,
+            proxy_constants=compute_proxy_constants(self.df)
+        )
     
     def generate_web_feature_weights(self, importance_df, output_path=None):
         """
@@ -339,23 +413,31 @@ module.exports = featureWeights;
         return web_weights
 
 
-def main():
+def load_classifier(data_path, labels_path, feature_matrix=None, use_cache=True):
+    """DyslexiaClassifier with data loaded and split; `feature_matrix` selects the wide matrix."""
+    classifier = DyslexiaClassifier(data_path, labels_path)
+    if feature_matrix:
+        classifier.load_feature_matrix(feature_matrix)
+    else:
+        classifier.load_and_prepare_data(use_cache=use_cache)
+    classifier.split_and_scale_data()
+    return classifier
+
+
+def main(search=False, halving=False, onnx=False, data_path=DEFAULT_DATA_PATH,
+         labels_path=DEFAULT_LABELS_PATH, output_dir=DEFAULT_OUTPUT_DIR,
+         artifact_dir=DEFAULT_ARTIFACT_DIR, feature_matrix=None, plots=True,
+         show=False, export=True, use_cache=True):
     """Main training pipeline."""
     print("="*80)
     print("ETDD70 MACHINE LEARNING MODEL TRAINING")
     print("="*80)
     
-    # Paths
-    data_path = Path("D:/FYP/Code/Eye_Dataset/13332134/data/data")
-    labels_path = Path("D:/FYP/Code/Eye_Dataset/13332134/dyslexia_class_label.csv")
-    output_dir = Path("D:/FYP/Code/dyslexia-detection-system/analysis")
-    
-    # Initialize classifier
-    classifier = DyslexiaClassifier(data_path, labels_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load and prepare data
-    classifier.load_and_prepare_data()
-    classifier.split_and_scale_data()
+    # Load, split and scale
+    classifier = load_classifier(data_path, labels_path, feature_matrix, use_cache)
     
     # Train Random Forest
     rf_results = classifier.train_random_forest()
@@ -363,17 +445,23 @@ def main():
     # Train Logistic Regression for comparison
     lr_acc = classifier.train_logistic_regression()
     
+    # Optional hyperparameter search across model families
+    if search:
+        search_df = classifier.search_models(halving=halving)
+        search_df.to_csv(output_dir / "model_search_results.csv", index=False)
+    
     # Extract feature importance
     importance_df = classifier.extract_feature_importance()
     importance_df.to_csv(output_dir / "feature_importance.csv", index=False)
     
     # Generate plots
-    classifier.plot_feature_importance(
-        save_path=output_dir / "feature_importance_plot.png"
-    )
-    classifier.plot_confusion_matrix(
-        save_path=output_dir / "confusion_matrix.png"
-    )
+    if plots:
+        classifier.plot_feature_importance(
+            save_path=output_dir / "feature_importance_plot.png", show=show
+        )
+        classifier.plot_confusion_matrix(
+            save_path=output_dir / "confusion_matrix.png", show=show
+        )
     
     # Generate web feature weights
     web_weights = classifier.generate_web_feature_weights(
@@ -397,6 +485,17 @@ def main():
     summary_df = pd.DataFrame([summary])
     summary_df.to_csv(output_dir / "model_summary.csv", index=False)
     
+    # Export the fitted model for the ML service; a wide-matrix model has
+    # columns the service can't rebuild from web metrics
+    if export and classifier.feature_names != SERVICE_FEATURES:
+        print("\nWarning: not exporting the service artifact; it needs the trial-level "
+              "features, not the wide feature matrix")
+    elif export:
+        classifier.export_model(
+            output_dir=artifact_dir, onnx=onnx,
+            extra_metrics={'logistic_regression_accuracy': lr_acc}
+        )
+    
     print("\n" + "="*80)
     print("MODEL TRAINING COMPLETE!")
     print("="*80)
@@ -407,5 +506,23 @@ def main():
     print(f"  CV Accuracy: {rf_results['cv_mean']:.3f} (+/- {rf_results['cv_std']:.3f})")
 
 
+def export_artifact(data_path=DEFAULT_DATA_PATH, labels_path=DEFAULT_LABELS_PATH,
+                    artifact_dir=DEFAULT_ARTIFACT_DIR, search=False,
+                    halving=False, onnx=False, use_cache=True):
+    """
+    Fit and export the service artifact only: no comparison model, reports,
+    plots or web configs. Always trained on the trial-level features the
+    service maps web metrics onto.
+    """
+    classifier = load_classifier(data_path, labels_path, use_cache=use_cache)
+    if search:
+        classifier.search_models(halving=halving)
+    else:
+        classifier.fit_random_forest()
+    return classifier.export_model(output_dir=artifact_dir, onnx=onnx)
+
+
 if __name__ == "__main__":
-    main()
+    import sys
+    from cli import main as cli_main
+    sys.exit(cli_main(['train', *sys.argv[1:]]))
@@ -1,279 +1,336 @@
 """
 Analyze CMU DSL-StrongPasswordData.csv to extract real keystroke thresholds
 This script calculates actual normal ranges from the dataset
+
+All statistics are computed with NumPy reductions over the H.* and DD.*
+column blocks, so the module can be imported and reused on larger corpora:
+
+    from analyze_cmu_dataset import load_dataset, compute_statistics, build_thresholds
+
+For corpora larger than memory, --stream folds CSV chunks into mergeable
+accumulators instead (see keystroke_streaming.py).
 """
 
-import pandas as pd
-import numpy as np
+import argparse
 import json
+import os
+import time
+from contextlib import contextmanager
 
-# Load dataset
-print("Loading CMU dataset...")
-df = pd.read_csv('D:/FYP/Code/Keystrokes_Dataset/DSL-StrongPasswordData.csv')
-
-print(f"Dataset loaded: {len(df)} rows, {len(df['subject'].unique())} subjects")
-
-# ===================================
-# 1. HOLD TIME ANALYSIS
-# ===================================
-print("\n" + "="*60)
-print("1. HOLD TIME ANALYSIS (H.* columns)")
-print("="*60)
-
-# Extract all Hold time columns (H.period, H.t, H.i, etc.)
-hold_cols = [col for col in df.columns if col.startswith('H.') and col != 'H.Return']
-all_hold_times = []
-
-for col in hold_cols:
-    # Convert to milliseconds (data is in seconds)
-    all_hold_times.extend(df[col].dropna() * 1000)
-
-hold_times = np.array(all_hold_times)
-
-# Calculate statistics
-hold_mean = np.mean(hold_times)
-hold_std = np.std(hold_times)
-hold_median = np.median(hold_times)
-hold_min = np.percentile(hold_times, 5)   # 5th percentile
-hold_max = np.percentile(hold_times, 95)  # 95th percentile
-
-print(f"\nHold Time Statistics (ms):")
-print(f"  Mean: {hold_mean:.2f}")
-print(f"  Std Dev: {hold_std:.2f}")
-print(f"  Median: {hold_median:.2f}")
-print(f"  5th percentile: {hold_min:.2f}")
-print(f"  95th percentile: {hold_max:.2f}")
-print(f"  Normal Range (mean ± 2*std): [{hold_mean - 2*hold_std:.2f}, {hold_mean + 2*hold_std:.2f}]")
-
-# Coefficient of Variation (for normal typists)
-hold_cv_per_subject = []
-for subject in df['subject'].unique():
-    subject_data = df[df['subject'] == subject]
-    subject_holds = []
-    for col in hold_cols:
-        subject_holds.extend(subject_data[col].dropna() * 1000)
-    if len(subject_holds) > 1:
-        cv = (np.std(subject_holds) / np.mean(subject_holds)) * 100
-        hold_cv_per_subject.append(cv)
-
-hold_cv_mean = np.mean(hold_cv_per_subject)
-hold_cv_std = np.std(hold_cv_per_subject)
-
-print(f"\nHold Time CV% (Consistency):")
-print(f"  Mean CV: {hold_cv_mean:.2f}%")
-print(f"  Std Dev: {hold_cv_std:.2f}%")
-print(f"  95th percentile: {np.percentile(hold_cv_per_subject, 95):.2f}%")
-
-# ===================================
-# 2. FLIGHT TIME ANALYSIS
-# ===================================
-print("\n" + "="*60)
-print("2. FLIGHT TIME ANALYSIS (DD.* columns)")
-print("="*60)
-
-# Extract all Down-Down (flight time) columns
-flight_cols = [col for col in df.columns if col.startswith('DD.')]
-all_flight_times = []
-
-for col in flight_cols:
-    all_flight_times.extend(df[col].dropna() * 1000)
-
-flight_times = np.array(all_flight_times)
-
-flight_mean = np.mean(flight_times)
-flight_std = np.std(flight_times)
-flight_median = np.median(flight_times)
-flight_min = np.percentile(flight_times, 5)
-flight_max = np.percentile(flight_times, 95)
-
-print(f"\nFlight Time Statistics (ms):")
-print(f"  Mean: {flight_mean:.2f}")
-print(f"  Std Dev: {flight_std:.2f}")
-print(f"  Median: {flight_median:.2f}")
-print(f"  5th percentile: {flight_min:.2f}")
-print(f"  95th percentile: {flight_max:.2f}")
-print(f"  Normal Range (mean ± 2*std): [{flight_mean - 2*flight_std:.2f}, {flight_mean + 2*flight_std:.2f}]")
-
-# Flight time CV
-flight_cv_per_subject = []
-for subject in df['subject'].unique():
-    subject_data = df[df['subject'] == subject]
-    subject_flights = []
-    for col in flight_cols:
-        subject_flights.extend(subject_data[col].dropna() * 1000)
-    if len(subject_flights) > 1:
-        cv = (np.std(subject_flights) / np.mean(subject_flights)) * 100
-        flight_cv_per_subject.append(cv)
-
-flight_cv_mean = np.mean(flight_cv_per_subject)
-print(f"\nFlight Time CV%:")
-print(f"  Mean CV: {flight_cv_mean:.2f}%")
-print(f"  95th percentile: {np.percentile(flight_cv_per_subject, 95):.2f}%")
-
-# ===================================
-# 3. TYPING SPEED CALCULATION
-# ===================================
-print("\n" + "="*60)
-print("3. TYPING SPEED ANALYSIS")
-print("="*60)
+import numpy as np
+import pandas as pd
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config')
+DEFAULT_DATA_PATH = os.environ.get(
+    'KEYSTROKE_DATA_PATH', 'D:/FYP/Code/Keystrokes_Dataset/DSL-StrongPasswordData.csv'
+)
+DEFAULT_JSON_OUTPUT = os.path.normpath(os.path.join(CONFIG_DIR, 'keystrokeThresholds_CMU_DERIVED.json'))
+DEFAULT_JS_OUTPUT = os.path.normpath(os.path.join(CONFIG_DIR, 'keystrokeThresholds.js'))
 
 # Password is ".tie5Roanl" (10 characters)
-# Calculate speed per session
-password_length = 10
-speeds_wpm = []
-speeds_cpm = []
-
-for idx, row in df.iterrows():
-    # Total time = sum of all flight times + last hold time
-    flight_sum = 0
-    for col in flight_cols:
-        if pd.notna(row[col]):
-            flight_sum += row[col]
-    
-    # Add final return hold time
-    if pd.notna(row['H.Return']):
-        total_time_sec = flight_sum + row['H.Return']
-    else:
-        total_time_sec = flight_sum
-    
-    if total_time_sec > 0:
-        # CPM = characters / (time in minutes)
-        cpm = password_length / (total_time_sec / 60)
-        # WPM = words / (time in minutes), assuming 5 chars = 1 word
-        wpm = (password_length / 5) / (total_time_sec / 60)
-        
-        speeds_cpm.append(cpm)
-        speeds_wpm.append(wpm)
-
-speeds_wpm = np.array(speeds_wpm)
-speeds_cpm = np.array(speeds_cpm)
-
-wpm_mean = np.mean(speeds_wpm)
-wpm_std = np.std(speeds_wpm)
-wpm_median = np.median(speeds_wpm)
-
-print(f"\nTyping Speed (WPM - Words Per Minute):")
-print(f"  Mean: {wpm_mean:.2f}")
-print(f"  Std Dev: {wpm_std:.2f}")
-print(f"  Median: {wpm_median:.2f}")
-print(f"  25th percentile: {np.percentile(speeds_wpm, 25):.2f}")
-print(f"  75th percentile: {np.percentile(speeds_wpm, 75):.2f}")
-
-cpm_mean = np.mean(speeds_cpm)
-print(f"\nTyping Speed (CPM - Characters Per Minute):")
-print(f"  Mean: {cpm_mean:.2f}")
-
-# ===================================
-# 4. GENERATE THRESHOLDS CONFIG
-# ===================================
-print("\n" + "="*60)
-print("4. GENERATING THRESHOLD CONFIGURATION")
-print("="*60)
-
-thresholds = {
-    "metadata": {
-        "source": "CMU DSL-StrongPasswordData.csv",
-        "subjects": int(len(df['subject'].unique())),
-        "sessions": int(len(df)),
-        "description": "Thresholds derived from actual keystroke data analysis"
-    },
-    
-    "normalRanges": {
-        "holdTime": {
-            "mean": round(hold_mean, 2),
-            "std": round(hold_std, 2),
-            "min": round(hold_mean - 2*hold_std, 2),
-            "max": round(hold_mean + 2*hold_std, 2),
-            "median": round(hold_median, 2)
-        },
-        "holdTimeCV": {
-            "mean": round(hold_cv_mean, 2),
-            "max": round(np.percentile(hold_cv_per_subject, 95), 2),
-            "description": "Coefficient of variation %, lower = more consistent"
+PASSWORD_LENGTH = 10
+
+
+class StageTimer:
+    """Collects wall-clock time per pipeline stage for --timings."""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def report(self):
+        print("\n" + "="*60)
+        print("STAGE TIMINGS")
+        print("="*60)
+        for name, seconds in self.stages:
+            print(f"  {name:<24s} {seconds * 1000:9.1f} ms")
+        total = sum(seconds for _, seconds in self.stages)
+        print(f"  {'total':<24s} {total * 1000:9.1f} ms")
+
+
+def _is_timing_column(col):
+    return col == 'subject' or col.startswith('H.') or col.startswith('DD.')
+
+
+def hold_columns(df):
+    """H.* columns excluding the final Return key."""
+    return [col for col in df.columns if col.startswith('H.') and col != 'H.Return']
+
+
+def flight_columns(df):
+    """Down-Down (flight time) columns."""
+    return [col for col in df.columns if col.startswith('DD.')]
+
+
+def load_dataset(csv_path):
+    """Read only the subject and timing columns of the CMU CSV."""
+    return pd.read_csv(csv_path, usecols=_is_timing_column)
+
+
+def _block_ms(df, cols):
+    """Column block as a float64 matrix in milliseconds (data is in seconds)."""
+    return df[cols].to_numpy(dtype=np.float64) * 1000
+
+
+def pooled_stats(block):
+    """Mean/std/median/5th/95th percentile over every non-NaN value in the block."""
+    values = block[~np.isnan(block)]
+    return {
+        'mean': np.mean(values),
+        'std': np.std(values),
+        'median': np.median(values),
+        'p5': np.percentile(values, 5),
+        'p95': np.percentile(values, 95),
+    }
+
+
+def per_subject_cv(block, subject_codes, n_subjects):
+    """
+    CV% of all pooled values per subject, for subjects with more than one
+    value. Two-pass (mean, then squared deviations) with bincount instead
+    of re-filtering the frame once per subject.
+    """
+    mask = ~np.isnan(block)
+    row_counts = mask.sum(axis=1)
+    row_sums = np.where(mask, block, 0.0).sum(axis=1)
+
+    counts = np.bincount(subject_codes, weights=row_counts, minlength=n_subjects)
+    sums = np.bincount(subject_codes, weights=row_sums, minlength=n_subjects)
+    means = sums / np.maximum(counts, 1)
+
+    sq_dev = np.where(mask, (block - means[subject_codes][:, None]) ** 2, 0.0).sum(axis=1)
+    stds = np.sqrt(np.bincount(subject_codes, weights=sq_dev, minlength=n_subjects) / np.maximum(counts, 1))
+
+    valid = counts > 1
+    return stds[valid] / means[valid] * 100
+
+
+def typing_speeds(df, flight_cols):
+    """
+    Per-session WPM and CPM.
+    Total time = sum of all flight times + final Return hold time.
+    """
+    flight_sum = np.nansum(df[flight_cols].to_numpy(dtype=np.float64), axis=1)
+    total_time_sec = flight_sum + np.nan_to_num(df['H.Return'].to_numpy(dtype=np.float64))
+    total_time_sec = total_time_sec[total_time_sec > 0]
+
+    minutes = total_time_sec / 60
+    # CPM = characters / (time in minutes)
+    speeds_cpm = PASSWORD_LENGTH / minutes
+    # WPM = words / (time in minutes), assuming 5 chars = 1 word
+    speeds_wpm = (PASSWORD_LENGTH / 5) / minutes
+    return speeds_wpm, speeds_cpm
+
+
+def compute_statistics(df, timer=None):
+    """
+    Compute every statistic the thresholds config needs.
+
+    Returns:
+        dict with 'hold', 'flight', 'hold_cv', 'flight_cv', 'wpm', 'cpm'
+        summaries plus subject/session counts
+    """
+    timer = timer or StageTimer()
+    hold_cols = hold_columns(df)
+    flight_cols = flight_columns(df)
+    subject_codes, subjects = pd.factorize(df['subject'])
+    n_subjects = len(subjects)
+
+    with timer.stage('hold times'):
+        hold_block = _block_ms(df, hold_cols)
+        hold = pooled_stats(hold_block)
+        hold_cv = per_subject_cv(hold_block, subject_codes, n_subjects)
+
+    with timer.stage('flight times'):
+        flight_block = _block_ms(df, flight_cols)
+        flight = pooled_stats(flight_block)
+        flight_cv = per_subject_cv(flight_block, subject_codes, n_subjects)
+
+    with timer.stage('typing speed'):
+        speeds_wpm, speeds_cpm = typing_speeds(df, flight_cols)
+
+    return {
+        'subjects': n_subjects,
+        'sessions': len(df),
+        'hold': hold,
+        'flight': flight,
+        'hold_cv': {
+            'mean': np.mean(hold_cv),
+            'std': np.std(hold_cv),
+            'p95': np.percentile(hold_cv, 95),
         },
-        "flightTime": {
-            "mean": round(flight_mean, 2),
-            "std": round(flight_std, 2),
-            "min": round(flight_mean - 2*flight_std, 2),
-            "max": round(flight_mean + 2*flight_std, 2),
-            "median": round(flight_median, 2)
+        'flight_cv': {
+            'mean': np.mean(flight_cv),
+            'p95': np.percentile(flight_cv, 95),
         },
-        "flightTimeCV": {
-            "mean": round(flight_cv_mean, 2),
-            "max": round(np.percentile(flight_cv_per_subject, 95), 2)
+        'wpm': {
+            'mean': np.mean(speeds_wpm),
+            'std': np.std(speeds_wpm),
+            'median': np.median(speeds_wpm),
+            'p25': np.percentile(speeds_wpm, 25),
+            'p75': np.percentile(speeds_wpm, 75),
         },
-        "wpm": {
-            "mean": round(wpm_mean, 2),
-            "std": round(wpm_std, 2),
-            "min": round(np.percentile(speeds_wpm, 25), 2),
-            "max": round(np.percentile(speeds_wpm, 75), 2),
-            "median": round(wpm_median, 2)
-        }
-    },
-    
-    "dyslexicRanges": {
-        "note": "Estimated based on research literature (no dyslexic data in CMU dataset)",
-        "holdTime": {
-            "mean": round(hold_mean * 1.8, 2),
-            "std": round(hold_std * 2.0, 2),
-            "threshold": round(hold_mean + 2*hold_std, 2),
-            "description": "~80% slower based on motor control studies"
+        'cpm': {
+            'mean': np.mean(speeds_cpm),
         },
-        "holdTimeCV": {
-            "min": round(hold_cv_mean * 1.5, 2),
-            "description": "50% more inconsistent"
+    }
+
+
+def print_report(stats):
+    """Print the human-readable analysis summary."""
+    print(f"Dataset loaded: {stats['sessions']} rows, {stats['subjects']} subjects")
+
+    for title, key, cv_key in (
+        ("1. HOLD TIME ANALYSIS (H.* columns)", 'hold', 'hold_cv'),
+        ("2. FLIGHT TIME ANALYSIS (DD.* columns)", 'flight', 'flight_cv'),
+    ):
+        s = stats[key]
+        print("\n" + "="*60)
+        print(title)
+        print("="*60)
+        print(f"\n{key.capitalize()} Time Statistics (ms):")
+        print(f"  Mean: {s['mean']:.2f}")
+        print(f"  Std Dev: {s['std']:.2f}")
+        print(f"  Median: {s['median']:.2f}")
+        print(f"  5th percentile: {s['p5']:.2f}")
+        print(f"  95th percentile: {s['p95']:.2f}")
+        print(f"  Normal Range (mean ± 2*std): [{s['mean'] - 2*s['std']:.2f}, {s['mean'] + 2*s['std']:.2f}]")
+
+        cv = stats[cv_key]
+        print(f"\n{key.capitalize()} Time CV%:")
+        print(f"  Mean CV: {cv['mean']:.2f}%")
+        if 'std' in cv:
+            print(f"  Std Dev: {cv['std']:.2f}%")
+        print(f"  95th percentile: {cv['p95']:.2f}%")
+
+    wpm = stats['wpm']
+    print("\n" + "="*60)
+    print("3. TYPING SPEED ANALYSIS")
+    print("="*60)
+    print(f"\nTyping Speed (WPM - Words Per Minute):")
+    print(f"  Mean: {wpm['mean']:.2f}")
+    print(f"  Std Dev: {wpm['std']:.2f}")
+    print(f"  Median: {wpm['median']:.2f}")
+    print(f"  25th percentile: {wpm['p25']:.2f}")
+    print(f"  75th percentile: {wpm['p75']:.2f}")
+    print(f"\nTyping Speed (CPM - Characters Per Minute):")
+    print(f"  Mean: {stats['cpm']['mean']:.2f}")
+
+
+def build_thresholds(stats):
+    """Build the thresholds dict written to keystrokeThresholds_CMU_DERIVED.json."""
+    hold, flight = stats['hold'], stats['flight']
+    hold_cv, flight_cv, wpm = stats['hold_cv'], stats['flight_cv'], stats['wpm']
+
+    return {
+        "metadata": {
+            "source": "CMU DSL-StrongPasswordData.csv",
+            "subjects": int(stats['subjects']),
+            "sessions": int(stats['sessions']),
+            "description": "Thresholds derived from actual keystroke data analysis"
         },
-        "flightTime": {
-            "mean": round(flight_mean * 2.0, 2),
-            "threshold": round(flight_mean + 2*flight_std, 2),
-            "description": "~100% longer pauses between keys"
+
+        "normalRanges": {
+            "holdTime": {
+                "mean": round(hold['mean'], 2),
+                "std": round(hold['std'], 2),
+                "min": round(hold['mean'] - 2*hold['std'], 2),
+                "max": round(hold['mean'] + 2*hold['std'], 2),
+                "median": round(hold['median'], 2)
+            },
+            "holdTimeCV": {
+                "mean": round(hold_cv['mean'], 2),
+                "max": round(hold_cv['p95'], 2),
+                "description": "Coefficient of variation %, lower = more consistent"
+            },
+            "flightTime": {
+                "mean": round(flight['mean'], 2),
+                "std": round(flight['std'], 2),
+                "min": round(flight['mean'] - 2*flight['std'], 2),
+                "max": round(flight['mean'] + 2*flight['std'], 2),
+                "median": round(flight['median'], 2)
+            },
+            "flightTimeCV": {
+                "mean": round(flight_cv['mean'], 2),
+                "max": round(flight_cv['p95'], 2)
+            },
+            "wpm": {
+                "mean": round(wpm['mean'], 2),
+                "std": round(wpm['std'], 2),
+                "min": round(wpm['p25'], 2),
+                "max": round(wpm['p75'], 2),
+                "median": round(wpm['median'], 2)
+            }
         },
-        "flightTimeCV": {
-            "min": round(flight_cv_mean * 1.7, 2)
+
+        "dyslexicRanges": {
+            "note": "Estimated based on research literature (no dyslexic data in CMU dataset)",
+            "holdTime": {
+                "mean": round(hold['mean'] * 1.8, 2),
+                "std": round(hold['std'] * 2.0, 2),
+                "threshold": round(hold['mean'] + 2*hold['std'], 2),
+                "description": "~80% slower based on motor control studies"
+            },
+            "holdTimeCV": {
+                "min": round(hold_cv['mean'] * 1.5, 2),
+                "description": "50% more inconsistent"
+            },
+            "flightTime": {
+                "mean": round(flight['mean'] * 2.0, 2),
+                "threshold": round(flight['mean'] + 2*flight['std'], 2),
+                "description": "~100% longer pauses between keys"
+            },
+            "flightTimeCV": {
+                "min": round(flight_cv['mean'] * 1.7, 2)
+            },
+            "wpm": {
+                "max": round(wpm['mean'] * 0.6, 2),
+                "description": "40% slower typing speed"
+            }
         },
-        "wpm": {
-            "max": round(wpm_mean * 0.6, 2),
-            "description": "40% slower typing speed"
+
+        "featureWeights": {
+            "holdTimeVariability": 0.25,
+            "flightTimeVariability": 0.20,
+            "backspaceRate": 0.20,
+            "rhythmConsistency": 0.15,
+            "pauseFrequency": 0.10,
+            "overallSpeed": 0.10,
+            "note": "Weights based on discriminative power in typing research"
         }
-    },
-    
-    "featureWeights": {
-        "holdTimeVariability": 0.25,
-        "flightTimeVariability": 0.20,
-        "backspaceRate": 0.20,
-        "rhythmConsistency": 0.15,
-        "pauseFrequency": 0.10,
-        "overallSpeed": 0.10,
-        "note": "Weights based on discriminative power in typing research"
     }
-}
-
-# Save to JSON
-output_path = 'D:/FYP/Code/dyslexia-detection-system/backend/config/keystrokeThresholds_CMU_DERIVED.json'
-with open(output_path, 'w') as f:
-    json.dump(thresholds, f, indent=2)
 
-print(f"\n✓ Thresholds saved to: {output_path}")
 
-# ===================================
-# 5. GENERATE JAVASCRIPT CONFIG
-# ===================================
-print("\n" + "="*60)
-print("5. GENERATING JAVASCRIPT CONFIG FILE")
-print("="*60)
+def render_js_config(stats):
+    """Render the keystrokeThresholds.js module consumed by the backend."""
+    hold_mean, hold_std, hold_median = stats['hold']['mean'], stats['hold']['std'], stats['hold']['median']
+    flight_mean, flight_std, flight_median = stats['flight']['mean'], stats['flight']['std'], stats['flight']['median']
+    hold_cv_mean, hold_cv_p95 = stats['hold_cv']['mean'], stats['hold_cv']['p95']
+    flight_cv_mean, flight_cv_p95 = stats['flight_cv']['mean'], stats['flight_cv']['p95']
+    wpm = stats['wpm']
+    wpm_mean, wpm_std, wpm_median = wpm['mean'], wpm['std'], wpm['median']
+    cpm_mean = stats['cpm']['mean']
+    n_subjects, n_sessions = stats['subjects'], stats['sessions']
 
-js_config = f"""/**
+    return f"""/**
  * Keystroke Thresholds - Derived from CMU Dataset Analysis
- * 
+ *
  * Source: CMU DSL-StrongPasswordData.csv
- * Subjects: {len(df['subject'].unique())} normal typists
- * Sessions: {len(df)} typing sessions
- * 
+ * Subjects: {n_subjects} normal typists
+ * Sessions: {n_sessions} typing sessions
+ *
  * Analysis Date: February 2026
- * 
+ *
  * IMPORTANT: These are NORMAL typing ranges from the CMU dataset.
  * Dyslexic ranges are ESTIMATES based on literature (CMU has no dyslexic subjects).
- * 
+ *
  * Citations for dyslexic estimates:
  * - Hold time: ~80% longer (motor control studies)
  * - Flight time: ~100% longer (processing delay)
@@ -286,8 +343,8 @@ module.exports = {{
   // ===================================
   metadata: {{
     source: 'CMU DSL-StrongPasswordData.csv',
-    subjects: {len(df['subject'].unique())},
-    sessions: {len(df)},
+    subjects: {n_subjects},
+    sessions: {n_sessions},
     analysisDate: 'February 2026'
   }},
 
@@ -303,14 +360,14 @@ module.exports = {{
       max: {hold_mean + 2*hold_std:.2f},           // 95th percentile
       median: {hold_median:.2f}
     }},
-    
+
     // Hold Time Consistency (CV%)
     holdTimeCV: {{
       mean: {hold_cv_mean:.2f},           // Average variation
-      max: {np.percentile(hold_cv_per_subject, 95):.2f},            // 95th percentile
+      max: {hold_cv_p95:.2f},            // 95th percentile
       threshold: 30         // Flag if >30% variation
     }},
-    
+
     // Flight Time (time between keys)
     flightTime: {{
       mean: {flight_mean:.2f},          // Average: {flight_mean:.2f}ms
@@ -319,40 +376,40 @@ module.exports = {{
       max: {flight_mean + 2*flight_std:.2f},          // 95th percentile
       median: {flight_median:.2f}
     }},
-    
+
     // Flight Time Consistency
     flightTimeCV: {{
       mean: {flight_cv_mean:.2f},
-      max: {np.percentile(flight_cv_per_subject, 95):.2f},
+      max: {flight_cv_p95:.2f},
       threshold: 40
     }},
-    
+
     // Typing Speed (WPM)
     wpm: {{
       mean: {wpm_mean:.2f},           // Average WPM
       std: {wpm_std:.2f},
-      min: {np.percentile(speeds_wpm, 25):.2f},            // 25th percentile
-      max: {np.percentile(speeds_wpm, 75):.2f},            // 75th percentile
+      min: {wpm['p25']:.2f},            // 25th percentile
+      max: {wpm['p75']:.2f},            // 75th percentile
       median: {wpm_median:.2f}
     }},
-    
+
     // Typing Speed (CPM)
     cpm: {{
       mean: {cpm_mean:.2f}
     }},
-    
+
     // Accuracy (literature-based)
     accuracy: {{
       min: 90,              // Normal: >90% accurate
       excellent: 95
     }},
-    
+
     // Backspace Rate (literature-based)
     backspaceRate: {{
       max: 0.08,            // Normal: <8% backspaces
       typical: 0.05
     }},
-    
+
     // Pauses (literature-based)
     pauseFrequency: {{
       max: 0.05,            // <5% of intervals
@@ -371,37 +428,37 @@ module.exports = {{
       std: {hold_std * 2.0:.2f},
       threshold: {hold_mean + 2*hold_std:.2f}      // Flag if exceeds normal max
     }},
-    
+
     holdTimeCV: {{
       min: {hold_cv_mean * 1.5:.2f},           // 50% more inconsistent
       threshold: 45
     }},
-    
+
     flightTime: {{
       mean: {flight_mean * 2.0:.2f},         // ~100% longer (processing delay)
       threshold: {flight_mean + 2*flight_std:.2f}
     }},
-    
+
     flightTimeCV: {{
       min: {flight_cv_mean * 1.7:.2f},
       threshold: 60
     }},
-    
+
     wpm: {{
       max: {wpm_mean * 0.6:.2f},            // 40% slower
       threshold: 30
     }},
-    
+
     accuracy: {{
       max: 75,              // <75% accurate
       threshold: 80
     }},
-    
+
     backspaceRate: {{
       min: 0.18,            // >18% backspaces
       threshold: 0.15
     }},
-    
+
     pauseFrequency: {{
       min: 0.15,            // >15% pauses
       threshold: 0.10
@@ -440,17 +497,74 @@ module.exports = {{
 }};
 """
 
-js_output_path = 'D:/FYP/Code/dyslexia-detection-system/backend/config/keystrokeThresholds.js'
-with open(js_output_path, 'w', encoding='utf-8') as f:
-    f.write(js_config)
 
-print(f"✓ JavaScript config saved to: {js_output_path}")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Derive keystroke thresholds from the CMU dataset')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='Path to DSL-StrongPasswordData.csv')
+    parser.add_argument('--json-output', default=DEFAULT_JSON_OUTPUT, help='Where to write the thresholds JSON')
+    parser.add_argument('--js-output', default=DEFAULT_JS_OUTPUT, help='Where to write keystrokeThresholds.js')
+    parser.add_argument('--timings', action='store_true', help='Print wall-clock time per stage')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read the CSV in chunks with online accumulators (approximate percentiles)')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='Rows per chunk with --stream')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return run(args.data, args.json_output, args.js_output, args.stream, args.chunksize, args.timings)
+
+
+def run(data_path=DEFAULT_DATA_PATH, json_output=DEFAULT_JSON_OUTPUT, js_output=DEFAULT_JS_OUTPUT,
+        stream=False, chunksize=100_000, timings=False):
+    timer = StageTimer()
+
+    if stream:
+        from keystroke_streaming import compute_statistics_streaming
+
+        print(f"Streaming CMU dataset in chunks of {chunksize} rows...")
+        stats = compute_statistics_streaming(data_path, chunksize, timer)
+    else:
+        print("Loading CMU dataset...")
+        with timer.stage('load csv'):
+            df = load_dataset(data_path)
+
+        stats = compute_statistics(df, timer)
+    print_report(stats)
+
+    print("\n" + "="*60)
+    print("4. GENERATING THRESHOLD CONFIGURATION")
+    print("="*60)
+
+    with timer.stage('write json'):
+        thresholds = build_thresholds(stats)
+        with open(json_output, 'w') as f:
+            json.dump(thresholds, f, indent=2)
+    print(f"\n✓ Thresholds saved to: {json_output}")
+
+    print("\n" + "="*60)
+    print("5. GENERATING JAVASCRIPT CONFIG FILE")
+    print("="*60)
+
+    with timer.stage('write js'):
+        with open(js_output, 'w', encoding='utf-8') as f:
+            f.write(render_js_config(stats))
+    print(f"✓ JavaScript config saved to: {js_output}")
+
+    print("\n" + "="*60)
+    print("ANALYSIS COMPLETE!")
+    print("="*60)
+    print(f"\nFiles generated:")
+    print(f"  1. {json_output}")
+    print(f"  2. {js_output}")
+    print(f"\n✓ You now have REAL thresholds from CMU dataset!")
+    print(f"✓ Use the .js file in your backend immediately")
+
+    if timings:
+        timer.report()
+
+    return thresholds
+
 
-print("\n" + "="*60)
-print("ANALYSIS COMPLETE!")
-print("="*60)
-print(f"\nFiles generated:")
-print(f"  1. {output_path}")
-print(f"  2. {js_output_path}")
-print(f"\n✓ You now have REAL thresholds from CMU dataset!")
-print(f"✓ Use the .js file in your backend immediately")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+Streaming, constant-memory statistics for keystroke CSV corpora.
+
+Reads the CSV in chunks and folds each chunk into mergeable accumulators:
+- Moments:        count/mean/M2 (Welford, merged per chunk with Chan's formula)
+- SubjectMoments: the same per subject, for per-subject CVs
+- TDigest:        approximate quantiles (merging t-digest, k1 scale)
+The result has the same shape as analyze_cmu_dataset.compute_statistics,
+so build_thresholds / render_js_config / print_report work unchanged.
+
+    python analyze_cmu_dataset.py --stream --chunksize 200000 --data big.csv
+
+Every accumulator has `merge`, so per-file or per-worker results can be
+combined, e.g. when sharding a corpus across processes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analyze_cmu_dataset import (
+    StageTimer, _is_timing_column, flight_columns, hold_columns, typing_speeds
+)
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class Moments:
+    """Count, mean and sum of squared deviations; std is population (ddof=0)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, np.sum((values - mean) ** 2))
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+class SubjectMoments:
+    """Moments per subject label over every value in that subject's rows."""
+
+    def __init__(self):
+        self.index = {}
+        self.count = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+
+    def _codes(self, labels):
+        codes, uniques = pd.factorize(labels)
+        for label in uniques:
+            if label not in self.index:
+                self.index[label] = len(self.index)
+        grow = len(self.index) - len(self.count)
+        if grow > 0:
+            self.count = np.concatenate([self.count, np.zeros(grow)])
+            self.mean = np.concatenate([self.mean, np.zeros(grow)])
+            self.m2 = np.concatenate([self.m2, np.zeros(grow)])
+        return np.array([self.index[label] for label in uniques], dtype=np.int64)[codes]
+
+    def _combine(self, idx, count, mean, m2):
+        total = self.count[idx] + count
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.mean[idx]
+        self.mean[idx] += delta * count / safe_total
+        self.m2[idx] += m2 + delta ** 2 * self.count[idx] * count / safe_total
+        self.count[idx] = total
+
+    def update(self, labels, block):
+        """labels: (n,) subject per row; block: (n, k) values, NaN ignored."""
+        codes = self._codes(labels)
+        n = len(self.index)
+        mask = ~np.isnan(block)
+        counts = np.bincount(codes, weights=mask.sum(axis=1), minlength=n)
+        sums = np.bincount(codes, weights=np.where(mask, block, 0.0).sum(axis=1), minlength=n)
+        means = sums / np.maximum(counts, 1)
+        sq_dev = np.where(mask, (block - means[codes][:, None]) ** 2, 0.0).sum(axis=1)
+        m2 = np.bincount(codes, weights=sq_dev, minlength=n)
+
+        touched = np.flatnonzero(counts)
+        self._combine(touched, counts[touched], means[touched], m2[touched])
+
+    def merge(self, other):
+        labels = np.array(list(other.index), dtype=object)
+        if len(labels):
+            idx = self._codes(labels)
+            order = np.array([other.index[label] for label in labels])
+            self._combine(idx, other.count[order], other.mean[order], other.m2[order])
+        return self
+
+    def cv(self):
+        """CV% per subject with more than one value (matches per_subject_cv)."""
+        valid = self.count > 1
+        return np.sqrt(self.m2[valid] / self.count[valid]) / self.mean[valid] * 100
+
+
+class TDigest:
+    """
+    Merging t-digest with the k1 (arcsine) scale function.
+
+    Compression is vectorised: centroids are sorted, each is assigned to
+    the integer k-bucket of its cumulative-weight midpoint, and buckets
+    are collapsed with np.add.reduceat. Tails get tiny buckets, so
+    extreme quantiles stay accurate.
+    """
+
+    def __init__(self, compression=200, buffer_size=50_000):
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self._buffer = []
+        self._buffered = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        self._flush()
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._buffer.append(values)
+        self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        values = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * (np.arcsin(2 * q - 1) + np.pi / 2)
+        buckets = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def merge(self, other):
+        other._flush()
+        self._flush()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def quantile(self, q):
+        self._flush()
+        if not len(self.weights):
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        centers = cumulative - self.weights / 2
+        total = cumulative[-1]
+        xp = np.concatenate([[0.0], centers, [total]])
+        fp = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(np.asarray(q) * total, xp, fp))
+
+    def percentile(self, p):
+        return self.quantile(p / 100)
+
+
+class ColumnBlockStats:
+    """Pooled moments + digest over a column block, plus per-subject moments for CV."""
+
+    def __init__(self):
+        self.moments = Moments()
+        self.digest = TDigest()
+        self.subjects = SubjectMoments()
+
+    def update(self, labels, block):
+        self.moments.update(block.ravel())
+        self.digest.update(block)
+        self.subjects.update(labels, block)
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        self.subjects.merge(other.subjects)
+        return self
+
+    def pooled(self):
+        return {
+            'mean': self.moments.mean,
+            'std': self.moments.std,
+            'median': self.digest.percentile(50),
+            'p5': self.digest.percentile(5),
+            'p95': self.digest.percentile(95),
+        }
+
+
+def compute_statistics_streaming(csv_path, chunksize=DEFAULT_CHUNKSIZE, timer=None):
+    """
+    Same result as compute_statistics(load_dataset(csv_path)) with medians
+    and percentiles approximated, using memory proportional to chunksize.
+    """
+    timer = timer or StageTimer()
+    hold, flight = ColumnBlockStats(), ColumnBlockStats()
+    wpm, wpm_digest, cpm = Moments(), TDigest(), Moments()
+    sessions = 0
+    hold_cols = flight_cols = None
+
+    reader = pd.read_csv(csv_path, usecols=_is_timing_column, chunksize=chunksize)
+    with timer.stage('stream chunks'):
+        for chunk in reader:
+            if hold_cols is None:
+                hold_cols, flight_cols = hold_columns(chunk), flight_columns(chunk)
+            labels = chunk['subject'].to_numpy()
+            sessions += len(chunk)
+
+            hold.update(labels, chunk[hold_cols].to_numpy(dtype=np.float64) * 1000)
+            flight.update(labels, chunk[flight_cols].to_numpy(dtype=np.float64) * 1000)
+
+            speeds_wpm, speeds_cpm = typing_speeds(chunk, flight_cols)
+            wpm.update(speeds_wpm)
+            wpm_digest.update(speeds_wpm)
+            cpm.update(speeds_cpm)
+
+    with timer.stage('summaries'):
+        hold_cv = hold.subjects.cv()
+        flight_cv = flight.subjects.cv()
+        stats = {
+            'subjects': len(hold.subjects.index),
+            'sessions': sessions,
+            'hold': hold.pooled(),
+            'flight': flight.pooled(),
+            # One CV per subject: small enough to summarise exactly
+            'hold_cv': {
+                'mean': np.mean(hold_cv),
+                'std': np.std(hold_cv),
+                'p95': np.percentile(hold_cv, 95),
+            },
+            'flight_cv': {
+                'mean': np.mean(flight_cv),
+                'p95': np.percentile(flight_cv, 95),
+            },
+            'wpm': {
+                'mean': wpm.mean,
+                'std': wpm.std,
+                'median': wpm_digest.percentile(50),
+                'p25': wpm_digest.percentile(25),
+                'p75': wpm_digest.percentile(75),
+            },
+            'cpm': {
+                'mean': cpm.mean,
+            },
+        }
+    return stats
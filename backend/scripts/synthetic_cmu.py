@@ -0,0 +1,147 @@
+"""
+Generate a synthetic DSL-StrongPasswordData.csv at any scale.
+
+Same columns as the CMU benchmark (subject, sessionIndex, rep, then
+H.*, DD.* and UD.* for the ".tie5Roanl" password, times in seconds),
+400 sessions per subject. Each subject gets their own typing rhythm.
+A fraction of subjects can be made "atypical" (slower, more variable
+typing) with `separation` controlling how far they sit from the rest, and
+their ids can be written to a label file for evaluating anomaly models.
+
+Rows are generated and appended in chunks, so 10^6+ sessions need only
+`chunksize` rows of memory. Random draws come in fixed blocks of
+NOISE_BLOCK rows seeded from (seed, block), so a seed gives the same
+data whatever the chunksize:
+
+    python synthetic_cmu.py --output big.csv --sessions 1000000 --atypical-fraction 0.1
+    python analyze_cmu_dataset.py --stream --data big.csv
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Key sequence of ".tie5Roanl" followed by Return, in CSV column order
+KEYS = ['period', 't', 'i', 'e', 'five', 'Shift.r', 'o', 'a', 'n', 'l', 'Return']
+SESSIONS_PER_SUBJECT = 400
+REPS_PER_SESSION = 50
+DEFAULT_CHUNKSIZE = 100_000
+NOISE_BLOCK = 10_000
+
+# Typical CMU timings in seconds (log-normal medians and sigmas)
+HOLD_MEDIAN, FLIGHT_MEDIAN = 0.09, 0.25
+SUBJECT_SIGMA = {'hold': 0.2, 'flight': 0.3}
+SESSION_SIGMA = {'hold': 0.25, 'flight': 0.45}
+
+
+def columns():
+    cols = ['subject', 'sessionIndex', 'rep']
+    for key, nxt in zip(KEYS, KEYS[1:]):
+        cols += [f'H.{key}', f'DD.{key}.{nxt}', f'UD.{key}.{nxt}']
+    return cols + [f'H.{KEYS[-1]}']
+
+
+def subject_profiles(n_subjects, atypical_fraction=0.0, separation=1.0, seed=42):
+    """Per-subject hold/flight medians, jitter multipliers and the atypical flag."""
+    rng = np.random.default_rng(seed)
+    index = np.arange(n_subjects)
+    atypical = np.floor((index + 1) * atypical_fraction) > np.floor(index * atypical_fraction)
+    return {
+        'hold': rng.lognormal(np.log(HOLD_MEDIAN), SUBJECT_SIGMA['hold'], n_subjects)
+                * np.where(atypical, 1 + 0.4 * separation, 1.0),
+        'flight': rng.lognormal(np.log(FLIGHT_MEDIAN), SUBJECT_SIGMA['flight'], n_subjects)
+                  * np.where(atypical, 1 + 0.8 * separation, 1.0),
+        'jitter': np.where(atypical, 1 + 0.5 * separation, 1.0),
+        'atypical': atypical,
+    }
+
+
+def block_noise(seed, block):
+    """Standard normal draws for rows [block * NOISE_BLOCK, (block + 1) * NOISE_BLOCK), one column per hold/flight."""
+    return np.random.default_rng([seed, block]).standard_normal((NOISE_BLOCK, 2 * len(KEYS) - 1))
+
+
+def row_noise(seed, start, stop, cache):
+    """Draws for rows [start, stop), reusing the last block generated via `cache`."""
+    parts = []
+    for block in range(start // NOISE_BLOCK, (stop - 1) // NOISE_BLOCK + 1):
+        if cache.get('block') != block:
+            cache.update(block=block, noise=block_noise(seed, block))
+        offset = block * NOISE_BLOCK
+        parts.append(cache['noise'][max(start, offset) - offset:min(stop, offset + NOISE_BLOCK) - offset])
+    return np.concatenate(parts)
+
+
+def session_chunks(n_sessions, atypical_fraction=0.0, separation=1.0, seed=42,
+                   chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of up to `chunksize` sessions in CSV column order."""
+    n_subjects = -(-n_sessions // SESSIONS_PER_SUBJECT)
+    profiles = subject_profiles(n_subjects, atypical_fraction, separation, seed)
+    names = np.array([f's{i + 2:03d}' for i in range(n_subjects)])
+    cache = {}
+
+    for start in range(0, n_sessions, chunksize):
+        rows = np.arange(start, min(start + chunksize, n_sessions))
+        noise = row_noise(seed + 1, rows[0], rows[-1] + 1, cache)
+        subject = rows // SESSIONS_PER_SUBJECT
+        in_subject = rows % SESSIONS_PER_SUBJECT
+        hold_base = profiles['hold'][subject]
+        flight_base = profiles['flight'][subject]
+        jitter = profiles['jitter'][subject]
+
+        chunk = {
+            'subject': names[subject],
+            'sessionIndex': in_subject // REPS_PER_SESSION + 1,
+            'rep': in_subject % REPS_PER_SESSION + 1,
+        }
+        for i, (key, nxt) in enumerate(zip(KEYS, KEYS[1:])):
+            hold = hold_base * np.exp(noise[:, 2 * i] * SESSION_SIGMA['hold'] * jitter)
+            flight = flight_base * np.exp(noise[:, 2 * i + 1] * SESSION_SIGMA['flight'] * jitter)
+            chunk[f'H.{key}'] = hold
+            chunk[f'DD.{key}.{nxt}'] = flight
+            # Up-Down is negative when the next key goes down before this one is released
+            chunk[f'UD.{key}.{nxt}'] = flight - hold
+        chunk[f'H.{KEYS[-1]}'] = hold_base * np.exp(noise[:, -1] * SESSION_SIGMA['hold'] * jitter)
+        yield pd.DataFrame(chunk, columns=columns())
+
+
+def write_cmu_csv(path, n_sessions, atypical_fraction=0.0, separation=1.0, seed=42,
+                  chunksize=DEFAULT_CHUNKSIZE, labels_path=None):
+    """Append chunks to `path`; optionally write subject,atypical to `labels_path`."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', newline='') as f:
+        for i, chunk in enumerate(session_chunks(n_sessions, atypical_fraction, separation, seed, chunksize)):
+            chunk.to_csv(f, index=False, header=i == 0, float_format='%.4f')
+    os.replace(tmp_path, path)
+
+    if labels_path:
+        n_subjects = -(-n_sessions // SESSIONS_PER_SUBJECT)
+        profiles = subject_profiles(n_subjects, atypical_fraction, separation, seed)
+        pd.DataFrame({
+            'subject': [f's{i + 2:03d}' for i in range(n_subjects)],
+            'atypical': profiles['atypical'].astype(int),
+        }).to_csv(labels_path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic CMU keystroke dataset')
+    parser.add_argument('--output', default='DSL-StrongPasswordData.csv')
+    parser.add_argument('--sessions', type=int, default=20_400, help='Rows (the real dataset has 20400)')
+    parser.add_argument('--atypical-fraction', type=float, default=0.0,
+                        help='Share of subjects with slower, more irregular typing')
+    parser.add_argument('--separation', type=float, default=1.0, help='How far atypical subjects deviate')
+    parser.add_argument('--labels', help='Optional subject,atypical CSV')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    write_cmu_csv(args.output, args.sessions, args.atypical_fraction, args.separation,
+                  args.seed, args.chunksize, args.labels)
+    print(f"✓ Wrote {args.sessions} sessions to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
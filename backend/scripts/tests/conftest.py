@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the keystroke threshold script tests: a small
+synthetic CMU CSV (synthetic_cmu.py).
+
+    python -m pytest backend/scripts/tests   (or npm run test:scripts)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture(scope='session')
+def cmu_csv(tmp_path_factory):
+    """DSL-StrongPasswordData.csv layout, 8 subjects x 400 sessions (seconds)."""
+    from synthetic_cmu import write_cmu_csv
+
+    path = tmp_path_factory.mktemp('cmu') / 'DSL-StrongPasswordData.csv'
+    return write_cmu_csv(path, 3200, atypical_fraction=0.25, seed=11, chunksize=1000)
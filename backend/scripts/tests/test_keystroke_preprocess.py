@@ -0,0 +1,101 @@
+"""
+preprocess.py (vectorized) against the row-by-row preprocessData.js logic,
+and the training_data.npy / meta.json hand-off to trainModel.py.
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+KEYSTROKE_DIR = Path(__file__).resolve().parents[2] / 'src' / 'ml' / 'keystroke'
+sys.path.insert(0, str(KEYSTROKE_DIR))
+
+from predict import FEATURE_ORDER  # noqa: E402
+from preprocess import meta_path, preprocess  # noqa: E402
+from trainModel import load_training_matrix  # noqa: E402
+
+SAMPLE_CSV = Path(__file__).resolve().parent / 'fixtures' / 'dsl_sample.csv'
+
+
+def js_sessions(path):
+    """Port of preprocessData.js: per row, skip unparsable cells, population std."""
+    def mean(values):
+        return sum(values) / len(values) if values else 0
+
+    def std(values):
+        avg = mean(values)
+        return math.sqrt(mean([(v - avg) ** 2 for v in values])) if values else 0
+
+    sessions = []
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            hold, flight = [], []
+            for key, raw in row.items():
+                try:
+                    value = float(raw)
+                except ValueError:
+                    continue
+                if key.startswith('H.'):
+                    hold.append(value * 1000)
+                elif key.startswith('DD.'):
+                    flight.append(value * 1000)
+            if hold and flight:
+                avg_hold, avg_flight = mean(hold), mean(flight)
+                std_hold, std_flight = std(hold), std(flight)
+                sessions.append({
+                    'avgHoldTime': avg_hold,
+                    'stdHoldTime': std_hold,
+                    'cvHoldTime': std_hold / avg_hold * 100 if avg_hold else 0,
+                    'avgFlightTime': avg_flight,
+                    'stdFlightTime': std_flight,
+                    'cvFlightTime': std_flight / avg_flight * 100 if avg_flight else 0,
+                })
+    return sessions
+
+
+def test_matches_preprocess_data_js(tmp_path):
+    X = preprocess(str(SAMPLE_CSV), str(tmp_path / 'training_data.npy'))
+
+    expected = js_sessions(SAMPLE_CSV)
+    # The rows without hold times or without flight times are skipped
+    assert len(expected) == 4
+    assert X.dtype == np.float32 and X.shape == (4, len(FEATURE_ORDER))
+    np.testing.assert_allclose(X, [[s[name] for name in FEATURE_ORDER] for s in expected], rtol=1e-5)
+
+
+def test_npy_and_meta_round_trip(tmp_path):
+    X = preprocess(str(SAMPLE_CSV), str(tmp_path / 'training_data.npy'))
+
+    meta = json.loads(Path(meta_path(str(tmp_path / 'training_data.npy'))).read_text())
+    assert meta['feature_names'] == FEATURE_ORDER and meta['rows'] == len(X)
+
+    loaded = load_training_matrix(str(tmp_path))
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, X)
+
+
+def test_the_newer_training_file_wins(tmp_path):
+    npy_path = tmp_path / 'training_data.npy'
+    json_path = tmp_path / 'training_data.json'
+    X = preprocess(str(SAMPLE_CSV), str(npy_path))
+    json_path.write_text(json.dumps([dict.fromkeys(FEATURE_ORDER, 1.0)]))
+
+    os.utime(json_path, (npy_path.stat().st_mtime + 10,) * 2)
+    assert load_training_matrix(str(tmp_path)).tolist() == [[1.0] * len(FEATURE_ORDER)]
+
+    os.utime(json_path, (npy_path.stat().st_mtime - 10,) * 2)
+    np.testing.assert_array_equal(load_training_matrix(str(tmp_path)), X)
+
+
+def test_missing_meta_file_is_explained(tmp_path):
+    preprocess(str(SAMPLE_CSV), str(tmp_path / 'training_data.npy'))
+    os.remove(meta_path(str(tmp_path / 'training_data.npy')))
+
+    with pytest.raises(FileNotFoundError, match='training_data.meta.json.*Rerun preprocess.py'):
+        load_training_matrix(str(tmp_path))
@@ -0,0 +1,89 @@
+"""
+Streaming accumulators behind `analyze_cmu_dataset.py --stream`
+(keystroke_streaming.py) against their exact in-memory counterparts.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyze_cmu_dataset import compute_statistics, load_dataset, per_subject_cv
+from keystroke_streaming import Moments, SubjectMoments, TDigest, compute_statistics_streaming
+
+
+def test_moments_merge_chunks_exactly():
+    values = np.random.default_rng(0).lognormal(5, 1, 10_001)
+    values[::97] = np.nan
+
+    chunked = Moments()
+    for chunk in np.array_split(values, 7):
+        chunked.update(chunk)
+    left, right = Moments(), Moments()
+    left.update(values[:3000])
+    right.update(values[3000:])
+
+    finite = values[~np.isnan(values)]
+    for moments in (chunked, left.merge(right)):
+        assert moments.count == len(finite)
+        assert moments.mean == pytest.approx(finite.mean(), rel=1e-12)
+        assert moments.std == pytest.approx(finite.std(), rel=1e-12)
+
+
+def test_subject_moments_match_per_subject_cv():
+    rng = np.random.default_rng(1)
+    labels = rng.choice(['a', 'b', 'c', 'd'], 500)
+    block = rng.gamma(5, 20, (500, 6))
+    block[rng.random(block.shape) < 0.05] = np.nan
+    codes, subjects = pd.factorize(labels)
+
+    streamed = SubjectMoments()
+    for rows in np.array_split(np.arange(500), 9):
+        streamed.update(labels[rows], block[rows])
+
+    # Both number subjects in order of first appearance
+    assert list(streamed.index) == list(subjects)
+    np.testing.assert_allclose(streamed.cv(), per_subject_cv(block, codes, len(subjects)), rtol=1e-10)
+
+
+def test_tdigest_quantiles_track_the_exact_ones():
+    values = np.random.default_rng(2).lognormal(5, 0.6, 200_000)
+    digest = TDigest(buffer_size=10_000)
+    for chunk in np.array_split(values, 13):
+        digest.update(chunk)
+
+    assert digest.count == len(values)
+    assert len(digest.means) < 1000
+    for p in (1, 5, 25, 50, 75, 95, 99):
+        assert digest.percentile(p) == pytest.approx(np.percentile(values, p), rel=0.01)
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+
+def test_tdigest_merge_matches_one_digest():
+    values = np.random.default_rng(3).normal(100, 15, 60_000)
+    whole, left, right = TDigest(), TDigest(), TDigest()
+    whole.update(values)
+    left.update(values[:20_000])
+    right.update(values[20_000:])
+    merged = left.merge(right)
+
+    assert merged.count == whole.count
+    for q in (0.05, 0.5, 0.95):
+        assert merged.quantile(q) == pytest.approx(whole.quantile(q), rel=0.005)
+
+
+def test_streaming_statistics_match_in_memory(cmu_csv):
+    exact = compute_statistics(load_dataset(cmu_csv))
+    streamed = compute_statistics_streaming(cmu_csv, chunksize=700)
+
+    assert streamed['subjects'] == exact['subjects']
+    assert streamed['sessions'] == exact['sessions']
+    for group in ('hold', 'flight'):
+        assert streamed[group]['mean'] == pytest.approx(exact[group]['mean'], rel=1e-9)
+        assert streamed[group]['std'] == pytest.approx(exact[group]['std'], rel=1e-9)
+        for key in ('median', 'p5', 'p95'):
+            assert streamed[group][key] == pytest.approx(exact[group][key], rel=0.02)
+    for group in ('hold_cv', 'flight_cv'):
+        assert streamed[group]['mean'] == pytest.approx(exact[group]['mean'], rel=1e-9)
+    assert streamed['wpm']['mean'] == pytest.approx(exact['wpm']['mean'], rel=1e-9)
+    assert streamed['wpm']['median'] == pytest.approx(exact['wpm']['median'], rel=0.02)
@@ -0,0 +1,21 @@
+"""
+synthetic_cmu.py: a seed pins the generated data regardless of chunking.
+"""
+
+import pandas as pd
+
+from synthetic_cmu import NOISE_BLOCK, session_chunks
+
+
+def generate(n_sessions, chunksize, seed=5):
+    return pd.concat(session_chunks(n_sessions, atypical_fraction=0.25, seed=seed, chunksize=chunksize),
+                     ignore_index=True)
+
+
+def test_chunksize_does_not_change_the_data():
+    n_sessions = 2 * NOISE_BLOCK + 1234
+    whole = generate(n_sessions, n_sessions)
+
+    for chunksize in (999, NOISE_BLOCK, 3 * NOISE_BLOCK):
+        pd.testing.assert_frame_equal(generate(n_sessions, chunksize), whole)
+    assert not generate(n_sessions, n_sessions, seed=6).equals(whole)
@@ -1,44 +1,27 @@
-const { spawn } = require('child_process');
-const path = require('path');
+const { PythonWorkerPool } = require('./workerPool');
 
-async function predictAnomaly(features) {
-  return new Promise((resolve, reject) => {
-    const script = path.resolve(__dirname, 'predict.py');
-    // Use virtual environment Python if available, fallback to system Python
-    const pythonPath = process.env.PYTHON_PATH || 'd:/FYP/Code/.venv/Scripts/python.exe';
-    const python = spawn(pythonPath, [script]);
-
-    let output = '';
-    let errorOutput = '';
+let pool = null;
 
-    python.stdin.write(JSON.stringify(features));
-    python.stdin.end();
-
-    python.stdout.on('data', (data) => {
-      output += data.toString();
-    });
+function getPool() {
+  if (!pool) {
+    pool = new PythonWorkerPool().start();
+  }
+  return pool;
+}
 
-    python.stderr.on('data', (data) => {
-      errorOutput += data.toString();
-    });
+async function predictAnomaly(features) {
+  return getPool().run(features);
+}
 
-    python.on('close', (code) => {
-      if (code === 0) {
-        try {
-          const parsed = JSON.parse(output);
-          resolve(parsed);
-        } catch (err) {
-          reject(new Error(`Failed to parse Python output: ${output}`));
-        }
-      } else {
-        reject(new Error(`Python exited with code ${code}: ${errorOutput}`));
-      }
-    });
+function poolStats() {
+  return pool ? pool.stats() : null;
+}
 
-    python.on('error', (err) => {
-      reject(new Error(`Failed to start Python: ${err.message}`));
-    });
-  });
+function shutdownPool() {
+  if (pool) {
+    pool.close();
+    pool = null;
+  }
 }
 
-module.exports = { predictAnomaly };
+module.exports = { predictAnomaly, getPool, poolStats, shutdownPool };
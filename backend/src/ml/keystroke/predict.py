@@ -1,26 +1,35 @@
 import json
-import numpy as np
-import joblib
 import sys
 import os
+import time
 
-def predict_anomaly(features):
+PROCESS_START = time.perf_counter()
+
+FEATURE_ORDER = [
+    'avgHoldTime',
+    'stdHoldTime',
+    'cvHoldTime',
+    'avgFlightTime',
+    'stdFlightTime',
+    'cvFlightTime'
+]
+
+
+def load_model():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     model_path = os.path.join(script_dir, 'keystroke_anomaly_model.pkl')
 
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model file not found at {model_path}. Train the model first.")
 
-    model = joblib.load(model_path)
+    # Imported here so a spawn that fails early never pays for joblib/sklearn
+    import joblib
+    return joblib.load(model_path)
 
-    X = np.array([[
-        features['avgHoldTime'],
-        features['stdHoldTime'],
-        features['cvHoldTime'],
-        features['avgFlightTime'],
-        features['stdFlightTime'],
-        features['cvFlightTime']
-    ]])
+
+def score_features(model, features):
+    # sklearn converts the nested list itself; predict.py never needs numpy directly
+    X = [[float(features[name]) for name in FEATURE_ORDER]]
 
     prediction = model.predict(X)[0]  # 1 = normal, -1 = anomaly
     score = model.score_samples(X)[0]  # lower = more anomalous
@@ -30,8 +39,51 @@ def predict_anomaly(features):
         'isAnomalous': bool(prediction == -1)
     }
 
+
+def predict_anomaly(features):
+    return score_features(load_model(), features)
+
+
+def run_worker():
+    """
+    Long-lived worker mode used by workerPool.js.
+    Loads the model once, then answers one newline-delimited JSON request
+    ({"id": ..., "features": {...}}) per line on stdout. Results carry
+    inferenceMs and the ready message carries loadMs and startupMs (time from
+    the script starting to the model being usable, i.e. the cold start).
+    """
+    start = time.perf_counter()
+    model = load_model()
+    load_ms = (time.perf_counter() - start) * 1000
+    startup_ms = (time.perf_counter() - PROCESS_START) * 1000
+    sys.stdout.write(json.dumps({'ready': True, 'loadMs': load_ms, 'startupMs': startup_ms}) + '\n')
+    sys.stdout.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request_id = None
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            result = score_features(model, request['features'])
+            result['inferenceMs'] = (time.perf_counter() - start) * 1000
+            response = {'id': request_id, 'result': result}
+        except Exception as e:
+            response = {'id': request_id, 'error': str(e)}
+
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
+
 if __name__ == '__main__':
-    raw = sys.stdin.read()
-    features = json.loads(raw)
-    result = predict_anomaly(features)
-    print(json.dumps(result))
+    if '--worker' in sys.argv[1:]:
+        run_worker()
+    else:
+        raw = sys.stdin.read()
+        features = json.loads(raw)
+        result = predict_anomaly(features)
+        print(json.dumps(result))
@@ -0,0 +1,91 @@
+"""
+Vectorized replacement for preprocessData.js.
+
+Reads the CMU DSL-StrongPasswordData.csv (only the H.* and DD.* columns)
+and computes the six session features with NumPy. It writes:
+    training_data.npy         float32 (n_sessions, 6), FEATURE_ORDER columns
+    training_data.meta.json   feature names, row count, source
+trainModel.py memory-maps the .npy, so loading is O(1) regardless of size.
+
+Usage:
+    python preprocess.py [--data path/to/DSL-StrongPasswordData.csv] [--output training_data.npy]
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from predict import FEATURE_ORDER
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.environ.get(
+    'KEYSTROKE_DATA_PATH',
+    os.path.join(SCRIPT_DIR, '../../../../Keystrokes_Dataset/DSL-StrongPasswordData.csv')
+)
+DEFAULT_OUTPUT_PATH = os.path.join(SCRIPT_DIR, 'training_data.npy')
+CHUNK_ROWS = 100_000
+
+
+def meta_path(npy_path):
+    return os.path.splitext(npy_path)[0] + '.meta.json'
+
+
+def _row_stats(values):
+    """Mean, population std and CV% per row over non-NaN entries (zeros when empty)."""
+    counts = np.sum(~np.isnan(values), axis=1)
+    safe = np.maximum(counts, 1)
+    means = np.nansum(values, axis=1) / safe
+    stds = np.sqrt(np.nansum((values - means[:, None]) ** 2, axis=1) / safe)
+    cvs = np.divide(stds, means, out=np.zeros_like(means), where=means != 0) * 100
+    return means, stds, cvs, counts
+
+
+def session_features(hold, flight):
+    """(n, 6) float32 in FEATURE_ORDER from hold/flight matrices in seconds."""
+    hold_mean, hold_std, hold_cv, hold_n = _row_stats(hold * 1000)
+    flight_mean, flight_std, flight_cv, flight_n = _row_stats(flight * 1000)
+    features = np.column_stack([hold_mean, hold_std, hold_cv, flight_mean, flight_std, flight_cv])
+    # preprocessData.js skips sessions without hold or flight times
+    return features[(hold_n > 0) & (flight_n > 0)].astype(np.float32)
+
+
+def preprocess(data_path=DEFAULT_DATA_PATH, output_path=DEFAULT_OUTPUT_PATH):
+    if not os.path.exists(data_path):
+        raise FileNotFoundError(f"CSV not found at {data_path}. Set KEYSTROKE_DATA_PATH or pass --data.")
+
+    header = pd.read_csv(data_path, nrows=0).columns
+    hold_cols = [c for c in header if c.startswith('H.')]
+    flight_cols = [c for c in header if c.startswith('DD.')]
+
+    chunks = []
+    for chunk in pd.read_csv(data_path, usecols=hold_cols + flight_cols, chunksize=CHUNK_ROWS,
+                             dtype=np.float64):
+        chunks.append(session_features(chunk[hold_cols].to_numpy(), chunk[flight_cols].to_numpy()))
+    X = np.concatenate(chunks) if chunks else np.empty((0, len(FEATURE_ORDER)), dtype=np.float32)
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, X)
+    os.replace(tmp_path, output_path)
+
+    with open(meta_path(output_path), 'w') as f:
+        json.dump({
+            'feature_names': FEATURE_ORDER,
+            'rows': int(len(X)),
+            'dtype': 'float32',
+            'source': os.path.abspath(data_path),
+        }, f, indent=2)
+
+    print(f"✅ Preprocessed {len(X)} sessions -> {output_path}")
+    return X
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the keystroke training matrix')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH)
+    args = parser.parse_args()
+    preprocess(args.data, args.output)
@@ -4,42 +4,73 @@ from sklearn.ensemble import IsolationForest
 import joblib
 import os
 
-def train_isolation_forest():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
+from predict import FEATURE_ORDER
+from preprocess import meta_path
+
+
+def load_training_matrix(script_dir):
+    """
+    Memory-map training_data.npy written by preprocess.py (float32, which
+    the forest uses internally, so fit doesn't copy it), or read the
+    training_data.json written by preprocessData.js. When both exist the
+    newer file is used.
+    """
+    npy_path = os.path.join(script_dir, 'training_data.npy')
     data_path = os.path.join(script_dir, 'training_data.json')
-    model_path = os.path.join(script_dir, 'keystroke_anomaly_model.pkl')
+    has_npy, has_json = os.path.exists(npy_path), os.path.exists(data_path)
+    if not has_npy and not has_json:
+        raise FileNotFoundError(
+            f"No training data in {script_dir}. Run preprocess.py (or preprocessData.js) first."
+        )
+
+    if has_npy and has_json:
+        newer_json = os.path.getmtime(data_path) > os.path.getmtime(npy_path)
+        stale, used = ('training_data.npy', data_path) if newer_json else ('training_data.json', npy_path)
+        print(f"⚠️  Both training files exist; using the newer {os.path.basename(used)} and ignoring {stale}")
+        has_npy = not newer_json
 
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f"training_data.json not found at {data_path}. Run preprocessData.js first.")
+    if has_npy:
+        meta_file = meta_path(npy_path)
+        if not os.path.exists(meta_file):
+            raise FileNotFoundError(
+                f"{npy_path} has no {os.path.basename(meta_file)} describing its columns. "
+                f"Rerun preprocess.py to rebuild both files."
+            )
+        with open(meta_file) as f:
+            meta = json.load(f)
+        if meta['feature_names'] != FEATURE_ORDER:
+            raise ValueError(f"training_data.npy columns {meta['feature_names']} != {FEATURE_ORDER}")
+        return np.load(npy_path, mmap_mode='r')
 
     with open(data_path, 'r') as f:
         data = json.load(f)
 
-    if not data:
-        raise ValueError('No training data found. Check preprocessing output.')
-
-    X = np.array([
-        [
-            s['avgHoldTime'],
-            s['stdHoldTime'],
-            s['cvHoldTime'],
-            s['avgFlightTime'],
-            s['stdFlightTime'],
-            s['cvFlightTime']
-        ]
-        for s in data
-    ])
+    return np.array([[s[name] for name in FEATURE_ORDER] for s in data])
 
-    print(f"📊 Loaded {len(X)} sessions; feature matrix shape: {X.shape}")
 
+def fit_isolation_forest(X):
     model = IsolationForest(
         n_estimators=150,
         contamination=0.1,
         random_state=42,
     )
+    model.fit(X)
+    return model
+
+
+def train_isolation_forest():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    model_path = os.path.join(script_dir, 'keystroke_anomaly_model.pkl')
+
+    X = load_training_matrix(script_dir)
+
+    if not len(X):
+        raise ValueError('No training data found. Check preprocessing output.')
+
+    print(f"📊 Loaded {len(X)} sessions; feature matrix shape: {X.shape}")
 
     print('🤖 Training Isolation Forest...')
-    model.fit(X)
+    model = fit_isolation_forest(X)
     print('✅ Training complete')
 
     joblib.dump(model, model_path)
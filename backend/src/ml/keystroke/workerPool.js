@@ -0,0 +1,224 @@
+const { spawn } = require('child_process');
+const path = require('path');
+const readline = require('readline');
+
+const DEFAULT_POOL_SIZE = parseInt(process.env.KEYSTROKE_WORKERS, 10) || 2;
+const DEFAULT_TIMEOUT_MS = parseInt(process.env.KEYSTROKE_TIMEOUT_MS, 10) || 5000;
+const RESTART_DELAY_MS = 1000;
+const MAX_RESTART_DELAY_MS = 30000;
+
+/**
+ * Keeps N `predict.py --worker` processes warm so each keystroke submission
+ * only pays for one IsolationForest call instead of a full interpreter start.
+ * Workers speak newline-delimited JSON: {id, features} -> {id, result|error}.
+ */
+class PythonWorkerPool {
+  constructor(options = {}) {
+    this.size = options.size || DEFAULT_POOL_SIZE;
+    this.timeoutMs = options.timeoutMs || DEFAULT_TIMEOUT_MS;
+    this.script = options.script || path.resolve(__dirname, 'predict.py');
+    // Point PYTHON_PATH at the project virtualenv's interpreter; python3 otherwise
+    this.pythonPath = options.pythonPath || process.env.PYTHON_PATH || 'python3';
+
+    this.workers = [];
+    this.queue = [];
+    this.nextId = 1;
+    this.started = false;
+    this.closed = false;
+    this.restartDelay = RESTART_DELAY_MS;
+    this.counters = {
+      completed: 0,
+      failed: 0,
+      timedOut: 0,
+      restarts: 0,
+      totalLatencyMs: 0,
+      totalInferenceMs: 0,
+      lastLoadMs: null,
+      lastStartupMs: null
+    };
+  }
+
+  start() {
+    this.started = true;
+    while (this.workers.length < this.size) {
+      this.workers.push(this._spawnWorker());
+    }
+    return this;
+  }
+
+  _spawnWorker() {
+    const child = spawn(this.pythonPath, [this.script, '--worker']);
+    const worker = { child, ready: false, current: null, stderr: '' };
+
+    readline.createInterface({ input: child.stdout }).on('line', (line) => {
+      this._handleLine(worker, line);
+    });
+
+    child.stderr.on('data', (data) => {
+      // Keep only the tail so a chatty worker can't grow memory unbounded
+      worker.stderr = (worker.stderr + data.toString()).slice(-2000);
+    });
+
+    child.on('error', (err) => {
+      worker.stderr += `Failed to start Python: ${err.message}`;
+    });
+
+    // A killed worker can still have a write in flight; the close handler cleans up
+    child.stdin.on('error', () => {});
+
+    child.on('close', (code) => {
+      this._handleExit(worker, code);
+    });
+
+    return worker;
+  }
+
+  _handleLine(worker, line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (err) {
+      return;
+    }
+
+    if (message.ready) {
+      worker.ready = true;
+      this.counters.lastLoadMs = message.loadMs ?? null;
+      this.counters.lastStartupMs = message.startupMs ?? null;
+      this.restartDelay = RESTART_DELAY_MS;
+      this._drain();
+      return;
+    }
+
+    const job = worker.current;
+    if (!job || message.id !== job.id) return;
+
+    clearTimeout(job.timer);
+    worker.current = null;
+
+    if (message.error) {
+      this.counters.failed += 1;
+      job.reject(new Error(`Python worker error: ${message.error}`));
+    } else {
+      this.counters.completed += 1;
+      this.counters.totalLatencyMs += Date.now() - job.enqueuedAt;
+      this.counters.totalInferenceMs += message.result.inferenceMs || 0;
+      job.resolve(message.result);
+    }
+    this._drain();
+  }
+
+  _handleExit(worker, code) {
+    const index = this.workers.indexOf(worker);
+    if (index !== -1) this.workers.splice(index, 1);
+
+    if (worker.current) {
+      this.counters.failed += 1;
+      clearTimeout(worker.current.timer);
+      worker.current.reject(new Error(`Python exited with code ${code}: ${worker.stderr}`));
+      worker.current = null;
+    }
+
+    if (this.closed) return;
+
+    // A worker that never became ready (missing model, bad interpreter) would
+    // otherwise crash-loop, so fail anything still queued instead of waiting,
+    // unless another worker is ready and will drain the queue.
+    if (!worker.ready && !this.workers.some((w) => w.ready)) {
+      this._rejectQueued(new Error(`Python worker failed to start (code ${code}): ${worker.stderr}`));
+    }
+
+    const delay = this.restartDelay;
+    if (!worker.ready) {
+      this.restartDelay = Math.min(this.restartDelay * 2, MAX_RESTART_DELAY_MS);
+    }
+
+    setTimeout(() => {
+      if (!this.closed && this.workers.length < this.size) {
+        this.counters.restarts += 1;
+        this.workers.push(this._spawnWorker());
+      }
+    }, delay).unref();
+  }
+
+  _rejectQueued(error) {
+    const pending = this.queue.splice(0);
+    pending.forEach((job) => {
+      clearTimeout(job.timer);
+      job.reject(error);
+    });
+  }
+
+  _drain() {
+    for (const worker of this.workers) {
+      if (!this.queue.length) return;
+      if (!worker.ready || worker.current) continue;
+
+      const job = this.queue.shift();
+      worker.current = job;
+      job.worker = worker;
+      worker.child.stdin.write(`${JSON.stringify({ id: job.id, features: job.features })}\n`);
+    }
+  }
+
+  run(features) {
+    if (this.closed) {
+      return Promise.reject(new Error('Python worker pool is closed'));
+    }
+    // Only the first call spawns; after that the restart timer in _handleExit
+    // owns respawning so a crash loop keeps its backoff
+    if (!this.started) this.start();
+
+    return new Promise((resolve, reject) => {
+      const job = { id: this.nextId++, features, resolve, reject, worker: null, enqueuedAt: Date.now() };
+
+      // The timeout covers time spent queued as well as time on a worker
+      job.timer = setTimeout(() => {
+        const { worker } = job;
+        if (worker && worker.current === job) {
+          worker.current = null;
+          // The worker may be wedged mid-request; take it out of rotation before
+          // killing it so _drain can't hand it the next job while it dies.
+          // Its close event still schedules the replacement.
+          const index = this.workers.indexOf(worker);
+          if (index !== -1) this.workers.splice(index, 1);
+          worker.child.kill();
+        } else {
+          const index = this.queue.indexOf(job);
+          if (index !== -1) this.queue.splice(index, 1);
+        }
+        this.counters.timedOut += 1;
+        reject(new Error(`Python worker timed out after ${this.timeoutMs}ms`));
+      }, this.timeoutMs);
+
+      this.queue.push(job);
+      this._drain();
+    });
+  }
+
+  /**
+   * Throughput and latency counters; latency is measured from enqueue to
+   * result so it includes queueing, inference is as reported by Python.
+   */
+  stats() {
+    const { completed, totalLatencyMs, totalInferenceMs, ...rest } = this.counters;
+    return {
+      ...rest,
+      completed,
+      workers: this.workers.length,
+      readyWorkers: this.workers.filter(w => w.ready).length,
+      queued: this.queue.length,
+      avgLatencyMs: completed ? totalLatencyMs / completed : null,
+      avgInferenceMs: completed ? totalInferenceMs / completed : null
+    };
+  }
+
+  close() {
+    this.closed = true;
+    this._rejectQueued(new Error('Python worker pool is closed'));
+    this.workers.forEach(worker => worker.child.kill());
+    this.workers = [];
+  }
+}
+
+module.exports = { PythonWorkerPool };
@@ -59,6 +59,17 @@ const handwritingResultSchema = new mongoose.Schema({
     type: String,
     default: 'mock-v1.0'
   },
+  // Background analysis job in the ML service
+  mlJobId: {
+    type: String
+  },
+  analysisError: {
+    type: String
+  },
+  // unreadable (bad image) | job_lost | worker_crashed | internal_error
+  analysisErrorCode: {
+    type: String
+  },
   analyzedAt: {
     type: Date
   }
@@ -6,6 +6,69 @@ const fs = require('fs');
 const HandwritingResult = require('../models/HandwritingResult');
 const Assessment = require('../models/Assessment');
 const { protect } = require('../middleware/auth');
+const { submitHandwritingJob, getHandwritingJob } = require('../services/mlService');
+
+// How long /analyze/:id waits for the background job before answering 202
+const HANDWRITING_WAIT_MS = parseInt(process.env.HANDWRITING_WAIT_MS, 10) || 20000;
+const HANDWRITING_POLL_MS = parseInt(process.env.HANDWRITING_POLL_MS, 10) || 500;
+
+/**
+ * Pull the ML job state into a HandwritingResult that is being analyzed.
+ * Saves the document when the job has finished. A job the ML service no
+ * longer knows (purged after its TTL, or lost in a restart) is marked
+ * failed so the image can be resubmitted instead of polling forever.
+ *
+ * @returns {Promise<Object>} The ML job
+ */
+const syncAnalysisJob = async (handwritingResult) => {
+  let job;
+  try {
+    job = await getHandwritingJob(handwritingResult.mlJobId);
+  } catch (mlError) {
+    if (mlError.response?.status !== 404) throw mlError;
+    job = {
+      job_id: handwritingResult.mlJobId,
+      status: 'failed',
+      error: 'Analysis job was lost by the ML service; please retry the analysis',
+      error_code: 'job_lost'
+    };
+  }
+
+  if (job.status === 'completed') {
+    const analysis = job.result;
+    handwritingResult.status = 'completed';
+    handwritingResult.analysisResults = {
+      riskScore: analysis.risk_score,
+      detectedIssues: analysis.detected_issues,
+      recommendations: analysis.recommendations,
+      confidence: analysis.confidence,
+      processingTime: Math.round(analysis.processing_time_ms)
+    };
+    handwritingResult.mlModelVersion = analysis.model_version;
+    handwritingResult.analyzedAt = new Date();
+    await handwritingResult.save();
+  } else if (job.status === 'failed') {
+    handwritingResult.status = 'failed';
+    handwritingResult.analysisError = job.error;
+    handwritingResult.analysisErrorCode = job.error_code;
+    await handwritingResult.save();
+  }
+
+  return job;
+};
+
+const formatAnalysis = (handwritingResult) => ({
+  id: handwritingResult._id,
+  status: handwritingResult.status,
+  riskScore: handwritingResult.analysisResults?.riskScore ?? null,
+  riskLevel: handwritingResult.riskLevel,
+  detectedIssues: handwritingResult.analysisResults?.detectedIssues || [],
+  recommendations: handwritingResult.analysisResults?.recommendations || [],
+  confidence: handwritingResult.analysisResults?.confidence ?? null,
+  modelVersion: handwritingResult.mlModelVersion,
+  error: handwritingResult.analysisError,
+  analyzedAt: handwritingResult.analyzedAt
+});
 
 // Configure multer for file uploads
 const storage = multer.diskStorage({
@@ -112,7 +175,7 @@ router.post('/upload', protect, upload.single('image'), async (req, res) => {
 });
 
 // @route   POST /api/handwriting/analyze/:id
-// @desc    Analyze handwriting (MOCK - returns fake data)
+// @desc    Analyze handwriting with the ML service image pipeline
 // @access  Private
 router.post('/analyze/:id', protect, async (req, res) => {
   try {
@@ -128,72 +191,79 @@ router.post('/analyze/:id', protect, async (req, res) => {
       });
     }
 
-    if (handwritingResult.status === 'completed') {
-      return res.status(400).json({
-        success: false,
-        message: 'This image has already been analyzed'
-      });
+    // Re-analysis is allowed: the ML service caches results by image hash and
+    // model version, so retries cost a lookup and a new model re-scores the image.
+    // Queue the image unless a job is already running for it (e.g. double submit)
+    if (handwritingResult.status !== 'analyzing' || !handwritingResult.mlJobId) {
+      try {
+        const imageFile = path.join(__dirname, '../../', handwritingResult.imagePath);
+        const job = await submitHandwritingJob(
+          imageFile,
+          handwritingResult.originalFileName,
+          handwritingResult.mimeType
+        );
+        handwritingResult.mlJobId = job.job_id;
+        handwritingResult.analysisError = undefined;
+        handwritingResult.analysisErrorCode = undefined;
+        handwritingResult.status = 'analyzing';
+        await handwritingResult.save();
+      } catch (mlError) {
+        // ML job queue full: leave the image pending so it can be retried
+        if (mlError.response?.status === 429) {
+          res.set('Retry-After', mlError.response.headers?.['retry-after'] || '5');
+          return res.status(503).json({
+            success: false,
+            message: 'Handwriting analysis is busy, please retry shortly'
+          });
+        }
+
+        console.error('Handwriting ML error:', mlError.message);
+        return res.status(502).json({
+          success: false,
+          message: 'Handwriting analysis service unavailable',
+          error: mlError.response?.data?.detail || mlError.message
+        });
+      }
     }
 
-    // Update status to analyzing
-    handwritingResult.status = 'analyzing';
-    await handwritingResult.save();
+    // Poll the job for a while so most requests still get the result directly
+    const deadline = Date.now() + HANDWRITING_WAIT_MS;
+    let job = await syncAnalysisJob(handwritingResult);
+    while (job.status !== 'completed' && job.status !== 'failed' && Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, HANDWRITING_POLL_MS));
+      job = await syncAnalysisJob(handwritingResult);
+    }
 
-    // Simulate analysis delay (500ms)
-    await new Promise(resolve => setTimeout(resolve, 500));
-
-    // MOCK ANALYSIS RESULTS (Replace this with real ML API call later)
-    const mockResults = {
-      riskScore: Math.random() * 0.4 + 0.3, // Random score between 0.3 and 0.7
-      detectedIssues: [
-        {
-          type: 'letter_reversal',
-          count: Math.floor(Math.random() * 5) + 1,
-          severity: ['low', 'moderate', 'high'][Math.floor(Math.random() * 3)],
-          examples: ['b/d confusion', 'p/q reversal']
-        },
-        {
-          type: 'irregular_spacing',
-          count: Math.floor(Math.random() * 8) + 2,
-          severity: ['moderate', 'high'][Math.floor(Math.random() * 2)],
-          examples: ['uneven word spacing', 'crowded letters']
-        },
-        {
-          type: 'inconsistent_size',
-          count: Math.floor(Math.random() * 4) + 1,
-          severity: 'low',
-          examples: ['varying letter heights']
-        }
-      ],
-      recommendations: [
-        'Practice letter formation with guided worksheets',
-        'Use lined paper with spacing guides',
-        'Perform daily handwriting exercises for 10-15 minutes',
-        'Work on letter recognition activities'
-      ],
-      confidence: 0.85,
-      processingTime: 487
-    };
+    if (job.status === 'failed') {
+      // Only a bad image is the user's problem; a lost or crashed job is ours
+      if (job.error_code === 'unreadable') {
+        return res.status(422).json({
+          success: false,
+          message: 'No readable handwriting was found in this image',
+          error: job.error
+        });
+      }
 
-    // Update handwriting result with mock analysis
-    handwritingResult.status = 'completed';
-    handwritingResult.analysisResults = mockResults;
-    handwritingResult.analyzedAt = new Date();
-    await handwritingResult.save();
+      res.set('Retry-After', '5');
+      return res.status(503).json({
+        success: false,
+        message: 'Handwriting analysis failed on the server, please retry the analysis',
+        error: job.error
+      });
+    }
+
+    if (job.status !== 'completed') {
+      return res.status(202).json({
+        success: true,
+        message: 'Analysis queued; poll the results endpoint for completion',
+        result: formatAnalysis(handwritingResult)
+      });
+    }
 
     res.status(200).json({
       success: true,
       message: 'Analysis completed successfully',
-      result: {
-        id: handwritingResult._id,
-        status: handwritingResult.status,
-        riskScore: mockResults.riskScore,
-        riskLevel: handwritingResult.riskLevel,
-        detectedIssues: mockResults.detectedIssues,
-        recommendations: mockResults.recommendations,
-        confidence: mockResults.confidence,
-        analyzedAt: handwritingResult.analyzedAt
-      }
+      result: formatAnalysis(handwritingResult)
     });
   } catch (error) {
     console.error('Analysis error:', error);
@@ -222,6 +292,15 @@ router.get('/results/:id', protect, async (req, res) => {
       });
     }
 
+    if (handwritingResult.status === 'analyzing' && handwritingResult.mlJobId) {
+      try {
+        await syncAnalysisJob(handwritingResult);
+      } catch (mlError) {
+        // Report the last known state; the next poll will try again
+        console.error('Handwriting job poll error:', mlError.message);
+      }
+    }
+
     res.status(200).json({
       success: true,
       result: {
@@ -234,6 +313,8 @@ router.get('/results/:id', protect, async (req, res) => {
         detectedIssues: handwritingResult.analysisResults?.detectedIssues || [],
         recommendations: handwritingResult.analysisResults?.recommendations || [],
         confidence: handwritingResult.analysisResults?.confidence || null,
+        modelVersion: handwritingResult.mlModelVersion,
+        error: handwritingResult.analysisError,
         analyzedAt: handwritingResult.analyzedAt,
         createdAt: handwritingResult.createdAt
       }
@@ -3,6 +3,7 @@ const router = express.Router();
 const ReadingResult = require('../models/ReadingResult');
 const ReadingPassage = require('../models/ReadingPassage');
 const { protect } = require('../middleware/auth');
+const { analyzeReading } = require('../services/mlService');
 const {
   FEATURE_WEIGHTS,
   READING_TIME,
@@ -144,6 +145,32 @@ router.post('/submit', protect, async (req, res) => {
     // Calculate risk score and generate recommendations (needs derived metrics)
     readingResult.calculateRiskScore();
     
+    // Prefer the trained ETDD70 classifier; threshold scoring above is the fallback
+    try {
+      const ml = await analyzeReading({
+        totalReadingTime: readingResult.totalReadingTime,
+        totalRevisits: readingResult.totalRevisits,
+        pauseCount: readingResult.pauseCount,
+        pauseDurations: readingResult.pauseDurations,
+        averagePauseDuration: readingResult.averagePauseDuration,
+        passageTotalWords: readingResult.passageTotalWords,
+        comprehensionScore: readingResult.comprehensionScore
+      });
+      
+      readingResult.riskScore = Math.round(ml.risk_score * 100);
+      readingResult.riskBreakdown = {
+        ...(readingResult.riskBreakdown || {}),
+        scoringMethod: 'ml',
+        modelVersion: ml.model_version,
+        readingDifficultyScore: ml.reading_difficulty_score,
+        mappedFeatures: ml.features
+      };
+      readingResult.markModified('riskScore');
+      readingResult.markModified('riskBreakdown');
+    } catch (error) {
+      console.warn('ML reading analysis unavailable, using threshold scoring:', error.message);
+    }
+    
     // Set riskLevel based on riskScore (using validated thresholds from config)
     if (readingResult.riskScore >= RISK_SCORE_RANGES.high) {
       readingResult.riskLevel = 'HIGH';
@@ -0,0 +1,65 @@
+const fs = require('fs');
+const mongoose = require('mongoose');
+const KeystrokeResult = require('../models/KeystrokeResult');
+require('dotenv').config();
+
+// Export KeystrokeResult feature rows as NDJSON for incremental retraining:
+//   node src/scripts/exportKeystrokeFeatures.js [--since <ISO date>] [--out <file>]
+//   python -m keystroke.incremental ingest <file>   (from ml-models/)
+
+const FEATURE_FIELDS = [
+  'avgHoldTime',
+  'stdHoldTime',
+  'cvHoldTime',
+  'avgFlightTime',
+  'stdFlightTime',
+  'cvFlightTime'
+];
+
+function parseArgs(argv) {
+  const args = {};
+  for (let i = 0; i < argv.length; i += 2) {
+    args[argv[i].replace(/^--/, '')] = argv[i + 1];
+  }
+  return args;
+}
+
+async function exportFeatures({ since, out }) {
+  const query = { avgHoldTime: { $gt: 0 }, avgFlightTime: { $gt: 0 } };
+  if (since) {
+    query.createdAt = { $gt: new Date(since) };
+  }
+
+  const output = out ? fs.createWriteStream(out) : process.stdout;
+  const cursor = KeystrokeResult.find(query)
+    .select([...FEATURE_FIELDS, 'createdAt'].join(' '))
+    .sort({ createdAt: 1 })
+    .lean()
+    .cursor();
+
+  let count = 0;
+  for await (const doc of cursor) {
+    const row = { createdAt: doc.createdAt.toISOString() };
+    FEATURE_FIELDS.forEach((field) => { row[field] = doc[field]; });
+    if (!output.write(JSON.stringify(row) + '\n')) {
+      await new Promise(resolve => output.once('drain', resolve));
+    }
+    count += 1;
+  }
+
+  if (out) {
+    await new Promise(resolve => output.end(resolve));
+  }
+  return count;
+}
+
+mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/dyslexia_detection')
+  .then(async () => {
+    const count = await exportFeatures(parseArgs(process.argv.slice(2)));
+    console.error(`✓ Exported ${count} keystroke sessions`);
+    process.exit(0);
+  })
+  .catch(err => {
+    console.error('❌ Error exporting keystroke features:', err);
+    process.exit(1);
+  });
@@ -6,6 +6,7 @@ const compression = require('compression');
 const morgan = require('morgan');
 const path = require('path');
 require('dotenv').config();
+const { getPool, poolStats } = require('./ml/keystroke/predict');
 
 const app = express();
 
@@ -32,7 +33,7 @@ mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/dyslexia_
 
 // Routes
 app.get('/api/health', (req, res) => {
-  res.json({ status: 'ok', message: 'Server is running' });
+  res.json({ status: 'ok', message: 'Server is running', keystrokeWorkers: poolStats() });
 });
 
 // Auth routes
@@ -68,6 +69,9 @@ const PORT = process.env.PORT || 5000;
 app.listen(PORT, () => {
   console.log(`✓ Server running on port ${PORT}`);
   console.log(`✓ Environment: ${process.env.NODE_ENV || 'development'}`);
+
+  // Warm the keystroke model workers so the first submission doesn't pay Python startup
+  getPool();
 });
 
 module.exports = app;
@@ -0,0 +1,63 @@
+const axios = require('axios');
+const fs = require('fs/promises');
+
+const ML_API_URL = process.env.ML_API_URL || 'http://localhost:8000';
+const ML_API_TIMEOUT_MS = parseInt(process.env.ML_API_TIMEOUT_MS, 10) || 3000;
+// Image uploads are larger than JSON payloads
+const ML_UPLOAD_TIMEOUT_MS = parseInt(process.env.ML_UPLOAD_TIMEOUT_MS, 10) || 15000;
+
+const client = axios.create({
+  baseURL: ML_API_URL,
+  timeout: ML_API_TIMEOUT_MS
+});
+
+/**
+ * Score a reading result with the ETDD70 classifier in the ML service.
+ *
+ * @param {Object} metrics - ReadingResult fields (totalReadingTime, totalRevisits, ...)
+ * @returns {Promise<Object>} { risk_score, reading_difficulty_score, model_version, features }
+ */
+async function analyzeReading(metrics) {
+  const { data } = await client.post('/api/ml/reading/analyze', { metrics });
+  return data;
+}
+
+/**
+ * Queue an uploaded handwriting image for background analysis in the ML service.
+ *
+ * @param {string} filePath - Path of the uploaded image on disk
+ * @param {string} fileName - Original file name
+ * @param {string} mimeType - Image MIME type
+ * @returns {Promise<Object>} Job { job_id, status, created_at, ... }
+ */
+async function submitHandwritingJob(filePath, fileName, mimeType) {
+  const image = await fs.readFile(filePath);
+  const form = new FormData();
+  form.append('file', new Blob([image], { type: mimeType }), fileName);
+
+  const { data } = await client.post('/api/ml/handwriting/jobs', form, {
+    timeout: ML_UPLOAD_TIMEOUT_MS
+  });
+  return data;
+}
+
+/**
+ * Fetch a handwriting job. Once status is 'completed', result holds
+ * { risk_score, features, reversals_detected, confidence, detected_issues,
+ * recommendations, model_version, processing_time_ms }; 'failed' jobs carry error and
+ * error_code ('unreadable' for a bad image, otherwise a server-side failure).
+ *
+ * @param {string} jobId
+ * @returns {Promise<Object>}
+ */
+async function getHandwritingJob(jobId) {
+  const { data } = await client.get(`/api/ml/handwriting/jobs/${jobId}`);
+  return data;
+}
+
+module.exports = {
+  client,
+  analyzeReading,
+  submitHandwritingJob,
+  getHandwritingJob
+};
@@ -0,0 +1,46 @@
+/**
+ * Stand-in for `predict.py --worker` speaking the same newline-delimited
+ * JSON protocol, so the pool can be tested without Python or a model.
+ *
+ * FAKE_WORKER_MODE=crash exits before becoming ready; with
+ * FAKE_WORKER_MODE=crash-once only the first worker to claim the file
+ * FAKE_WORKER_MARKER does, after 100 ms so its siblings are ready first
+ * (a slow model load that runs out of memory). Otherwise features {hang: true} never get an
+ * answer, {fail: true} return an error and {delayMs} delays the answer.
+ */
+const fs = require('fs');
+const readline = require('readline');
+
+const crashOnce = () => {
+  try {
+    fs.closeSync(fs.openSync(process.env.FAKE_WORKER_MARKER, 'wx'));
+    return true;
+  } catch (err) {
+    return false;
+  }
+};
+
+const crash = () => {
+  process.stderr.write('model missing');
+  process.exit(1);
+};
+
+if (process.env.FAKE_WORKER_MODE === 'crash') {
+  crash();
+} else if (process.env.FAKE_WORKER_MODE === 'crash-once' && crashOnce()) {
+  setTimeout(crash, 100);
+  return;
+}
+
+process.stdout.write(`${JSON.stringify({ ready: true, loadMs: 1, startupMs: 2 })}\n`);
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  const { id, features } = JSON.parse(line);
+  if (features.hang) return;
+  if (features.fail) {
+    process.stdout.write(`${JSON.stringify({ id, error: 'bad features' })}\n`);
+    return;
+  }
+  const result = { anomalyScore: -features.avgHoldTime, isAnomalous: false, inferenceMs: 0.5, pid: process.pid };
+  setTimeout(() => process.stdout.write(`${JSON.stringify({ id, result })}\n`), features.delayMs || 0);
+});
@@ -0,0 +1,127 @@
+/**
+ * Unit Tests for the keystroke Python worker pool
+ *
+ * Workers are replaced by tests/fixtures/fakePythonWorker.js run under
+ * node, which speaks the predict.py --worker protocol.
+ *
+ * Run: npm test or jest workerPool.test.js
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { PythonWorkerPool } = require('../src/ml/keystroke/workerPool');
+
+const FAKE_WORKER = path.resolve(__dirname, 'fixtures', 'fakePythonWorker.js');
+
+function createPool(options = {}) {
+  return new PythonWorkerPool({ pythonPath: process.execPath, script: FAKE_WORKER, ...options });
+}
+
+function waitFor(predicate, timeoutMs = 2000) {
+  return new Promise((resolve, reject) => {
+    const started = Date.now();
+    const poll = () => {
+      if (predicate()) return resolve();
+      if (Date.now() - started > timeoutMs) return reject(new Error('condition not met'));
+      setTimeout(poll, 10);
+    };
+    poll();
+  });
+}
+
+describe('PythonWorkerPool', () => {
+  let pool;
+
+  afterEach(() => {
+    if (pool) pool.close();
+    pool = null;
+    delete process.env.FAKE_WORKER_MODE;
+    delete process.env.FAKE_WORKER_MARKER;
+  });
+
+  test('should default to python3 when no interpreter is configured', () => {
+    const previous = process.env.PYTHON_PATH;
+    delete process.env.PYTHON_PATH;
+    try {
+      expect(new PythonWorkerPool().pythonPath).toBe('python3');
+    } finally {
+      if (previous !== undefined) process.env.PYTHON_PATH = previous;
+    }
+  });
+
+  test('should resolve results and record stats', async () => {
+    pool = createPool({ size: 2 }).start();
+
+    const results = await Promise.all([1, 2, 3].map(avgHoldTime => pool.run({ avgHoldTime })));
+
+    expect(results.map(r => r.anomalyScore)).toEqual([-1, -2, -3]);
+    const stats = pool.stats();
+    expect(stats.completed).toBe(3);
+    expect(stats.lastLoadMs).toBe(1);
+    expect(stats.lastStartupMs).toBe(2);
+    expect(stats.queued).toBe(0);
+  });
+
+  test('should reject with the worker error message', async () => {
+    pool = createPool({ size: 1 }).start();
+
+    await expect(pool.run({ fail: true })).rejects.toThrow('bad features');
+    expect(pool.stats().failed).toBe(1);
+  });
+
+  test('should take a timed-out worker out of rotation before it exits', async () => {
+    pool = createPool({ size: 2, timeoutMs: 200 }).start();
+    await waitFor(() => pool.stats().readyWorkers === 2);
+
+    const hung = pool.run({ hang: true });
+    const [busy] = pool.workers.filter(w => w.current);
+    await expect(hung).rejects.toThrow('timed out');
+
+    // Synchronously after the timeout the dying worker must be gone
+    expect(pool.workers).not.toContain(busy);
+    const result = await pool.run({ avgHoldTime: 4 });
+    expect(result.pid).not.toBe(busy.child.pid);
+    expect(pool.stats().timedOut).toBe(1);
+  });
+
+  test('should not respawn on every request while workers crash-loop', async () => {
+    process.env.FAKE_WORKER_MODE = 'crash';
+    pool = createPool({ size: 1 });
+    const spawn = jest.spyOn(pool, '_spawnWorker');
+    pool.start();
+
+    await expect(pool.run({ avgHoldTime: 1 })).rejects.toThrow('failed to start');
+    const runs = [1, 2, 3].map(avgHoldTime => pool.run({ avgHoldTime }).catch(err => err));
+
+    // Respawns wait for the restart backoff (1s) instead of following requests
+    expect(spawn).toHaveBeenCalledTimes(1);
+    pool.close();
+    await Promise.all(runs);
+  });
+
+  test('should keep queued work for the ready workers when one fails to start', async () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'worker-pool-'));
+    process.env.FAKE_WORKER_MODE = 'crash-once';
+    process.env.FAKE_WORKER_MARKER = path.join(dir, 'crashed');
+    pool = createPool({ size: 2 }).start();
+
+    // Queued before either worker is ready; slow jobs keep the healthy
+    // worker busy while its sibling exits, so the rest are still queued
+    const results = await Promise.all(
+      [1, 2, 3, 4].map(avgHoldTime => pool.run({ avgHoldTime, delayMs: 100 }))
+    );
+
+    expect(results.map(r => r.anomalyScore)).toEqual([-1, -2, -3, -4]);
+    expect(fs.existsSync(process.env.FAKE_WORKER_MARKER)).toBe(true);
+    expect(pool.stats().failed).toBe(0);
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  test('should reject new work once closed', async () => {
+    pool = createPool({ size: 1 }).start();
+    pool.close();
+
+    await expect(pool.run({ avgHoldTime: 1 })).rejects.toThrow('closed');
+  });
+});
@@ -0,0 +1,81 @@
+"""
+CMU keystroke pipeline: analyze_cmu_dataset (in-memory and --stream),
+preprocess.py and trainModel.py, from the CSV to the saved forest.
+"""
+
+import os
+
+import joblib
+import numpy as np
+
+from analyze_cmu_dataset import build_thresholds, compute_statistics, load_dataset, render_js_config
+from harness import Suite
+from keystroke_streaming import compute_statistics_streaming
+from preprocess import preprocess, session_features
+from synthetic_cmu import write_cmu_csv
+from trainModel import fit_isolation_forest, load_training_matrix
+
+
+def setup(size, workdir):
+    csv_path = os.path.join(workdir, 'DSL-StrongPasswordData.csv')
+    if not os.path.exists(csv_path):
+        write_cmu_csv(csv_path, size)
+    return {'csv': csv_path, 'workdir': workdir}
+
+
+suite = Suite('cmu', setup)
+
+
+@suite.stage('load')
+def load(ctx):
+    return load_dataset(ctx['csv'])
+
+
+@suite.stage('statistics', needs=['load'])
+def statistics(ctx):
+    return compute_statistics(ctx['load'])
+
+
+@suite.stage('thresholds', needs=['statistics'])
+def thresholds(ctx):
+    return build_thresholds(ctx['statistics']), render_js_config(ctx['statistics'])
+
+
+@suite.stage('stream')
+def stream(ctx):
+    return compute_statistics_streaming(ctx['csv'])
+
+
+@suite.stage('features', needs=['load'])
+def features(ctx):
+    df = ctx['load']
+    hold = df[[col for col in df.columns if col.startswith('H.')]].to_numpy(dtype=np.float64)
+    flight = df[[col for col in df.columns if col.startswith('DD.')]].to_numpy(dtype=np.float64)
+    return session_features(hold, flight)
+
+
+@suite.stage('preprocess')
+def preprocess_csv(ctx):
+    output = os.path.join(ctx['workdir'], 'training_data.npy')
+    preprocess(ctx['csv'], output)
+    return output
+
+
+@suite.stage('load_matrix', needs=['preprocess'])
+def load_matrix(ctx):
+    return load_training_matrix(ctx['workdir'])
+
+
+@suite.stage('fit', needs=['features'])
+def fit(ctx):
+    return fit_isolation_forest(ctx['features'])
+
+
+@suite.stage('evaluate', needs=['features', 'fit'])
+def evaluate(ctx):
+    return float(np.mean(ctx['fit'].predict(ctx['features']) == -1))
+
+
+@suite.stage('export', needs=['fit'])
+def export(ctx):
+    joblib.dump(ctx['fit'], os.path.join(ctx['workdir'], 'keystroke_anomaly_model.pkl'))
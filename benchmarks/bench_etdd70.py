@@ -0,0 +1,95 @@
+"""
+ETDD70 reading pipeline: etdd70_loader, etdd70_features, etdd70_analysis
+and train_ml_model, from CSV loading to the exported artifact.
+
+Stages that read one CSV per subject are skipped above
+BENCH_ETDD70_MAX_FILES subjects (default 7000); the in-memory stages run
+at every size on an equivalent synthetic frame.
+"""
+
+import os
+
+import pandas as pd
+
+from etdd70_analysis import ETDD70Analyzer
+from etdd70_features import build_feature_matrix
+from etdd70_loader import DEFAULT_TASK, TRIAL_COLUMNS, load_subject_features
+from harness import Suite
+from synthetic_etdd70 import subject_blocks, write_etdd70_dataset
+from train_ml_model import DyslexiaClassifier
+
+MAX_FILES = int(os.getenv('BENCH_ETDD70_MAX_FILES', 7000))
+
+
+def setup(size, workdir):
+    frame = pd.concat(subject_blocks(size), ignore_index=True)
+    ctx = {'frame': frame, 'workdir': workdir, 'data_dir': None, 'labels': None}
+    if size > MAX_FILES:
+        return ctx
+
+    labels = os.path.join(workdir, 'dyslexia_class_label.csv')
+    data_dir = os.path.join(workdir, 'data')
+    if not os.path.exists(labels):
+        write_etdd70_dataset(workdir, size)
+    # Warm the loader cache so load_cached measures a pure cache hit
+    load_subject_features(data_dir, labels, cache_dir=os.path.join(workdir, 'cache'))
+    ctx.update(data_dir=data_dir, labels=labels)
+    return ctx
+
+
+suite = Suite('etdd70', setup)
+
+
+@suite.stage('load', max_size=MAX_FILES)
+def load(ctx):
+    return load_subject_features(ctx['data_dir'], ctx['labels'], use_cache=False)
+
+
+@suite.stage('load_cached', max_size=MAX_FILES)
+def load_cached(ctx):
+    return load_subject_features(ctx['data_dir'], ctx['labels'], cache_dir=os.path.join(ctx['workdir'], 'cache'))
+
+
+@suite.stage('features', max_size=MAX_FILES)
+def features(ctx):
+    return build_feature_matrix(ctx['data_dir'], ctx['labels'], tasks=[DEFAULT_TASK], kinds=['metrics'])
+
+
+@suite.stage('stats')
+def stats(ctx):
+    analyzer = ETDD70Analyzer(ctx['data_dir'] or '.', ctx['labels'] or '.')
+    analyzer.metrics_df = ctx['frame']
+    analyzer.dyslexic_df = ctx['frame'][ctx['frame']['class_id'] == 1]
+    analyzer.non_dyslexic_df = ctx['frame'][ctx['frame']['class_id'] == 0]
+    return analyzer.calculate_descriptive_stats(), analyzer.calculate_thresholds()
+
+
+@suite.stage('split_scale')
+def split_scale(ctx):
+    classifier = DyslexiaClassifier(ctx['data_dir'] or '.', ctx['labels'] or '.')
+    classifier.df = ctx['frame']
+    classifier.feature_names = list(TRIAL_COLUMNS)
+    classifier.X = ctx['frame'][TRIAL_COLUMNS].values
+    classifier.y = ctx['frame']['class_id'].values
+    classifier.split_and_scale_data()
+    return classifier
+
+
+@suite.stage('fit', needs=['split_scale'])
+def fit(ctx):
+    return ctx['split_scale'].fit_random_forest()
+
+
+@suite.stage('fit_lr', needs=['split_scale'])
+def fit_lr(ctx):
+    return ctx['split_scale'].train_logistic_regression()
+
+
+@suite.stage('evaluate', needs=['split_scale', 'fit'])
+def evaluate(ctx):
+    return ctx['split_scale'].evaluate_random_forest()
+
+
+@suite.stage('export', needs=['split_scale', 'evaluate'])
+def export(ctx):
+    return ctx['split_scale'].export_model(output_dir=os.path.join(ctx['workdir'], 'artifacts'))
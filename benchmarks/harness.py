@@ -0,0 +1,158 @@
+"""
+Minimal benchmark harness: stage registry, wall time and peak memory.
+
+A suite registers its stages in pipeline order. For every dataset size the
+runner builds a context once with the suite's setup function, then times
+each stage; a stage's return value is stored in the context under its name
+so later stages (fit -> evaluate -> export) can reuse it.
+
+Peak memory is measured two ways. The rise of the process high-water
+mark (VmHWM, reset through /proc/self/clear_refs) counts native
+allocations too (sklearn trees, pandas parsers), but only for pages that
+weren't already resident: a stage that reuses memory freed by setup or an
+earlier round shows no rise. So every stage also gets one extra, untimed
+round under tracemalloc, whose peak counts every Python-level allocation.
+`peak_memory_mb` is the larger of the two.
+"""
+
+import contextlib
+import gc
+import io
+import os
+import time
+import tracemalloc
+
+
+class Suite:
+    def __init__(self, group, setup):
+        self.group = group
+        self.setup = setup
+        self.stages = []
+
+    def stage(self, name, max_size=None, needs=()):
+        """
+        Register a stage. `max_size` skips it above that size (e.g. stages
+        that write one file per subject); `needs` lists context keys that
+        must be present, otherwise the stage is skipped.
+        """
+        def register(fn):
+            self.stages.append({'name': name, 'fn': fn, 'max_size': max_size, 'needs': tuple(needs)})
+            return fn
+        return register
+
+
+def _status_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    raise OSError(f'{field} not in /proc/self/status')
+
+
+def _reset_peak_rss():
+    """Reset VmHWM to the current RSS (Linux >= 4.0); False when unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def measure(fn, rounds=1):
+    """
+    Run `fn` `rounds` times, then once more under tracemalloc.
+
+    Returns:
+        (last return value, {'wall_s': {...}, 'peak_memory_mb',
+        'peak_rss_growth_mb', 'peak_traced_mb'})
+    """
+    times = []
+    result = None
+    gc.collect()
+
+    peak_rss = _reset_peak_rss()
+    if peak_rss:
+        baseline = _status_kb('VmRSS:')
+
+    for _ in range(rounds):
+        result = None
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    rss_growth_mb = max(0, _status_kb('VmHWM:') - baseline) / 1024 if peak_rss else None
+
+    result = None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        traced_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        'rounds': rounds,
+        'wall_s': {
+            'min': round(min(times), 6),
+            'mean': round(sum(times) / len(times), 6),
+            'max': round(max(times), 6),
+        },
+        'peak_memory_mb': round(max(rss_growth_mb or 0.0, traced_mb), 2),
+        'peak_rss_growth_mb': None if rss_growth_mb is None else round(rss_growth_mb, 2),
+        'peak_traced_mb': round(traced_mb, 2),
+    }
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """Swallow the pipelines' progress prints."""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def default_rounds(size):
+    return 1 if size >= 100_000 else 3
+
+
+def run_suite(suite, sizes, workdir, rounds=None, stages=None, verbose=False, log=print):
+    """Run every stage of `suite` at each size; returns a list of result dicts."""
+    results = []
+    for size in sizes:
+        size_dir = os.path.join(workdir, f'{suite.group}_{size}')
+        os.makedirs(size_dir, exist_ok=True)
+
+        with quiet(not verbose):
+            start = time.perf_counter()
+            ctx = suite.setup(size, size_dir)
+            setup_s = time.perf_counter() - start
+        log(f"  {suite.group} n={size}: setup {setup_s:.2f}s")
+
+        for stage in suite.stages:
+            record = {'group': suite.group, 'stage': stage['name'], 'size': size}
+            missing = [key for key in stage['needs'] if ctx.get(key) is None]
+            if stages and stage['name'] not in stages:
+                continue
+            if stage['max_size'] is not None and size > stage['max_size']:
+                record['skipped'] = f"size > {stage['max_size']}"
+            elif missing:
+                record['skipped'] = f"needs {', '.join(missing)}"
+            else:
+                with quiet(not verbose):
+                    ctx[stage['name']], stats = measure(
+                        lambda: stage['fn'](ctx), rounds or default_rounds(size)
+                    )
+                record.update(stats)
+
+            results.append(record)
+            if 'skipped' in record:
+                log(f"    {stage['name']:<16} skipped ({record['skipped']})")
+            else:
+                log(f"    {stage['name']:<16} {record['wall_s']['min']:>10.4f}s  "
+                    f"{record['peak_memory_mb']:>9.2f} MB")
+        del ctx
+    return results
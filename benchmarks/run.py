@@ -0,0 +1,92 @@
+"""
+Microbenchmarks for the offline analysis and training pipelines.
+
+Runs every stage (load, feature extraction, fit, evaluate, export) of the
+ETDD70 reading pipeline and the CMU keystroke pipeline on synthetic data
+at increasing sizes and records wall time and peak memory per stage.
+
+    python benchmarks/run.py                                  # 70, 7k and 700k
+    python benchmarks/run.py --sizes 70,7000 --suites cmu --output bench.json
+    python benchmarks/run.py --stages load,fit --rounds 5
+
+Generated datasets are kept in --workdir and reused by later runs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+for path in (
+    REPO_ROOT / 'benchmarks',
+    REPO_ROOT / 'analysis',
+    REPO_ROOT / 'backend' / 'scripts',
+    REPO_ROOT / 'backend' / 'src' / 'ml' / 'keystroke',
+):
+    sys.path.insert(0, str(path))
+
+from harness import run_suite  # noqa: E402
+
+SUITES = ['etdd70', 'cmu']
+DEFAULT_SIZES = '70,7000,700000'
+
+
+def load_suite(name):
+    if name == 'etdd70':
+        import bench_etdd70
+        return bench_etdd70.suite
+    if name == 'cmu':
+        import bench_cmu
+        return bench_cmu.suite
+    raise ValueError(f"Unknown suite '{name}'. Choose from: {', '.join(SUITES)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the offline analysis and training pipelines')
+    parser.add_argument('--suites', default=','.join(SUITES), help='Comma-separated: ' + ', '.join(SUITES))
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Subjects (ETDD70) / sessions (CMU) per run')
+    parser.add_argument('--stages', help='Only run these stages (comma-separated)')
+    parser.add_argument('--rounds', type=int, help='Timed rounds per stage (default 3, 1 from 100k rows)')
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'dyslexia-benchmarks'),
+                        help='Where generated datasets and outputs are kept between runs')
+    parser.add_argument('--output', help='Write the JSON results here instead of stdout')
+    parser.add_argument('--verbose', action='store_true', help="Show the pipelines' own output")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = set(args.stages.split(',')) if args.stages else None
+    os.makedirs(args.workdir, exist_ok=True)
+
+    log = lambda message: print(message, file=sys.stderr)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': sizes,
+        },
+        'results': [],
+    }
+    for name in args.suites.split(','):
+        suite = load_suite(name.strip())
+        report['results'] += run_suite(suite, sizes, args.workdir, args.rounds, stages, args.verbose, log)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        log(f"✓ Results written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
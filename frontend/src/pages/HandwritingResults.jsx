@@ -1,29 +1,54 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Container, Box, CircularProgress, Alert, Typography } from '@mui/material';
 import ResultsDisplay from '@components/HandwritingModule/ResultsDisplay';
 import { handwritingService } from '@services';
 
+const POLL_INTERVAL_MS = 2000;
+// Stop after ~2 minutes; a submission that failed upstream (ML service 502/503)
+// leaves the result pending, and polling would otherwise never end
+const MAX_POLL_ATTEMPTS = 60;
+
 function HandwritingResults() {
   const { id } = useParams();
   const navigate = useNavigate();
   const [result, setResult] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [failure, setFailure] = useState('');
+  const [retrying, setRetrying] = useState(false);
+  const pollTimer = useRef(null);
+  const pollAttempts = useRef(0);
 
   useEffect(() => {
     fetchResults();
+    return () => clearTimeout(pollTimer.current);
   }, [id]);
 
   const fetchResults = async () => {
+    let stillAnalyzing = false;
     try {
       setLoading(true);
       setError('');
+      setFailure('');
       
       const response = await handwritingService.getResults(id);
       
       if (response.data.success) {
-        setResult(response.data.result);
+        const { status, error: analysisError } = response.data.result;
+        // Analysis runs as a background job; keep polling until it finishes
+        stillAnalyzing = status === 'pending' || status === 'analyzing';
+        if (stillAnalyzing && pollAttempts.current >= MAX_POLL_ATTEMPTS) {
+          stillAnalyzing = false;
+          setFailure('The analysis is taking longer than expected and may not have started.');
+        } else if (stillAnalyzing) {
+          pollAttempts.current += 1;
+          pollTimer.current = setTimeout(fetchResults, POLL_INTERVAL_MS);
+        } else if (status === 'failed') {
+          setFailure(analysisError || 'The analysis could not be completed.');
+        } else {
+          setResult(response.data.result);
+        }
       } else {
         setError('Failed to load results');
       }
@@ -34,8 +59,23 @@ function HandwritingResults() {
         'Failed to load analysis results. Please try again.'
       );
     } finally {
-      setLoading(false);
+      setLoading(stillAnalyzing);
+    }
+  };
+
+  const handleRetryAnalysis = async () => {
+    clearTimeout(pollTimer.current);
+    pollAttempts.current = 0;
+    setRetrying(true);
+    try {
+      await handwritingService.analyze(id);
+    } catch (err) {
+      // 202 means queued; 502/503 leave it pending and the poll cap applies again
+      console.error('Retry analysis error:', err);
+    } finally {
+      setRetrying(false);
     }
+    fetchResults();
   };
 
   const handleTakeAnotherTest = () => {
@@ -64,6 +104,29 @@ function HandwritingResults() {
     );
   }
 
+  if (failure) {
+    return (
+      <Container maxWidth="md">
+        <Box sx={{ py: 4 }}>
+          <Alert severity="error" sx={{ mb: 2 }}>
+            {failure}
+          </Alert>
+          <Box sx={{ mt: 2, display: 'flex', gap: 2, justifyContent: 'center' }}>
+            <button onClick={handleRetryAnalysis} disabled={retrying}>
+              {retrying ? 'Retrying...' : 'Retry Analysis'}
+            </button>
+            <button onClick={handleTakeAnotherTest}>
+              Upload Another Sample
+            </button>
+            <button onClick={() => navigate('/dashboard')}>
+              Back to Dashboard
+            </button>
+          </Box>
+        </Box>
+      </Container>
+    );
+  }
+
   if (error) {
     return (
       <Container maxWidth="md">
@@ -0,0 +1,3 @@
+"""
+Benchmarks for the ML API and the offline pipelines (not part of the test suite)
+"""
@@ -0,0 +1,324 @@
+"""
+Load test for the ML API.
+
+Starts `main:app` under uvicorn (or targets --url), drives each endpoint
+with synthetic payloads at every requested concurrency for a fixed
+duration, and reports requests/sec and p50/p95/p99 latency as JSON.
+Throughput and latency count successful (2xx) responses only; rejections
+such as 429 are fast and would otherwise inflate req/s and hide slowdowns,
+so they are reported separately under `errors`.
+
+    cd ml-models
+    python -m benchmarks.load_test --concurrency 1,8,32 --duration 15 --output load.json
+    python -m benchmarks.load_test --baseline load.json     # exit 1 on p95 regressions
+
+The started server runs with INFERENCE_CACHE_SIZE=0 so repeated payloads
+measure real inference; pass --cache to benchmark the warm-cache path.
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks import payloads
+
+ML_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ENDPOINTS = [
+    'keystroke', 'keystroke_batch', 'reading', 'reading_batch',
+    'fusion', 'fusion_batch', 'handwriting',
+]
+
+
+def _json_request(path, body):
+    return 'POST', path, json.dumps(body).encode(), {'Content-Type': 'application/json'}
+
+
+def _multipart_request(path, filename, data, content_type):
+    boundary = uuid.uuid4().hex
+    body = b''.join([
+        f'--{boundary}\r\n'.encode(),
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode(),
+        f'Content-Type: {content_type}\r\n\r\n'.encode(),
+        data,
+        f'\r\n--{boundary}--\r\n'.encode(),
+    ])
+    return 'POST', path, body, {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+
+
+def build_request(endpoint, rng, batch_size):
+    """One (method, path, body, headers) for `endpoint`, half of them dyslexic-like."""
+    dyslexic = rng.random() < 0.5
+    if endpoint == 'keystroke':
+        return _json_request('/api/ml/keystroke/analyze', payloads.keystroke_session(rng, dyslexic))
+    if endpoint == 'keystroke_batch':
+        sessions = [payloads.keystroke_session(rng, rng.random() < 0.5) for _ in range(batch_size)]
+        return _json_request('/api/ml/keystroke/analyze_batch', {'sessions': sessions})
+    if endpoint == 'reading':
+        return _json_request('/api/ml/reading/analyze', {'metrics': payloads.reading_metrics(rng, dyslexic)})
+    if endpoint == 'reading_batch':
+        items = [{'metrics': payloads.reading_metrics(rng, rng.random() < 0.5)} for _ in range(batch_size)]
+        return _json_request('/api/ml/reading/analyze_batch', {'items': items})
+    if endpoint == 'fusion':
+        query = urlencode(payloads.fusion_query(payloads.fusion_item(rng, dyslexic)))
+        return 'POST', f'/api/ml/fusion/calculate?{query}', b'', {}
+    if endpoint == 'fusion_batch':
+        items = [payloads.fusion_item(rng, rng.random() < 0.5) for _ in range(batch_size)]
+        return _json_request('/api/ml/fusion/calculate_batch', {'items': items})
+    if endpoint == 'handwriting':
+        image = payloads.handwriting_png(rng, dyslexic)
+        return _multipart_request('/api/ml/handwriting/analyze', 'sample.png', image, 'image/png')
+    raise ValueError(f"Unknown endpoint '{endpoint}'. Choose from: {', '.join(DEFAULT_ENDPOINTS)}")
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(latencies):
+    """mean/p50/p95/p99/max in milliseconds of a list of seconds."""
+    latencies = sorted(latencies)
+    ms = lambda v: None if v is None else round(v * 1000, 3)
+    return {
+        'mean': ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50': ms(percentile(latencies, 50)),
+        'p95': ms(percentile(latencies, 95)),
+        'p99': ms(percentile(latencies, 99)),
+        'max': ms(latencies[-1]) if latencies else None,
+    }
+
+
+def summarize(latencies, error_latencies, statuses, elapsed):
+    """`latencies` are the 2xx responses; `error_latencies` everything else."""
+    total = len(latencies) + len(error_latencies)
+    return {
+        'requests': total,
+        'successes': len(latencies),
+        'errors': len(error_latencies),
+        'error_rate': round(len(error_latencies) / total, 4) if total else 0.0,
+        'status_codes': dict(sorted((str(code), n) for code, n in statuses.items())),
+        'duration_s': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': latency_summary(latencies),
+        'error_latency_ms': latency_summary(error_latencies),
+    }
+
+
+def run_scenario(base_url, pool, concurrency, duration, warmup=1.0, timeout=60.0):
+    """
+    `concurrency` threads, each with a keep-alive connection, send requests
+    from `pool` back to back. Requests finishing during the first `warmup`
+    seconds are discarded. Non-2xx responses and connection errors count
+    as errors and are timed separately from the successful responses.
+    """
+    url = urlsplit(base_url)
+    lock = threading.Lock()
+    latencies, error_latencies, statuses = [], [], Counter()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def worker(offset):
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+        i = offset
+        while True:
+            method, path, body, headers = pool[i % len(pool)]
+            i += concurrency
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                break
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+                status = 'connection_error'
+            done = time.perf_counter()
+            if sent < measure_from:
+                continue
+            with lock:
+                statuses[status] += 1
+                if status != 'connection_error' and 200 <= status < 300:
+                    latencies.append(done - sent)
+                else:
+                    error_latencies.append(done - sent)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - measure_from
+    return summarize(latencies, error_latencies, statuses, elapsed)
+
+
+def get_json(base_url, path, timeout=5.0):
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        conn.close()
+
+
+def start_server(port, cache=False, startup_timeout=120.0):
+    """Launch uvicorn on 127.0.0.1:<port>; returns (process, seconds until /health answered)."""
+    env = dict(os.environ)
+    if not cache:
+        env['INFERENCE_CACHE_SIZE'] = '0'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1',
+         '--port', str(port), '--log-level', 'warning'],
+        cwd=ML_DIR, env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    start = time.perf_counter()
+    while time.perf_counter() - start < startup_timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f'ML API exited during startup (code {process.returncode})')
+        try:
+            status, _ = get_json(base_url, '/health', timeout=1.0)
+            if status == 200:
+                return process, time.perf_counter() - start
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'ML API did not answer /health within {startup_timeout:.0f}s')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ML_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, max_regression):
+    """List of human-readable p95 regressions beyond `max_regression` percent."""
+    previous = {(r['endpoint'], r['concurrency']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        old = previous.get((result['endpoint'], result['concurrency']))
+        if not old or not old['latency_ms']['p95'] or not result['latency_ms']['p95']:
+            continue
+        change = (result['latency_ms']['p95'] / old['latency_ms']['p95'] - 1) * 100
+        result['p95_change_pct'] = round(change, 1)
+        if change > max_regression:
+            regressions.append(
+                f"{result['endpoint']} @ c={result['concurrency']}: p95 "
+                f"{old['latency_ms']['p95']:.1f} -> {result['latency_ms']['p95']:.1f} ms (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the ML API and report latency percentiles')
+    parser.add_argument('--url', help='Target a running API instead of starting one')
+    parser.add_argument('--port', type=int, default=8765, help='Port for the locally started API')
+    parser.add_argument('--endpoints', default=','.join(DEFAULT_ENDPOINTS),
+                        help='Comma-separated subset of: ' + ', '.join(DEFAULT_ENDPOINTS))
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per run')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Unmeasured seconds before each run')
+    parser.add_argument('--batch-size', type=int, default=32, help='Items per *_batch request')
+    parser.add_argument('--pool-size', type=int, default=200, help='Distinct payloads per endpoint')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', action='store_true', help='Keep the inference cache enabled')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='Previous JSON report to compare p95 latency against')
+    parser.add_argument('--max-regression', type=float, default=20.0,
+                        help='Allowed p95 increase over --baseline, in percent')
+    args = parser.parse_args(argv)
+
+    endpoints = [e.strip() for e in args.endpoints.split(',') if e.strip()]
+    levels = [int(c) for c in args.concurrency.split(',')]
+    rng = random.Random(args.seed)
+    pools = {}
+    for endpoint in endpoints:
+        size = min(args.pool_size, 20) if endpoint == 'handwriting' else args.pool_size
+        pools[endpoint] = [build_request(endpoint, rng, args.batch_size) for _ in range(size)]
+
+    process, startup_seconds = None, None
+    base_url = args.url
+    if base_url is None:
+        process, startup_seconds = start_server(args.port, cache=args.cache)
+        base_url = f'http://127.0.0.1:{args.port}'
+        print(f"✓ ML API ready in {startup_seconds:.2f}s", file=sys.stderr)
+
+    try:
+        _, health = get_json(base_url, '/health')
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'target': base_url,
+                'startup_seconds': None if startup_seconds is None else round(startup_seconds, 3),
+                'cache_enabled': args.cache or args.url is not None,
+                'duration_s': args.duration,
+                'batch_size': args.batch_size,
+                'seed': args.seed,
+                'models': (health or {}).get('models'),
+            },
+            'results': [],
+        }
+        for endpoint in endpoints:
+            for concurrency in levels:
+                result = run_scenario(base_url, pools[endpoint], concurrency, args.duration, args.warmup)
+                report['results'].append({'endpoint': endpoint, 'concurrency': concurrency, **result})
+                lat = result['latency_ms']
+                print(f"  {endpoint:<16} c={concurrency:<3} {result['rps']:>9.1f} req/s  "
+                      f"p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} ms  "
+                      f"errors={result['errors']} {result['status_codes']}",
+                      file=sys.stderr)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        report['regressions'] = regressions
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+        print(f"✓ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    for line in regressions:
+        print(f"  Warning: regression {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
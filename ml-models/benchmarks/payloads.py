@@ -0,0 +1,101 @@
+"""
+Synthetic but realistic request payloads for the ML API endpoints.
+
+Keystroke sessions are raw key events typed at a plausible speed with
+occasional backspaces and long pauses; reading metrics follow the
+ReadingResult payload the backend sends; handwriting samples are
+rendered lines of text with per-glyph jitter. `dyslexic=True` shifts
+each generator towards the slower, more irregular end.
+"""
+
+import random
+
+SENTENCES = [
+    "the quick brown fox jumps over the lazy dog",
+    "reading is a skill that grows with practice",
+    "she sells sea shells by the sea shore",
+    "a big black bug bit a big black bear",
+    "we walked to the park and played until dark",
+]
+
+
+def keystroke_session(rng: random.Random, dyslexic=False):
+    """{'timings': [{key, keyDownTime, keyUpTime}, ...], 'text': str}"""
+    text = rng.choice(SENTENCES)
+    hold_mean, flight_mean = (130, 260) if dyslexic else (95, 170)
+    error_rate = 0.08 if dyslexic else 0.02
+
+    events, t = [], rng.uniform(0, 500)
+    for char in text:
+        if rng.random() < error_rate:
+            for key in (rng.choice('abcdefghijklmnopqrstuvwxyz'), 'Backspace'):
+                hold = max(30.0, rng.gauss(hold_mean, hold_mean * 0.3))
+                events.append({'key': key, 'keyDownTime': round(t, 1), 'keyUpTime': round(t + hold, 1)})
+                t += max(40.0, rng.gauss(flight_mean, flight_mean * 0.4))
+        hold = max(30.0, rng.gauss(hold_mean, hold_mean * 0.3))
+        events.append({'key': char, 'keyDownTime': round(t, 1), 'keyUpTime': round(t + hold, 1)})
+        flight = max(40.0, rng.gauss(flight_mean, flight_mean * 0.4))
+        if rng.random() < (0.05 if dyslexic else 0.01):
+            flight += rng.uniform(1000, 3000)
+        t += flight
+    return {'timings': events, 'text': text}
+
+
+def reading_metrics(rng: random.Random, dyslexic=False):
+    """A ReadingResult-style metrics payload."""
+    words = rng.choice([80, 120, 150, 200])
+    wpm = rng.gauss(110, 25) if dyslexic else rng.gauss(190, 35)
+    pauses = [round(rng.uniform(2000, 6000 if dyslexic else 4000)) for _ in range(rng.randint(0, 8 if dyslexic else 3))]
+    return {
+        'totalReadingTime': round(words / max(wpm, 40) * 60_000),
+        'passageTotalWords': words,
+        'totalRevisits': rng.randint(3, 12) if dyslexic else rng.randint(0, 4),
+        'pauseCount': len(pauses),
+        'pauseDurations': pauses,
+        'averagePauseDuration': round(sum(pauses) / len(pauses)) if pauses else 0,
+        'comprehensionScore': round(rng.uniform(30, 75) if dyslexic else rng.uniform(60, 100)),
+    }
+
+
+def fusion_item(rng: random.Random, dyslexic=False):
+    """FusionItem body; each module is missing ~10% of the time, but never all of them."""
+    centre = 0.65 if dyslexic else 0.3
+    names = ('handwriting', 'keystroke', 'reading')
+    present = [name for name in names if rng.random() < 0.9] or [rng.choice(names)]
+    return {
+        name: {
+            'score': round(min(1.0, max(0.0, rng.gauss(centre, 0.15))), 4),
+            'confidence': round(rng.uniform(0.5, 1.0), 3),
+        }
+        for name in present
+    }
+
+
+def fusion_query(item):
+    """The same item as /fusion/calculate query parameters."""
+    return {f"{name}_score": module['score'] for name, module in item.items()}
+
+
+def handwriting_png(rng: random.Random, dyslexic=False, width=1200, height=400):
+    """PNG bytes of a few handwritten-looking lines (needs numpy and OpenCV)."""
+    import cv2
+    import numpy as np
+
+    image = np.full((height, width), 255, dtype=np.uint8)
+    jitter = 10 if dyslexic else 3
+    y = 90
+    for _ in range(3):
+        x = 40
+        for char in rng.choice(SENTENCES):
+            if char != ' ':
+                scale = rng.uniform(1.2, 1.8) if dyslexic else rng.uniform(1.4, 1.6)
+                cv2.putText(image, char, (x, y + rng.randint(-jitter, jitter)),
+                            cv2.FONT_HERSHEY_SCRIPT_SIMPLEX, scale, 0, 3, cv2.LINE_AA)
+            x += rng.randint(20, 38) if dyslexic else rng.randint(24, 30)
+            if x > width - 60:
+                break
+        y += 120
+    ok, encoded = cv2.imencode('.png', image)
+    if not ok:
+        raise RuntimeError('Failed to encode synthetic handwriting image')
+    return encoded.tobytes()
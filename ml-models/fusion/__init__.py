@@ -0,0 +1,3 @@
+"""
+Fusion module: combines handwriting, keystroke and reading risk into one score
+"""
@@ -0,0 +1,151 @@
+"""
+Multimodal fusion of per-module risk scores.
+
+Inputs are three (n, 3) arrays with one column per modality in MODALITIES:
+risk scores in [0, 1], confidences in [0, 1], and a presence mask for
+modalities the user hasn't completed. A batch is fused with one matrix
+product.
+
+Two fusers share that interface:
+- FusionModel: stacked logistic regression loaded from a
+  `fusion_v<version>.joblib` artifact (see fusion/train.py). Its design
+  matrix has, per modality, the centred score, the confidence-weighted
+  centred score and the presence flag. A missing modality therefore
+  contributes nothing except its learned "absent" offset.
+- WeightedFusion: the original fixed 0.4/0.3/0.3 weights, scaled by
+  confidence and renormalised over the modalities present. Used until a
+  trained artifact exists.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+MODALITIES = ('handwriting', 'keystroke', 'reading')
+DEFAULT_WEIGHTS = np.array([0.4, 0.3, 0.3])
+# final score < 0.3 -> Low, < 0.6 -> Medium, else High
+DEFAULT_CUTOFFS = (0.3, 0.6)
+RISK_LEVELS = np.array(['Low', 'Medium', 'High'])
+
+ARTIFACT_NAME = 'fusion'
+SUPPORTED_FORMAT_VERSIONS = {1}
+
+FEATURE_NAMES = [
+    f"{modality}_{term}"
+    for modality in MODALITIES
+    for term in ('score', 'weighted_score', 'present')
+]
+
+
+def as_batch(scores, confidences, present):
+    """
+    Validate and coerce the three (n, 3) arrays; absent entries are zeroed.
+    Present scores and confidences outside [0, 1] are an error, not
+    clipped: they mean a caller sent e.g. a percentage.
+    """
+    present = np.asarray(present, dtype=bool)
+    scores = np.where(present, np.asarray(scores, dtype=np.float64), 0.0)
+    confidences = np.where(present, np.asarray(confidences, dtype=np.float64), 0.0)
+    if scores.ndim != 2 or scores.shape[1] != len(MODALITIES):
+        raise ValueError(f"Expected (n, {len(MODALITIES)}) score matrix, got {scores.shape}")
+    for name, values in (('scores', scores), ('confidences', confidences)):
+        if not ((values >= 0) & (values <= 1)).all():
+            raise ValueError(f"Module {name} must be in [0, 1]")
+    if not present.any(axis=1).all():
+        raise ValueError('Every item needs at least one module score')
+    return scores, confidences, present
+
+
+def build_design_matrix(scores, confidences, present):
+    """(n, 9) stacking features in FEATURE_NAMES order."""
+    return _design(*as_batch(scores, confidences, present))
+
+
+def _design(scores, confidences, present):
+    centred = np.where(present, scores - 0.5, 0.0)
+    design = np.stack([centred, centred * confidences, present.astype(np.float64)], axis=2)
+    return design.reshape(len(scores), -1)
+
+
+def fused_confidence(confidences, present, weights=DEFAULT_WEIGHTS):
+    """Weighted mean module confidence, scaled down by the share of weight that is missing."""
+    return (confidences * present) @ weights / weights.sum()
+
+
+def risk_levels(scores, cutoffs=DEFAULT_CUTOFFS):
+    return RISK_LEVELS[np.searchsorted(np.asarray(cutoffs), scores, side='right')]
+
+
+class WeightedFusion:
+    """Fixed-weight fallback used when no fusion artifact has been trained."""
+
+    version = 'weighted-default'
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, cutoffs=DEFAULT_CUTOFFS):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.cutoffs = tuple(cutoffs)
+
+    def predict(self, scores, confidences, present):
+        """
+        Returns:
+            (risk, confidence): arrays of length n
+        """
+        scores, confidences, present = as_batch(scores, confidences, present)
+        effective = self.weights * confidences * present
+        total = effective.sum(axis=1)
+        # All-zero confidence: fall back to plain weights over present modalities
+        effective = np.where(total[:, None] > 0, effective, self.weights * present)
+        risk = (effective * scores).sum(axis=1) / effective.sum(axis=1)
+        return risk, fused_confidence(confidences, present, self.weights)
+
+
+class FusionModel:
+    """Stacked logistic regression over FEATURE_NAMES, evaluated in NumPy."""
+
+    def __init__(self, payload, path=None):
+        fmt = payload.get('format_version')
+        if fmt not in SUPPORTED_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported fusion artifact format version: {fmt}")
+        if list(payload['feature_names']) != FEATURE_NAMES:
+            raise ValueError('Fusion artifact feature order does not match this service')
+
+        self.path = Path(path) if path else None
+        self.version = payload['version']
+        self.coef = np.asarray(payload['coef'], dtype=np.float64)
+        self.intercept = float(payload['intercept'])
+        self.weights = np.asarray(payload.get('weights', DEFAULT_WEIGHTS), dtype=np.float64)
+        self.cutoffs = tuple(payload.get('cutoffs', DEFAULT_CUTOFFS))
+        self.metrics = payload.get('metrics', {})
+
+    def predict(self, scores, confidences, present):
+        """
+        Returns:
+            (risk, confidence): arrays of length n
+        """
+        scores, confidences, present = as_batch(scores, confidences, present)
+        design = _design(scores, confidences, present)
+        risk = 1.0 / (1.0 + np.exp(-(design @ self.coef + self.intercept)))
+        return risk, fused_confidence(confidences, present, self.weights)
+
+
+DEFAULT_FUSION = WeightedFusion()
+
+
+def get_saved_models_dir():
+    return Path(os.environ.get('SAVED_MODELS_DIR', Path(__file__).resolve().parents[1] / 'saved_models'))
+
+
+def latest_fusion_path(saved_dir=None):
+    """Newest `fusion_v<version>.joblib`; versions are timestamps."""
+    saved_dir = Path(saved_dir) if saved_dir else get_saved_models_dir()
+    candidates = sorted(saved_dir.glob(f"{ARTIFACT_NAME}_v*.joblib"))
+    return candidates[-1] if candidates else None
+
+
+def load_fusion_model(path=None):
+    path = Path(path) if path else latest_fusion_path()
+    if path is None or not path.exists():
+        raise FileNotFoundError(f"No {ARTIFACT_NAME} artifact found in {get_saved_models_dir()}")
+    import joblib
+    return FusionModel(joblib.load(path), path)
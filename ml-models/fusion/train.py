@@ -0,0 +1,113 @@
+"""
+Train the stacked logistic fusion model and write a versioned artifact.
+
+Input is a CSV with one row per assessment:
+    handwriting_score, handwriting_confidence,
+    keystroke_score, keystroke_confidence,
+    reading_score, reading_confidence,
+    label                     # 1 = dyslexia confirmed, 0 = not
+Blank scores mark a module the user didn't complete; blank confidences
+default to 1.
+
+Usage:
+    python -m fusion.train assessments.csv [--output-dir saved_models]
+"""
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+from fusion.model import (
+    ARTIFACT_NAME, DEFAULT_CUTOFFS, DEFAULT_WEIGHTS, FEATURE_NAMES, MODALITIES,
+    build_design_matrix, get_saved_models_dir
+)
+from serving.artifacts import new_version, publish_artifact
+
+
+def load_training_table(path):
+    """CSV -> (scores, confidences, present, labels)."""
+    df = pd.read_csv(path)
+    scores = df[[f"{m}_score" for m in MODALITIES]].to_numpy(dtype=np.float64)
+    confidence_cols = [f"{m}_confidence" for m in MODALITIES]
+    confidences = df.reindex(columns=confidence_cols).fillna(1.0).to_numpy(dtype=np.float64)
+    present = ~np.isnan(scores)
+    labels = df['label'].to_numpy(dtype=np.int64)
+
+    keep = present.any(axis=1)
+    if not keep.all():
+        print(f"  Warning: dropping {int((~keep).sum())} rows with no module scores")
+    return np.nan_to_num(scores[keep]), confidences[keep], present[keep], labels[keep]
+
+
+def train_fusion_model(scores, confidences, present, labels, C=1.0):
+    """
+    Fit the stacker and estimate ROC-AUC with stratified 5-fold CV.
+
+    Returns:
+        (LogisticRegression, metrics dict)
+    """
+    X = build_design_matrix(scores, confidences, present)
+    model = LogisticRegression(C=C, max_iter=1000)
+
+    metrics = {'n_samples': int(len(labels)), 'positive_rate': float(labels.mean())}
+    n_splits = min(5, int(np.bincount(labels).min()))
+    if n_splits >= 2:
+        cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        auc = cross_val_score(model, X, labels, cv=cv, scoring='roc_auc')
+        metrics['cv_roc_auc'] = float(auc.mean())
+        metrics['cv_roc_auc_std'] = float(auc.std())
+
+    model.fit(X, labels)
+    return model, metrics
+
+
+def export_fusion_artifact(model, metrics, output_dir=None, version=None):
+    """
+    Write `fusion_v<version>.joblib` plus a JSON sidecar; returns the artifact path.
+
+    Raises:
+        FileExistsError: if that version already exists
+    """
+    output_dir = get_saved_models_dir() if output_dir is None else output_dir
+    created_at = datetime.now()
+    version = version or new_version(created_at)
+
+    payload = {
+        'format_version': 1,
+        'name': ARTIFACT_NAME,
+        'version': version,
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'feature_names': FEATURE_NAMES,
+        # Plain arrays: the service evaluates the logit itself, no sklearn needed
+        'coef': model.coef_[0].tolist(),
+        'intercept': float(model.intercept_[0]),
+        'weights': DEFAULT_WEIGHTS.tolist(),
+        'cutoffs': list(DEFAULT_CUTOFFS),
+        'metrics': metrics,
+    }
+
+    artifact_path = publish_artifact(output_dir, ARTIFACT_NAME, version, payload, payload)
+    print(f"✓ Saved fusion artifact {artifact_path.stem} to {output_dir}")
+    return artifact_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the multimodal fusion model')
+    parser.add_argument('data', help='CSV of per-assessment module scores and labels')
+    parser.add_argument('--output-dir', default=None, help='Defaults to SAVED_MODELS_DIR / saved_models')
+    parser.add_argument('--C', type=float, default=1.0, help='Inverse regularisation strength')
+    args = parser.parse_args(argv)
+
+    scores, confidences, present, labels = load_training_table(args.data)
+    model, metrics = train_fusion_model(scores, confidences, present, labels, C=args.C)
+    print(f"  Samples: {metrics['n_samples']}, CV ROC-AUC: {metrics.get('cv_roc_auc', float('nan')):.3f}")
+    export_fusion_artifact(model, metrics, Path(args.output_dir) if args.output_dir else None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+"""
+Handwriting module: OpenCV preprocessing, glyph segmentation and scoring
+"""
+
+# Defined here rather than in pipeline.py so the API can build cache keys
+# without importing OpenCV; only the worker processes load the pipeline
+PIPELINE_VERSION = 'cv-heuristic-1.2'
+
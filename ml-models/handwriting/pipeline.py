@@ -0,0 +1,418 @@
+"""
+CPU-only handwriting analysis: decode -> binarize -> deskew -> segment
+glyphs -> score reversals, spacing, baseline alignment and size.
+
+Everything here is a plain function of the image bytes so it can run in a
+worker process (see serving/workers.py) without touching the event loop.
+
+Reversals are found by template matching: each glyph is compared with
+rendered lowercase letters and with mirror images of the letters whose
+mirror is not itself a letter (c, e, s, z...). A glyph counts as reversed
+only when a mirrored template beats every normal template by a clear
+margin. A mirrored "b" is just a "d", so b/d and p/q swaps are not
+counted; telling those apart needs the expected text.
+"""
+
+import functools
+import time
+
+import cv2
+import numpy as np
+
+from handwriting import PIPELINE_VERSION
+from handwriting.upload import image_dimensions
+
+# Phone photos are decoded at 1/2, 1/4 or 1/8 scale so the long side is
+# at most this many pixels (libjpeg scales during decode, skipping the
+# full-size bitmap)
+MAX_DECODE_SIDE = 2048
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+# Deskew search range and step (degrees), evaluated on a downscaled copy
+DESKEW_MAX_ANGLE = 10.0
+DESKEW_STEP = 0.5
+DESKEW_MAX_WIDTH = 800
+
+MIN_GLYPHS = 5
+
+# Reversal templates: glyphs are compared at GLYPH_SIZE x GLYPH_SIZE.
+# Only letters whose mirror image isn't another letter get a mirrored
+# template (a mirrored "b" is a legitimate "d").
+GLYPH_SIZE = 24
+MAX_GLYPHS_FOR_REVERSALS = 400
+TEMPLATE_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+MIRRORABLE_LETTERS = 'cefgjkrsz'
+TEMPLATE_FONTS = (
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_COMPLEX,
+    cv2.FONT_HERSHEY_TRIPLEX,
+)
+# A glyph is reversed when its best mirrored-template similarity is at
+# least REVERSAL_MIN_SCORE and beats the best normal template by
+# REVERSAL_MIN_MARGIN (normal letters stay below -0.03 on unseen fonts,
+# mirrored ones land around 0.1-0.4)
+REVERSAL_MIN_SCORE = 0.7
+REVERSAL_MIN_MARGIN = 0.1
+
+# Word gaps are at least this many times wider than letter gaps on average
+WORD_GAP_RATIO = 3.0
+
+# Weights of each indicator in the final risk score
+RISK_WEIGHTS = {
+    'reversals': 0.40,
+    'spacing': 0.25,
+    'alignment': 0.20,
+    'size': 0.15,
+}
+
+RECOMMENDATIONS = {
+    # Only MIRRORABLE_LETTERS are scored; b/d and p/q swaps are not detected
+    'letter_reversal': (
+        'Practice letter orientation with tracing and direction-arrow activities '
+        f"for the letters written backwards ({', '.join(MIRRORABLE_LETTERS)})"
+    ),
+    'irregular_spacing': 'Use lined paper with spacing guides',
+    'poor_alignment': 'Practice writing on the baseline with guided worksheets',
+    'inconsistent_size': 'Perform daily handwriting exercises for 10-15 minutes',
+}
+
+
+def decode_flag(dimensions, max_side=MAX_DECODE_SIDE):
+    """Smallest reduction that brings the long side under max_side."""
+    if dimensions is None:
+        return cv2.IMREAD_GRAYSCALE
+    long_side = max(dimensions)
+    for factor, flag in reversed(_REDUCED_FLAGS):
+        if long_side / factor <= max_side:
+            return flag if long_side > max_side else cv2.IMREAD_GRAYSCALE
+    return _REDUCED_FLAGS[0][1]
+
+
+def decode_image(data, max_side=MAX_DECODE_SIDE):
+    """
+    Decode encoded image bytes (or any buffer) to a grayscale array,
+    downscaling large images during decode. The buffer is wrapped, not copied.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    image = cv2.imdecode(buffer, decode_flag(image_dimensions(data), max_side))
+    if image is None:
+        raise ValueError('Could not decode image')
+    return image
+
+
+def binarize(gray):
+    """Otsu threshold with ink as foreground (255)."""
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return binary
+
+
+def _rotate(image, angle):
+    h, w = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(image, matrix, (w, h), flags=cv2.INTER_NEAREST, borderValue=0)
+
+
+def estimate_skew(binary):
+    """Angle that maximises row-profile variance (text lines become sharp)."""
+    h, w = binary.shape
+    scale = min(1.0, DESKEW_MAX_WIDTH / w)
+    small = cv2.resize(binary, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_NEAREST)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-DESKEW_MAX_ANGLE, DESKEW_MAX_ANGLE + DESKEW_STEP, DESKEW_STEP):
+        profile = _rotate(small, angle).sum(axis=1, dtype=np.float64)
+        score = profile.var()
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def deskew(binary):
+    angle = estimate_skew(binary)
+    return (_rotate(binary, angle) if angle else binary), angle
+
+
+def label_glyphs(binary):
+    """
+    Connected components filtered for noise.
+
+    Returns:
+        (boxes, labels, label_ids): (n, 4) array of x, y, w, h boxes, the
+        label image and the label of each kept component
+    """
+    n, labels, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if n <= 1:
+        return np.empty((0, 4), dtype=np.int64), labels, np.empty(0, dtype=np.int64)
+
+    stats = stats[1:]
+    areas = stats[:, cv2.CC_STAT_AREA]
+    # Drop specks: anything much smaller than a typical stroke blob
+    keep = areas >= max(10, 0.1 * np.median(areas))
+    boxes = stats[keep][:, [cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH, cv2.CC_STAT_HEIGHT]]
+    return boxes.astype(np.int64), labels, np.flatnonzero(keep) + 1
+
+
+def segment_glyphs(binary):
+    """(n, 4) array of x, y, w, h glyph boxes (see label_glyphs)."""
+    return label_glyphs(binary)[0]
+
+
+def group_lines(boxes):
+    """
+    Assign each glyph to a text line by merging overlapping vertical
+    extents (top to bottom). Ascenders, descenders and i-dots overlap or
+    nearly touch the rest of their line, so they stay on it; a new line
+    starts after a blank band of more than a quarter glyph height.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    tolerance = 0.25 * np.median(boxes[:, 3])
+    order = np.argsort(boxes[:, 1], kind='stable')
+
+    line_ids = np.empty(len(boxes), dtype=np.int64)
+    line, line_bottom = -1, -np.inf
+    for idx in order:
+        top, bottom = boxes[idx, 1], boxes[idx, 1] + boxes[idx, 3]
+        if top > line_bottom + tolerance:
+            line += 1
+            line_bottom = bottom
+        else:
+            line_bottom = max(line_bottom, bottom)
+        line_ids[idx] = line
+    return line_ids
+
+
+def split_gaps(gaps):
+    """
+    Split gaps into (letter_gaps, word_gaps) at the threshold that
+    maximises the between-class variance (Otsu in 1-D). If the larger
+    class isn't at least WORD_GAP_RATIO times wider on average there is
+    only one kind of gap (a single word), and word_gaps is empty.
+    """
+    gaps = np.sort(np.asarray(gaps, dtype=np.float64))
+    n = len(gaps)
+    if n < 2 or gaps[0] == gaps[-1]:
+        return gaps, gaps[:0]
+
+    k = np.arange(1, n)
+    cumsum = np.cumsum(gaps)
+    low_mean = cumsum[:-1] / k
+    high_mean = (cumsum[-1] - cumsum[:-1]) / (n - k)
+    between = k * (n - k) * (high_mean - low_mean) ** 2
+    split = int(k[np.argmax(between)])
+
+    letters, words = gaps[:split], gaps[split:]
+    if words.mean() < WORD_GAP_RATIO * letters.mean():
+        return gaps, gaps[:0]
+    return letters, words
+
+
+def spacing_irregularity(boxes, line_ids):
+    """
+    CV of horizontal gaps between neighbouring glyphs, computed separately
+    for letter gaps and word gaps (a regular mix of the two is normal
+    writing) and averaged by gap count, mapped to 0..1.
+    """
+    gaps = []
+    for line in np.unique(line_ids):
+        line_boxes = boxes[line_ids == line]
+        line_boxes = line_boxes[np.argsort(line_boxes[:, 0])]
+        right = line_boxes[:-1, 0] + line_boxes[:-1, 2]
+        gap = line_boxes[1:, 0] - right
+        gaps.append(gap[gap > 0])
+
+    gaps = np.concatenate(gaps) if gaps else np.empty(0)
+    cvs, weights = [], []
+    for group in split_gaps(gaps):
+        if len(group) >= 2 and group.mean() > 0:
+            cvs.append(group.std() / group.mean())
+            weights.append(len(group))
+    if not cvs:
+        return 0.0
+    return float(min(np.average(cvs, weights=weights), 1.0))
+
+
+def alignment_deviation(boxes, line_ids):
+    """Residual of glyph bottoms around a fitted baseline, in glyph heights, 0..1."""
+    median_height = float(np.median(boxes[:, 3])) or 1.0
+    deviations = []
+    for line in np.unique(line_ids):
+        line_boxes = boxes[line_ids == line]
+        if len(line_boxes) < 3:
+            continue
+        x = line_boxes[:, 0] + line_boxes[:, 2] / 2
+        bottom = line_boxes[:, 1] + line_boxes[:, 3]
+        slope, intercept = np.polyfit(x, bottom, 1)
+        residual = bottom - (slope * x + intercept)
+        deviations.append(residual.std() / median_height)
+
+    if not deviations:
+        return 0.0
+    return float(min(np.mean(deviations) / 0.5, 1.0))
+
+
+def size_inconsistency(boxes):
+    """CV of glyph heights, mapped to 0..1."""
+    heights = boxes[:, 3].astype(np.float64)
+    if len(heights) < 2 or heights.mean() == 0:
+        return 0.0
+    return float(min((heights.std() / heights.mean()) / 0.6, 1.0))
+
+
+def _normalize_glyph(mask):
+    """
+    Pad a glyph mask to a centred square, shrink it to GLYPH_SIZE, blur
+    away stroke-width differences and scale to zero mean, unit norm so a
+    dot product is a correlation.
+    """
+    h, w = mask.shape
+    side = max(h, w)
+    square = np.zeros((side, side), np.uint8)
+    top, left = (side - h) // 2, (side - w) // 2
+    square[top:top + h, left:left + w] = mask
+    glyph = cv2.resize(square, (GLYPH_SIZE, GLYPH_SIZE), interpolation=cv2.INTER_AREA).astype(np.float32)
+    glyph = cv2.GaussianBlur(glyph, (3, 3), 0).ravel()
+    glyph -= glyph.mean()
+    norm = np.linalg.norm(glyph)
+    return glyph / norm if norm else glyph
+
+
+def _render_letter(letter, font, thickness):
+    """Largest component of a rendered letter (drops i/j dots)."""
+    canvas = np.zeros((200, 200), np.uint8)
+    cv2.putText(canvas, letter, (50, 140), font, 3, 255, thickness)
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(canvas, connectivity=8)
+    label = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    x, y, w, h = stats[label, :4]
+    return (labels[y:y + h, x:x + w] == label).astype(np.uint8) * 255
+
+
+@functools.lru_cache(maxsize=None)
+def reversal_templates():
+    """(normal, mirrored) template matrices, one normalized glyph per row."""
+    normal, mirrored = [], []
+    for font in TEMPLATE_FONTS:
+        for thickness in (4, 8):
+            for letter in TEMPLATE_LETTERS:
+                mask = _render_letter(letter, font, thickness)
+                normal.append(_normalize_glyph(mask))
+                if letter in MIRRORABLE_LETTERS:
+                    mirrored.append(_normalize_glyph(mask[:, ::-1]))
+    return np.stack(normal), np.stack(mirrored)
+
+
+def count_reversals(boxes, labels, label_ids):
+    """
+    Glyphs that match a mirrored letter template better than any normal
+    one. Only single-letter-sized components are checked: joined letters,
+    dots and punctuation match nothing reliably.
+    """
+    if len(boxes) == 0:
+        return 0
+    heights = boxes[:, 3].astype(np.float64)
+    median_height = np.median(heights)
+    plausible = (
+        (heights >= 8)
+        & (heights >= 0.5 * median_height) & (heights <= 2.0 * median_height)
+        & (boxes[:, 2] <= 1.2 * heights)
+    )
+    candidates = np.flatnonzero(plausible)[:MAX_GLYPHS_FOR_REVERSALS]
+    if len(candidates) == 0:
+        return 0
+
+    glyphs = np.stack([
+        _normalize_glyph((labels[y:y + h, x:x + w] == label_ids[i]).astype(np.uint8) * 255)
+        for i, (x, y, w, h) in zip(candidates, boxes[candidates])
+    ])
+    normal, mirrored = reversal_templates()
+    best_normal = (glyphs @ normal.T).max(axis=1)
+    best_mirrored = (glyphs @ mirrored.T).max(axis=1)
+    reversed_ = (best_mirrored >= REVERSAL_MIN_SCORE) & (best_mirrored - best_normal >= REVERSAL_MIN_MARGIN)
+    return int(np.count_nonzero(reversed_))
+
+
+def _severity(score):
+    if score >= 0.66:
+        return 'high'
+    if score >= 0.33:
+        return 'moderate'
+    return 'low'
+
+
+def analyze_image_bytes(data):
+    """
+    Full pipeline on encoded image bytes.
+
+    Returns:
+        dict matching HandwritingResponse in main.py
+
+    Raises:
+        ValueError: undecodable image or too little handwriting found
+    """
+    start = time.perf_counter()
+    gray = data if isinstance(data, np.ndarray) else decode_image(data)
+    binary, skew_angle = deskew(binarize(gray))
+    boxes, labels, label_ids = label_glyphs(binary)
+
+    if len(boxes) < MIN_GLYPHS:
+        raise ValueError(f"Not enough handwriting detected ({len(boxes)} glyphs)")
+
+    line_ids = group_lines(boxes)
+    reversals = count_reversals(boxes, labels, label_ids)
+    scores = {
+        'reversals': min(reversals / max(3.0, 0.05 * len(boxes)), 1.0),
+        'spacing': spacing_irregularity(boxes, line_ids),
+        'alignment': alignment_deviation(boxes, line_ids),
+        'size': size_inconsistency(boxes),
+    }
+    risk = sum(RISK_WEIGHTS[name] * value for name, value in scores.items())
+
+    issues = []
+    if reversals > 0:
+        issues.append({
+            'type': 'letter_reversal',
+            'count': reversals,
+            'severity': _severity(scores['reversals']),
+            'examples': ['mirrored letter forms'],
+        })
+    for issue_type, key, example in (
+        ('irregular_spacing', 'spacing', 'uneven gaps between letters or words'),
+        ('poor_alignment', 'alignment', 'letters drifting off the baseline'),
+        ('inconsistent_size', 'size', 'varying letter heights'),
+    ):
+        if scores[key] >= 0.33:
+            issues.append({
+                'type': issue_type,
+                'count': int(round(scores[key] * 10)),
+                'severity': _severity(scores[key]),
+                'examples': [example],
+            })
+
+    # Heuristic pipeline: confidence grows with the amount of writing, capped at 0.6
+    confidence = max(0.2, 0.6 * min(1.0, len(boxes) / 30))
+
+    return {
+        'risk_score': float(risk),
+        'features': {
+            'glyph_count': int(len(boxes)),
+            'reversal_count': reversals,
+            'line_count': int(line_ids.max() + 1),
+            'skew_angle': skew_angle,
+            'spacing_irregularity': scores['spacing'],
+            'alignment_deviation': scores['alignment'],
+            'size_inconsistency': scores['size'],
+        },
+        'reversals_detected': reversals,
+        'confidence': float(confidence),
+        'detected_issues': issues,
+        'recommendations': [RECOMMENDATIONS[issue['type']] for issue in issues],
+        'model_version': PIPELINE_VERSION,
+        'processing_time_ms': (time.perf_counter() - start) * 1000,
+    }
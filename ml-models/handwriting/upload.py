@@ -0,0 +1,138 @@
+"""
+Bounded, copy-free handling of uploaded handwriting images.
+
+The spooled multipart upload is read once, straight into a preallocated
+bytearray (readinto on a memoryview, no intermediate bytes objects). Size
+and pixel limits are checked from the encoded header before anything is
+decoded; formats whose header can't be read are refused.
+pipeline.decode_image then wraps the same buffer with np.frombuffer, so
+the only full-size allocation before decode is the buffer itself.
+"""
+
+import os
+import struct
+
+# Matches the backend multer limit
+MAX_UPLOAD_BYTES = int(os.getenv('HANDWRITING_MAX_UPLOAD_BYTES', 10 * 1024 * 1024))
+# ~50 MP: larger images are rejected before decode
+MAX_IMAGE_PIXELS = int(os.getenv('HANDWRITING_MAX_PIXELS', 50_000_000))
+
+READ_CHUNK = 1 << 20
+
+# JPEG start-of-frame markers (SOF0..SOF15 minus DHT, JPG and DAC)
+_JPEG_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class UploadTooLarge(ValueError):
+    """Upload exceeds the byte or pixel limit (HTTP 413)."""
+
+
+def _upload_size(file):
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+def read_upload(file, size=None, max_bytes=MAX_UPLOAD_BYTES) -> bytearray:
+    """
+    Read a file-like upload into a buffer allocated once at its final size.
+
+    Args:
+        file: Binary file object (UploadFile.file)
+        size: Byte size if known (UploadFile.size), else measured by seeking
+
+    Raises:
+        UploadTooLarge: if the upload exceeds max_bytes
+        ValueError: if the upload is empty
+    """
+    if size is None:
+        size = _upload_size(file)
+    if size > max_bytes:
+        raise UploadTooLarge(f"Upload is {size} bytes (limit {max_bytes})")
+    if size == 0:
+        raise ValueError('Empty upload')
+
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    readinto = getattr(file, 'readinto', None)
+    file.seek(0)
+
+    offset = 0
+    while offset < size:
+        end = min(offset + READ_CHUNK, size)
+        if readinto is not None:
+            n = readinto(view[offset:end])
+        else:
+            chunk = file.read(end - offset)
+            n = len(chunk)
+            view[offset:offset + n] = chunk
+        if not n:
+            break
+        offset += n
+
+    view.release()
+    if offset < size:
+        del buffer[offset:]
+    return buffer
+
+
+def image_dimensions(buffer):
+    """
+    (width, height) from a PNG, JPEG, GIF or BMP header, or None if the
+    format isn't recognised. Reads the header in place with struct.
+    """
+    view = memoryview(buffer)
+    if len(view) < 26:
+        return None
+
+    if view[:8] == b'\x89PNG\r\n\x1a\n':
+        width, height = struct.unpack_from('>II', view, 16)
+        return width, height
+    if view[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack_from('<HH', view, 6)
+        return width, height
+    if view[:2] == b'BM':
+        width, height = struct.unpack_from('<ii', view, 18)
+        return width, abs(height)
+    if view[:2] == b'\xff\xd8':
+        offset = 2
+        while offset + 9 <= len(view):
+            if view[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = view[offset + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                offset += 1 if marker == 0xFF else 2
+                continue
+            (length,) = struct.unpack_from('>H', view, offset + 2)
+            if marker in _JPEG_SOF:
+                height, width = struct.unpack_from('>HH', view, offset + 5)
+                return width, height
+            offset += 2 + length
+    return None
+
+
+def check_image_limits(buffer, max_pixels=MAX_IMAGE_PIXELS):
+    """
+    Reject images whose header declares more than max_pixels.
+
+    Formats image_dimensions can't read (WebP, TIFF, ...) are rejected
+    too: imdecode would decode them at full size with no pixel limit. The
+    backend only accepts PNG, JPEG, GIF and BMP anyway.
+
+    Returns:
+        (width, height)
+
+    Raises:
+        UploadTooLarge: if the image has more than max_pixels
+        ValueError: if the format isn't recognised
+    """
+    dimensions = image_dimensions(buffer)
+    if dimensions is None:
+        raise ValueError('Unsupported image format (expected PNG, JPEG, GIF or BMP)')
+    if dimensions[0] * dimensions[1] > max_pixels:
+        width, height = dimensions
+        raise UploadTooLarge(f"Image is {width}x{height} pixels (limit {max_pixels})")
+    return dimensions
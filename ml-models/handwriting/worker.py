@@ -0,0 +1,13 @@
+"""
+Process-pool entry point for handwriting analysis.
+
+The API pickles a reference to `analyze` when it submits a job, which only
+imports this module. The pipeline (and OpenCV with it) is imported inside
+the call, so it is loaded by the worker processes and never by the API.
+"""
+
+
+def analyze(data: bytes):
+    from handwriting.pipeline import analyze_image_bytes
+
+    return analyze_image_bytes(data)
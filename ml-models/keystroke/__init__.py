@@ -0,0 +1,3 @@
+"""
+Keystroke dynamics module: feature extraction and IsolationForest scoring
+"""
@@ -0,0 +1,282 @@
+"""
+Vectorized hold/flight feature extraction for keystroke sessions.
+Mirrors KeystrokeResult.calculateMetrics so the ML service and the
+Node.js backend produce the same six IsolationForest inputs.
+
+Raw key-down/key-up events are handled by extract_event_features. It
+flattens a batch of variable-length sessions into one ragged array
+(values + per-session lengths), so every statistic is a single bincount
+or reduceat over the whole batch. Padded (n_sessions, max_len) arrays
+are accepted too.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# Column order the IsolationForest was trained on (see trainModel.py)
+FEATURE_NAMES = [
+    'avgHoldTime',
+    'stdHoldTime',
+    'cvHoldTime',
+    'avgFlightTime',
+    'stdFlightTime',
+    'cvFlightTime'
+]
+
+# Extra behavioural features from raw events (same definitions as calculateMetrics)
+EVENT_FEATURE_NAMES = FEATURE_NAMES + [
+    'wpm',
+    'backspaceCount',
+    'backspaceRate',
+    'pauseCount',
+    'pauseFrequency',
+    'durationMs'
+]
+
+# A flight longer than this counts as a pause (KeystrokeResult.calculateMetrics)
+PAUSE_THRESHOLD_MS = 1000
+# Characters per word when no typed text is available for a word count
+CHARS_PER_WORD = 5
+
+
+def _grouped_stats(values, session_idx, n_sessions):
+    """
+    Per-session mean, population std and CV% of the positive entries of
+    a flat value array. Sessions with no positive values get zeros,
+    matching statistics.js.
+    """
+    mask = values > 0
+    values = values[mask]
+    session_idx = session_idx[mask]
+
+    counts = np.bincount(session_idx, minlength=n_sessions)
+    sums = np.bincount(session_idx, weights=values, minlength=n_sessions)
+    safe_counts = np.maximum(counts, 1)
+    means = sums / safe_counts
+
+    sq_dev = (values - means[session_idx]) ** 2
+    stds = np.sqrt(np.bincount(session_idx, weights=sq_dev, minlength=n_sessions) / safe_counts)
+
+    cvs = np.divide(stds, means, out=np.zeros(n_sessions), where=means != 0) * 100
+    return means, stds, cvs
+
+
+def extract_feature_matrix(sessions: List[List[Dict]]) -> np.ndarray:
+    """
+    Turn many sessions of keystroke timings into an (n_sessions, 6) matrix.
+
+    Args:
+        sessions: One list of keystroke dicts per session, each carrying
+            `holdTime` and `flightTime` in milliseconds
+
+    Returns:
+        float64 array with columns in FEATURE_NAMES order
+    """
+    n_sessions = len(sessions)
+    lengths = np.fromiter((len(s) for s in sessions), dtype=np.int64, count=n_sessions)
+    session_idx = np.repeat(np.arange(n_sessions), lengths)
+
+    total = int(lengths.sum())
+    hold = np.fromiter(
+        (k.get('holdTime') or 0 for s in sessions for k in s), dtype=np.float64, count=total
+    )
+    flight = np.fromiter(
+        (k.get('flightTime') or 0 for s in sessions for k in s), dtype=np.float64, count=total
+    )
+
+    hold_stats = _grouped_stats(hold, session_idx, n_sessions)
+    flight_stats = _grouped_stats(flight, session_idx, n_sessions)
+
+    return np.column_stack(hold_stats + flight_stats)
+
+
+def features_to_dict(row: np.ndarray, names: Sequence[str] = FEATURE_NAMES) -> Dict:
+    """Map one feature-matrix row back to named features."""
+    return {name: float(value) for name, value in zip(names, row)}
+
+
+def is_raw_event_session(session: List[Dict]) -> bool:
+    """True if the session carries raw keyDownTime/keyUpTime events."""
+    return bool(session) and 'keyDownTime' in session[0] and 'keyUpTime' in session[0]
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def validate_session(session: List[Dict]) -> List[Dict]:
+    """
+    Check one session before feature extraction.
+
+    Raw-event sessions need a numeric keyDownTime on every event (keyUpTime
+    may be missing); timing sessions need numeric or missing holdTime and
+    flightTime. An empty session, or one without a single positive hold
+    time, carries no typing to score.
+
+    Raises:
+        ValueError: describing the first problem found
+    """
+    if not session:
+        raise ValueError("timings must contain at least one keystroke")
+
+    raw = is_raw_event_session(session)
+    required = ('keyDownTime',) if raw else ()
+    optional = ('keyUpTime',) if raw else ('holdTime', 'flightTime')
+    for i, event in enumerate(session):
+        if not isinstance(event, dict):
+            raise ValueError(f"timings[{i}] must be an object")
+        for name in required:
+            if not _is_number(event.get(name)):
+                raise ValueError(f"timings[{i}].{name} must be a number")
+        for name in optional:
+            if event.get(name) is not None and not _is_number(event[name]):
+                raise ValueError(f"timings[{i}].{name} must be a number")
+
+    if raw:
+        has_hold = any(
+            e.get('keyUpTime') is not None and e['keyUpTime'] > e['keyDownTime'] for e in session
+        )
+    else:
+        has_hold = any((e.get('holdTime') or 0) > 0 for e in session)
+    if not has_hold:
+        raise ValueError("timings contain no keystroke with a positive hold time")
+    return session
+
+
+def _segment_reduce(ufunc, values, lengths, empty):
+    """ufunc.reduceat per session, with `empty` for zero-length sessions."""
+    out = np.full(len(lengths), empty, dtype=np.float64)
+    nonempty = lengths > 0
+    if nonempty.any():
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])[nonempty]
+        out[nonempty] = ufunc.reduceat(values, starts)
+    return out
+
+
+def ragged_event_features(down: np.ndarray, up: np.ndarray, is_backspace: np.ndarray,
+                          is_char: np.ndarray, lengths: np.ndarray,
+                          typed_lengths: Optional[np.ndarray] = None,
+                          word_counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Features for a ragged batch: flat per-event arrays (sessions
+    concatenated, each in chronological order) plus per-session lengths.
+
+    Hold time is keyUp - keyDown. Flight time is the down-down latency to
+    the previous key in the same session (the CMU DD.* definition the
+    IsolationForest was trained on). Rates are per 100 typed characters,
+    as in calculateMetrics.
+
+    Args:
+        typed_lengths: Length of the final typed text per session; defaults
+            to character keys minus backspaces
+        word_counts: Words in the final text per session; defaults to
+            typed length / 5
+
+    Returns:
+        (n_sessions, len(EVENT_FEATURE_NAMES)) float64 matrix
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    n_sessions = len(lengths)
+    session_idx = np.repeat(np.arange(n_sessions), lengths)
+
+    hold = np.nan_to_num(up - down, nan=0.0)
+    # Flight belongs to the later key; the first key of a session has none
+    flight = np.zeros(len(down))
+    if len(down) > 1:
+        same_session = session_idx[1:] == session_idx[:-1]
+        flight[1:] = np.where(same_session, down[1:] - down[:-1], 0.0)
+    flight = np.nan_to_num(flight, nan=0.0)
+
+    hold_stats = _grouped_stats(hold, session_idx, n_sessions)
+    flight_stats = _grouped_stats(flight, session_idx, n_sessions)
+
+    backspaces = np.bincount(session_idx, weights=is_backspace, minlength=n_sessions)
+    chars = np.bincount(session_idx, weights=is_char, minlength=n_sessions)
+    pauses = np.bincount(session_idx, weights=flight > PAUSE_THRESHOLD_MS, minlength=n_sessions)
+
+    if typed_lengths is None:
+        typed_lengths = np.maximum(chars - backspaces, 0)
+    typed_lengths = np.asarray(typed_lengths, dtype=np.float64)
+    if word_counts is None:
+        word_counts = typed_lengths / CHARS_PER_WORD
+    word_counts = np.asarray(word_counts, dtype=np.float64)
+
+    first_down = _segment_reduce(np.fmin, down, lengths, np.nan)
+    last_up = _segment_reduce(np.fmax, np.fmax(up, down), lengths, np.nan)
+    duration = np.nan_to_num(last_up - first_down, nan=0.0)
+    minutes = duration / 60000
+
+    per_char = np.divide(100.0, typed_lengths, out=np.zeros(n_sessions), where=typed_lengths > 0)
+    wpm = np.divide(word_counts, minutes, out=np.zeros(n_sessions), where=minutes > 0)
+
+    return np.column_stack(hold_stats + flight_stats + (
+        wpm,
+        backspaces,
+        backspaces * per_char,
+        pauses,
+        pauses * per_char,
+        duration,
+    ))
+
+
+def padded_event_features(down: np.ndarray, up: np.ndarray, is_backspace: np.ndarray,
+                          is_char: np.ndarray, **kwargs) -> np.ndarray:
+    """
+    Same as ragged_event_features for (n_sessions, max_len) arrays padded
+    with NaN in `down` after each session's last event.
+    """
+    valid = ~np.isnan(down)
+    lengths = valid.sum(axis=1)
+    return ragged_event_features(
+        down[valid], up[valid], is_backspace[valid], is_char[valid], lengths, **kwargs
+    )
+
+
+def extract_event_features(sessions: List[List[Dict]],
+                           texts: Optional[List[Optional[str]]] = None) -> np.ndarray:
+    """
+    Raw events -> (n_sessions, len(EVENT_FEATURE_NAMES)) matrix.
+
+    Args:
+        sessions: One list of events per session, each with `key`,
+            `keyDownTime` and `keyUpTime` (ms, any common origin)
+        texts: Optional final typed text per session, for typed length
+            and word count (as calculateMetrics uses typedText)
+    """
+    n_sessions = len(sessions)
+    lengths = np.fromiter((len(s) for s in sessions), dtype=np.int64, count=n_sessions)
+    session_idx = np.repeat(np.arange(n_sessions), lengths)
+    total = int(lengths.sum())
+
+    down = np.fromiter(
+        (np.nan if e.get('keyDownTime') is None else e['keyDownTime'] for s in sessions for e in s),
+        dtype=np.float64, count=total
+    )
+    up = np.fromiter(
+        (np.nan if e.get('keyUpTime') is None else e['keyUpTime'] for s in sessions for e in s),
+        dtype=np.float64, count=total
+    )
+    keys = [e.get('key') or '' for s in sessions for e in s]
+    is_backspace = np.fromiter((k == 'Backspace' for k in keys), dtype=np.float64, count=total)
+    # Printable keys report a single character; Shift, Enter etc. don't
+    is_char = np.fromiter((len(k) == 1 for k in keys), dtype=np.float64, count=total)
+
+    # Events may arrive ordered by key-up; sort each session by key-down
+    order = np.lexsort((down, session_idx))
+    down, up, is_backspace, is_char = down[order], up[order], is_backspace[order], is_char[order]
+
+    typed_lengths = word_counts = None
+    if texts is not None:
+        # Sessions without text fall back to character keys minus backspaces
+        estimated = np.maximum(
+            np.bincount(session_idx, weights=is_char, minlength=n_sessions)
+            - np.bincount(session_idx, weights=is_backspace, minlength=n_sessions),
+            0
+        )
+        typed_lengths = np.array([len(t) if t else np.nan for t in texts], dtype=np.float64)
+        word_counts = np.array([len(t.split()) if t else np.nan for t in texts], dtype=np.float64)
+        missing = np.isnan(typed_lengths)
+        typed_lengths[missing] = estimated[missing]
+        word_counts[missing] = estimated[missing] / CHARS_PER_WORD
+
+    return ragged_event_features(down, up, is_backspace, is_char, lengths, typed_lengths, word_counts)
@@ -0,0 +1,300 @@
+"""
+Incremental retraining of the keystroke IsolationForest.
+
+Production sessions (KeystrokeResult feature rows, exported with
+backend/src/scripts/exportKeystrokeFeatures.js) are appended to a compact
+columnar store. The store is a directory of float32 .npy segments in
+FEATURE_NAMES column order plus a manifest, so reading a window
+memory-maps only the segments it touches.
+
+`retrain` compares the current model's anomaly-score distribution on the
+rows it was trained through against the rows added since, using the
+population stability index (PSI). Only when PSI crosses the threshold
+does it train. There are two modes:
+    window      fit a fresh forest on the newest `window` rows
+    warm_start  add `n_new_trees` trees fitted on the new rows only
+It then writes saved_models/keystroke_anomaly_v<version>.joblib, which the
+API's model registry hot-reloads. Cost scales with new data, not history.
+
+Usage:
+    python -m keystroke.incremental ingest sessions.ndjson
+    python -m keystroke.incremental retrain [--mode warm_start] [--force]
+    python -m keystroke.incremental status
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+
+from keystroke.features import FEATURE_NAMES
+from keystroke.model import DEFAULT_SAVED_MODELS_DIR, MODEL_NAME, load_keystroke_model, locate_keystroke_model
+from serving.artifacts import new_version, publish_artifact, write_json_atomic
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parents[1] / 'data' / 'keystroke_store'
+
+# Same hyperparameters as backend/src/ml/keystroke/trainModel.py
+FOREST_PARAMS = {'n_estimators': 150, 'contamination': 0.1, 'random_state': 42}
+
+DEFAULT_WINDOW = 50_000
+# PSI > 0.2 is the usual "significant shift" rule of thumb
+DEFAULT_DRIFT_THRESHOLD = 0.2
+DEFAULT_MIN_NEW_ROWS = 200
+DEFAULT_NEW_TREES = 25
+MAX_ESTIMATORS = 500
+
+
+class FeatureStore:
+    """Append-only float32 feature rows split into .npy segments."""
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get('KEYSTROKE_STORE_DIR', DEFAULT_STORE_DIR))
+        self.manifest_path = self.root / 'manifest.json'
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest['columns'] != FEATURE_NAMES:
+                raise ValueError(f"Store columns {self.manifest['columns']} don't match {FEATURE_NAMES}")
+        else:
+            self.manifest = {'columns': FEATURE_NAMES, 'segments': [], 'total_rows': 0, 'last_source_time': None}
+
+    @property
+    def total_rows(self) -> int:
+        return self.manifest['total_rows']
+
+    def append(self, X, source_time=None) -> int:
+        """Write X (n, 6) as a new segment; returns rows appended."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(FEATURE_NAMES):
+            raise ValueError(f"Expected (n, {len(FEATURE_NAMES)}) rows, got {X.shape}")
+        if len(X) == 0:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"segment_{time.time_ns()}.npy"
+        tmp_path = self.root / (name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, X)
+        os.replace(tmp_path, self.root / name)
+
+        self.manifest['segments'].append({'file': name, 'rows': len(X)})
+        self.manifest['total_rows'] += len(X)
+        if source_time:
+            self.manifest['last_source_time'] = max(filter(None, [self.manifest['last_source_time'], source_time]))
+        write_json_atomic(self.manifest_path, self.manifest)
+        return len(X)
+
+    def rows(self, start=0, stop=None) -> np.ndarray:
+        """Rows [start, stop) in insertion order; only overlapping segments are read."""
+        stop = self.total_rows if stop is None else min(stop, self.total_rows)
+        parts, offset = [], 0
+        for segment in self.manifest['segments']:
+            seg_start, seg_stop = offset, offset + segment['rows']
+            offset = seg_stop
+            if seg_stop <= start or seg_start >= stop:
+                continue
+            data = np.load(self.root / segment['file'], mmap_mode='r')
+            parts.append(data[max(start - seg_start, 0):min(stop, seg_stop) - seg_start])
+        if not parts:
+            return np.empty((0, len(FEATURE_NAMES)), dtype=np.float32)
+        return np.concatenate(parts)
+
+    def compact(self):
+        """Merge all segments into one (keeps rows and order)."""
+        if len(self.manifest['segments']) <= 1:
+            return
+        old = [segment['file'] for segment in self.manifest['segments']]
+        X = self.rows()
+        self.manifest['segments'], self.manifest['total_rows'] = [], 0
+        self.append(X)
+        for name in old:
+            (self.root / name).unlink(missing_ok=True)
+
+
+def read_feature_rows(path):
+    """
+    NDJSON (one KeystrokeResult per line) or CSV -> (X, latest createdAt).
+    Rows missing a feature or with non-finite values are dropped.
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        import pandas as pd
+        df = pd.read_csv(path)
+        records = df.to_dict('records')
+    else:
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    X = np.array(
+        [[record.get(name, np.nan) for name in FEATURE_NAMES] for record in records],
+        dtype=np.float64
+    ).reshape(-1, len(FEATURE_NAMES))
+    valid = np.isfinite(X).all(axis=1)
+    if not valid.all():
+        print(f"  Warning: skipped {int((~valid).sum())} rows with missing features")
+
+    # CSV cells without a createdAt come back from pandas as NaN, not None
+    created = [value for value in (r.get('createdAt') for r in records) if isinstance(value, str) and value]
+    return X[valid], (max(created) if created else None)
+
+
+def population_stability_index(expected, actual, bins=10):
+    """PSI between two score samples, with bins at quantiles of `expected`."""
+    edges = np.unique(np.quantile(expected, np.linspace(0, 1, bins + 1)))
+    if len(edges) < 3:
+        return 0.0
+    edges[0], edges[-1] = -np.inf, np.inf
+    expected_share = np.histogram(expected, edges)[0] / len(expected)
+    actual_share = np.histogram(actual, edges)[0] / len(actual)
+    expected_share = np.clip(expected_share, 1e-4, None)
+    actual_share = np.clip(actual_share, 1e-4, None)
+    return float(np.sum((actual_share - expected_share) * np.log(actual_share / expected_share)))
+
+
+def _sidecar(path):
+    sidecar = Path(path).with_suffix('.json')
+    if sidecar.exists():
+        with open(sidecar) as f:
+            return json.load(f)
+    return {}
+
+
+def save_versioned_model(model, metadata, saved_dir=None):
+    saved_dir = Path(saved_dir or os.environ.get('SAVED_MODELS_DIR', DEFAULT_SAVED_MODELS_DIR))
+    created_at = datetime.now()
+    version = new_version(created_at)
+    metadata = {
+        'name': MODEL_NAME,
+        'version': version,
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'feature_names': FEATURE_NAMES,
+        'n_estimators': int(model.n_estimators),
+        **metadata,
+    }
+
+    artifact_path = publish_artifact(saved_dir, MODEL_NAME, version, model, metadata)
+    print(f"✓ Saved {artifact_path.stem} ({metadata['mode']}, {metadata['n_estimators']} trees) to {saved_dir}")
+    return artifact_path
+
+
+def retrain(store, saved_dir=None, mode='window', window=DEFAULT_WINDOW,
+            drift_threshold=DEFAULT_DRIFT_THRESHOLD, min_new_rows=DEFAULT_MIN_NEW_ROWS,
+            n_new_trees=DEFAULT_NEW_TREES, force=False):
+    """
+    Retrain if enough new rows have arrived and their score distribution drifted.
+
+    Returns:
+        Path of the new model, or None if no retrain was needed
+
+    Raises:
+        ValueError: if the current model was trained through more rows
+            than the store holds (store reset or replaced); its rows no
+            longer line up, so "new rows" can't be determined
+    """
+    if mode not in ('window', 'warm_start'):
+        raise ValueError(f"Unknown mode: {mode}")
+
+    current_path = locate_keystroke_model(saved_dir)
+    current = load_keystroke_model(current_path) if current_path else None
+    watermark = _sidecar(current_path).get('trained_through_row', 0) if current_path else 0
+    total = store.total_rows
+    if watermark > total:
+        raise ValueError(
+            f"{current_path.name} was trained through row {watermark} but {store.root} has only "
+            f"{total} rows; was the store reset? Re-ingest the history or retrain from scratch "
+            f"with an empty saved models directory"
+        )
+    n_new = total - watermark
+
+    if n_new < min_new_rows and not force:
+        print(f"  {n_new} new rows (< {min_new_rows}); nothing to do")
+        return None
+
+    new_X = store.rows(watermark, total)
+    drift = None
+    if current is not None and watermark > 0:
+        reference = store.rows(max(0, watermark - window), watermark)
+        drift = population_stability_index(current.score_samples(reference), current.score_samples(new_X))
+        print(f"  Score drift (PSI) on {n_new} new rows: {drift:.3f} (threshold {drift_threshold})")
+        if drift < drift_threshold and not force:
+            print('  No significant drift; keeping current model')
+            return None
+
+    can_warm_start = (
+        mode == 'warm_start' and current is not None and watermark > 0
+        and current.n_estimators + n_new_trees <= MAX_ESTIMATORS
+    )
+    start = time.perf_counter()
+    if can_warm_start:
+        model = current
+        model.set_params(warm_start=True, n_estimators=current.n_estimators + n_new_trees)
+        model.fit(new_X)
+        training_rows = len(new_X)
+    else:
+        if mode == 'warm_start':
+            print('  Warm start unavailable (no versioned model or tree limit reached); retraining on window')
+        training_X = store.rows(max(0, total - window), total)
+        model = IsolationForest(**FOREST_PARAMS).fit(training_X)
+        training_rows = len(training_X)
+
+    print(f"  Trained on {training_rows} rows in {time.perf_counter() - start:.2f}s")
+    return save_versioned_model(model, {
+        'mode': 'warm_start' if can_warm_start else 'window',
+        'window': window,
+        'training_rows': training_rows,
+        'trained_through_row': total,
+        'drift_psi': drift,
+        'drift_threshold': drift_threshold,
+        'previous_version': current_path.name if current_path else None,
+    }, saved_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Incremental keystroke IsolationForest training')
+    parser.add_argument('--store', default=None, help='Feature store directory (KEYSTROKE_STORE_DIR)')
+    parser.add_argument('--saved-dir', default=None, help='Versioned model directory (SAVED_MODELS_DIR)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help='Append exported KeystrokeResult rows (NDJSON or CSV)')
+    ingest.add_argument('path')
+
+    train = sub.add_parser('retrain', help='Retrain if the new rows drifted')
+    train.add_argument('--mode', choices=['window', 'warm_start'], default='window')
+    train.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    train.add_argument('--drift-threshold', type=float, default=DEFAULT_DRIFT_THRESHOLD)
+    train.add_argument('--min-new-rows', type=int, default=DEFAULT_MIN_NEW_ROWS)
+    train.add_argument('--new-trees', type=int, default=DEFAULT_NEW_TREES)
+    train.add_argument('--force', action='store_true', help='Retrain regardless of drift')
+
+    sub.add_parser('compact', help='Merge store segments')
+    sub.add_parser('status', help='Show store and model state')
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.store)
+    if args.command == 'ingest':
+        X, source_time = read_feature_rows(args.path)
+        added = store.append(X, source_time)
+        print(f"✓ Appended {added} rows ({store.total_rows} total)")
+        if store.manifest['last_source_time']:
+            print(f"  Next export: --since {store.manifest['last_source_time']}")
+    elif args.command == 'retrain':
+        retrain(store, args.saved_dir, args.mode, args.window, args.drift_threshold,
+                args.min_new_rows, args.new_trees, args.force)
+    elif args.command == 'compact':
+        store.compact()
+        print(f"✓ Compacted store to {len(store.manifest['segments'])} segment(s)")
+    else:
+        current_path = locate_keystroke_model(args.saved_dir)
+        meta = _sidecar(current_path) if current_path else {}
+        print(f"Store: {store.root} ({store.total_rows} rows, {len(store.manifest['segments'])} segments)")
+        print(f"Last source time: {store.manifest['last_source_time']}")
+        print(f"Model: {current_path} (trained through row {meta.get('trained_through_row', 0)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Loading and batch scoring for the keystroke IsolationForest
+"""
+
+import os
+import numpy as np
+from pathlib import Path
+
+DEFAULT_MODEL_PATH = (
+    Path(__file__).resolve().parents[2]
+    / 'backend' / 'src' / 'ml' / 'keystroke' / 'keystroke_anomaly_model.pkl'
+)
+
+
+DEFAULT_SAVED_MODELS_DIR = Path(__file__).resolve().parents[1] / 'saved_models'
+
+MODEL_NAME = 'keystroke_anomaly'
+
+
+def get_model_path():
+    return Path(os.environ.get('KEYSTROKE_MODEL_PATH', DEFAULT_MODEL_PATH))
+
+
+def locate_keystroke_model(saved_dir=None):
+    """
+    Newest versioned `keystroke_anomaly_v<version>.joblib` in saved_models,
+    falling back to the model trainModel.py writes next to predict.py.
+    """
+    if 'KEYSTROKE_MODEL_PATH' not in os.environ:
+        saved_dir = Path(saved_dir or os.environ.get('SAVED_MODELS_DIR', DEFAULT_SAVED_MODELS_DIR))
+        candidates = sorted(saved_dir.glob(f"{MODEL_NAME}_v*.joblib"))
+        if candidates:
+            return candidates[-1]
+
+    path = get_model_path()
+    return path if path.exists() else None
+
+
+def load_keystroke_model(model_path=None):
+    """Load the trained IsolationForest produced by trainModel.py."""
+    model_path = Path(model_path) if model_path else get_model_path()
+
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file not found at {model_path}. Train the model first.")
+
+    # joblib (and sklearn, via unpickling) load with the first model, not at import
+    import joblib
+    return joblib.load(model_path)
+
+
+# Width of the logistic that maps the decision margin to risk: a session
+# this far above the anomaly threshold scores ~0.27, twice as far ~0.12
+RISK_SCALE = 0.05
+
+
+def anomaly_risk(scores, offset):
+    """
+    Risk in (0, 1) from anomaly scores, centred on the model's threshold.
+
+    `scores - offset` is IsolationForest's decision function (negative for
+    anomalies), so a session exactly on the threshold maps to 0.5, typical
+    sessions well inside the training distribution land low and clear
+    anomalies approach 1.
+    """
+    margin = np.asarray(scores, dtype=np.float64) - offset
+    return 1.0 / (1.0 + np.exp(np.clip(margin / RISK_SCALE, -50, 50)))
+
+
+def score_matrix(model, X):
+    """
+    Score every row with a single score_samples call.
+
+    IsolationForest.predict is just `score_samples - offset_ < 0`, so the
+    anomaly flags are derived from the same scores instead of a second pass.
+
+    Returns:
+        (anomaly_scores, is_anomalous, risk_scores) arrays; lower anomaly
+        scores are more anomalous, risk is anomaly_risk around offset_
+    """
+    scores = model.score_samples(X)
+    is_anomalous = scores < model.offset_
+    risk = anomaly_risk(scores, model.offset_)
+    return scores, is_anomalous, risk
@@ -3,12 +3,41 @@ FastAPI server for ML model inference
 Handles requests from Node.js backend for dyslexia detection
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import time
+IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response
+from starlette.routing import Match
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 import uvicorn
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from handwriting import PIPELINE_VERSION
+from handwriting.upload import UploadTooLarge, read_upload, check_image_limits
+from handwriting import worker as handwriting_worker
+from keystroke.features import (
+    EVENT_FEATURE_NAMES, FEATURE_NAMES as KEYSTROKE_FEATURES,
+    extract_event_features, extract_feature_matrix, features_to_dict, is_raw_event_session,
+    validate_session
+)
+from keystroke.model import load_keystroke_model, locate_keystroke_model, score_matrix
+from reading.artifact import load_reading_artifact, latest_artifact_path
+from reading.features import InvalidReadingMetrics, build_feature_matrix, comprehension_risk, validate_reading_metrics
+from fusion.model import DEFAULT_FUSION, MODALITIES, latest_fusion_path, load_fusion_model, risk_levels
+from serving.registry import ModelRegistry, ModelNotAvailable
+from serving.workers import BoundedProcessPool, PoolSaturated, WorkerCrashed
+from serving.jobs import JobQueue, QueueFull
+from serving.cache import InferenceCache, content_key
+from serving.batching import MicroBatcher
+from serving.startup import StartupProfile
+from serving import metrics
+
+startup_profile = StartupProfile()
+startup_profile.mark("imports", IMPORT_STARTED)
 
 app = FastAPI(
     title="Dyslexia Detection ML API",
@@ -25,29 +54,335 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics, labelled by route template to keep cardinality bounded
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    if route is None:
+        for candidate in app.routes:
+            if candidate.matches(request.scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        endpoint = route_template(request)
+        metrics.REQUEST_LATENCY.observe(time.perf_counter() - start, method=request.method, endpoint=endpoint)
+        metrics.REQUESTS.inc(method=request.method, endpoint=endpoint, status=status)
+
 # Request/Response models
 class HandwritingResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
     risk_score: float
     features: Dict
     reversals_detected: int
     confidence: float
+    detected_issues: List[Dict] = []
+    recommendations: List[str] = []
+    model_version: str
+    processing_time_ms: float
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[HandwritingResponse] = None
+    error: Optional[str] = None
+    # unreadable | worker_crashed | internal_error; only unreadable means a bad image
+    error_code: Optional[str] = None
 
 class KeystrokeRequest(BaseModel):
+    # Either raw events ({key, keyDownTime, keyUpTime}) or {holdTime, flightTime}
     timings: List[Dict]
+    # Final typed text, used for typed length and word count with raw events
+    text: Optional[str] = None
+
+    @field_validator("timings")
+    @classmethod
+    def check_timings(cls, timings):
+        # Empty or non-numeric sessions are a 422, not a score or a 500
+        return validate_session(timings)
     
 class KeystrokeResponse(BaseModel):
     risk_score: float
     anomaly_score: float
+    is_anomalous: bool
     features: Dict
 
+class KeystrokeBatchRequest(BaseModel):
+    sessions: List[KeystrokeRequest]
+
+class KeystrokeBatchResponse(BaseModel):
+    results: List[KeystrokeResponse]
+
 class ReadingRequest(BaseModel):
     metrics: Dict
+
+    @field_validator("metrics")
+    @classmethod
+    def check_metrics(cls, metrics):
+        # Missing clinical inputs are a 422, never silently scored as 0
+        return validate_reading_metrics(metrics)
     
 class ReadingResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
     risk_score: float
     reading_difficulty_score: float
+    model_version: str
     features: Dict
 
+class ReadingBatchRequest(BaseModel):
+    items: List[ReadingRequest]
+
+class ReadingBatchResponse(BaseModel):
+    results: List[ReadingResponse]
+
+class ModuleScore(BaseModel):
+    # Probabilities, not percentages: 65 instead of 0.65 is a 422, never clipped
+    score: float = Field(ge=0, le=1)
+    confidence: float = Field(1.0, ge=0, le=1)
+
+class FusionItem(BaseModel):
+    handwriting: Optional[ModuleScore] = None
+    keystroke: Optional[ModuleScore] = None
+    reading: Optional[ModuleScore] = None
+
+    def has_scores(self) -> bool:
+        return any(getattr(self, name) is not None for name in MODALITIES)
+
+class FusionBatchRequest(BaseModel):
+    items: List[FusionItem]
+
+class FusionResult(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    final_risk_score: float
+    risk_level: str
+    confidence: float
+    individual_scores: Dict[str, Optional[float]]
+    modalities_used: List[str]
+    model_version: str
+
+class FusionBatchResponse(BaseModel):
+    # null for items with no completed module
+    results: List[Optional[FusionResult]]
+
+# Comprehension isn't in ETDD70, so it is blended in with the weight the
+# web feature weights give it (analysis/web_feature_weights.js)
+COMPREHENSION_WEIGHT = 0.30
+
+# Model registry: eager or lazy loading, hot reload from saved_models/
+registry = ModelRegistry.from_env()
+registry.register("keystroke", locate_keystroke_model, load_keystroke_model)
+registry.register(
+    "reading",
+    latest_artifact_path,
+    load_reading_artifact,
+    version_of=lambda artifact, path: artifact.version
+)
+# Optional: without a trained artifact fusion uses the fixed-weight fallback
+registry.register(
+    "fusion",
+    latest_fusion_path,
+    load_fusion_model,
+    version_of=lambda model, path: model.version,
+    required=False
+)
+
+def collect_model_metrics():
+    metrics.MODEL_LOADED.clear()
+    metrics.MODEL_LOAD_SECONDS.clear()
+    for name, status in registry.status().items():
+        metrics.MODEL_LOADED.set(1 if status["state"] == "loaded" else 0, model=name)
+        if status["load_seconds"] is not None:
+            metrics.MODEL_LOAD_SECONDS.set(status["load_seconds"], model=name, version=status["version"])
+
+metrics.REGISTRY.add_collector(collect_model_metrics)
+
+# Results keyed by input content + model version; a new version misses naturally
+inference_cache = InferenceCache.from_env()
+
+def cache_lookup(model: str, key: str):
+    result = inference_cache.get(key)
+    metrics.CACHE_LOOKUPS.inc(model=model, result="hit" if result is not None else "miss")
+    return result
+
+# Handwriting analysis is CPU-bound: run it in worker processes and reject
+# with 429 once HANDWRITING_WORKERS + HANDWRITING_MAX_PENDING jobs are in flight
+handwriting_pool = BoundedProcessPool.from_env("HANDWRITING")
+
+async def read_handwriting_upload(file: UploadFile) -> bytearray:
+    """
+    Stream the spooled upload into one preallocated buffer and check the
+    byte and pixel limits from the image header before any decoding.
+    """
+    buffer = await run_in_threadpool(read_upload, file.file, file.size)
+    check_image_limits(buffer)
+    return buffer
+
+def lookup_handwriting(data: bytes):
+    """(cache key, cached result or None); hashing a large upload and the disk tier both block"""
+    key = content_key("handwriting", PIPELINE_VERSION, data)
+    return key, cache_lookup("handwriting", key)
+
+async def run_handwriting_analysis(data: bytes) -> Dict:
+    start = time.perf_counter()
+    key, result = await run_in_threadpool(lookup_handwriting, data)
+    if result is not None:
+        # The cached timing belongs to the original request; report this one's
+        return {**result, "processing_time_ms": (time.perf_counter() - start) * 1000}
+
+    # handwriting.worker imports the pipeline (and OpenCV) inside the worker
+    with metrics.INFERENCE_LATENCY.time(model="handwriting"):
+        result = await handwriting_pool.run(handwriting_worker.analyze, data)
+    metrics.BATCH_SIZE.observe(1, model="handwriting")
+    await run_in_threadpool(inference_cache.set, key, result)
+    return result
+
+# Submitted handwriting jobs run in the background, one worker per CPU worker
+handwriting_jobs = JobQueue.from_env(run_handwriting_analysis, concurrency=handwriting_pool.max_workers)
+
+@app.on_event("startup")
+async def load_models():
+    """Load models (unless MODEL_LOADING=lazy) and start watching for new versions"""
+    started = time.perf_counter()
+    handwriting_pool.start()
+    await handwriting_jobs.start()
+    await registry.start()
+    startup_profile.mark("startup_event", started)
+
+@app.on_event("shutdown")
+async def stop_model_watcher():
+    # Let in-flight micro-batches answer their callers before models go away
+    await keystroke_batcher.close()
+    await reading_batcher.close()
+    await registry.stop()
+    await handwriting_jobs.stop()
+    handwriting_pool.shutdown()
+
+def get_model(name: str):
+    """(model, version) from one registry snapshot; 503 if the model isn't loaded"""
+    try:
+        return registry.get_versioned(name)
+    except ModelNotAvailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+def keystroke_feature_rows(requests: List[KeystrokeRequest]):
+    """
+    (X, names): model features for every session, plus the extra behavioural
+    features for sessions sent as raw key events
+    """
+    sessions = [r.timings for r in requests]
+    X = extract_feature_matrix(sessions)
+    features = [features_to_dict(row) for row in X]
+
+    raw = [i for i, session in enumerate(sessions) if is_raw_event_session(session)]
+    if raw:
+        E = extract_event_features([sessions[i] for i in raw], [requests[i].text for i in raw])
+        X[raw] = E[:, :len(KEYSTROKE_FEATURES)]
+        for j, i in enumerate(raw):
+            features[i] = features_to_dict(E[j], EVENT_FEATURE_NAMES)
+    return np.ascontiguousarray(X), features
+
+def score_keystroke_sessions(requests: List[KeystrokeRequest]) -> List[KeystrokeResponse]:
+    """Extract features for all sessions and score the uncached ones in one model call"""
+    model, version = get_model("keystroke")
+    with metrics.PREPROCESS_LATENCY.time(model="keystroke"):
+        X, features = keystroke_feature_rows(requests)
+
+    keys = [content_key("keystroke", version, X[i]) for i in range(len(requests))]
+    cached = [cache_lookup("keystroke", key) for key in keys]
+    misses = [i for i, hit in enumerate(cached) if hit is None]
+
+    if misses:
+        with metrics.INFERENCE_LATENCY.time(model="keystroke"):
+            scores, is_anomalous, risk = score_matrix(model, X[misses])
+        metrics.BATCH_SIZE.observe(len(misses), model="keystroke")
+        for j, i in enumerate(misses):
+            cached[i] = {
+                "risk_score": float(risk[j]),
+                "anomaly_score": float(scores[j]),
+                "is_anomalous": bool(is_anomalous[j])
+            }
+            inference_cache.set(keys[i], cached[i])
+
+    return [
+        KeystrokeResponse(**cached[i], features=features[i])
+        for i in range(len(requests))
+    ]
+
+def score_reading_payloads(payloads: List[Dict]) -> List[ReadingResponse]:
+    """Map web metrics to eye-tracking features and score them in one call"""
+    model, version = get_model("reading")
+    with metrics.PREPROCESS_LATENCY.time(model="reading"):
+        X = build_feature_matrix(payloads, model.feature_names, model.proxy_constants)
+    with metrics.INFERENCE_LATENCY.time(model="reading"):
+        difficulty = model.predict_proba(X)
+    metrics.BATCH_SIZE.observe(len(payloads), model="reading")
+
+    comprehension = comprehension_risk(payloads)
+    risk = np.where(
+        np.isnan(comprehension),
+        difficulty,
+        (1 - COMPREHENSION_WEIGHT) * difficulty + COMPREHENSION_WEIGHT * np.nan_to_num(comprehension)
+    )
+
+    return [
+        ReadingResponse(
+            risk_score=float(risk[i]),
+            reading_difficulty_score=float(difficulty[i]),
+            model_version=version,
+            features={name: float(X[i, j]) for j, name in enumerate(model.feature_names)}
+        )
+        for i in range(len(payloads))
+    ]
+
+def fuse_items(items: List[FusionItem]) -> List[FusionResult]:
+    """Fuse a batch of per-module scores in one vectorised call"""
+    try:
+        model = registry.get("fusion")
+    except ModelNotAvailable:
+        model = DEFAULT_FUSION
+
+    with metrics.PREPROCESS_LATENCY.time(model="fusion"):
+        modules = [[getattr(item, name) for name in MODALITIES] for item in items]
+        present = np.array([[m is not None for m in row] for row in modules], dtype=bool)
+        scores = np.array([[m.score if m else 0.0 for m in row] for row in modules], dtype=np.float64)
+        confidences = np.array([[m.confidence if m else 0.0 for m in row] for row in modules], dtype=np.float64)
+    with metrics.INFERENCE_LATENCY.time(model="fusion"):
+        risk, confidence = model.predict(scores, confidences, present)
+        levels = risk_levels(risk, model.cutoffs)
+    metrics.BATCH_SIZE.observe(len(items), model="fusion")
+
+    return [
+        FusionResult(
+            final_risk_score=round(float(risk[i]), 4),
+            risk_level=str(levels[i]),
+            confidence=round(float(confidence[i]), 4),
+            individual_scores={
+                name: (float(scores[i, j]) if present[i, j] else None) for j, name in enumerate(MODALITIES)
+            },
+            modalities_used=[name for j, name in enumerate(MODALITIES) if present[i, j]],
+            model_version=model.version
+        )
+        for i in range(len(items))
+    ]
+
+# Single-item endpoints coalesce concurrent requests into one model call
+keystroke_batcher = MicroBatcher.from_env(score_keystroke_sessions, prefix="KEYSTROKE_MICROBATCH")
+reading_batcher = MicroBatcher.from_env(score_reading_payloads, prefix="READING_MICROBATCH")
+
 # Health check
 @app.get("/")
 async def root():
@@ -59,7 +394,26 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "models_loaded": True}
+    models = registry.status()
+    return {
+        "status": "healthy",
+        "models_loaded": all(m["state"] == "loaded" for m in models.values() if m["required"]),
+        "models": models,
+        "handwriting_workers": handwriting_pool.stats(),
+        "handwriting_jobs": await handwriting_jobs.stats(),
+        "inference_cache": inference_cache.stats(),
+        "microbatching": {
+            "keystroke": keystroke_batcher.stats(),
+            "reading": reading_batcher.stats()
+        },
+        "startup": startup_profile.stats()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text-format request, latency, batch-size and model-load metrics"""
+    # As a header, not media_type: Starlette would append a second charset
+    return Response(content=metrics.REGISTRY.render(), headers={"Content-Type": metrics.CONTENT_TYPE})
 
 # Handwriting analysis endpoint
 @app.post("/api/ml/handwriting/analyze", response_model=HandwritingResponse)
@@ -68,21 +422,60 @@ async def analyze_handwriting(file: UploadFile = File(...)):
     Analyze handwriting image for dyslexia indicators
     """
     try:
-        # TODO: Load image, preprocess, run through models
-        # Placeholder response
-        return HandwritingResponse(
-            risk_score=0.65,
-            features={
-                "reversal_count": 3,
-                "spacing_score": 0.7,
-                "alignment_score": 0.6
-            },
-            reversals_detected=3,
-            confidence=0.85
-        )
+        data = await read_handwriting_upload(file)
+        return HandwritingResponse(**await run_handwriting_analysis(data))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except WorkerCrashed as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def job_response(job: Dict) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"],
+        result=job["result"],
+        error=job["error"],
+        error_code=job["error_code"]
+    )
+
+@app.post("/api/ml/handwriting/jobs", response_model=JobResponse, status_code=202)
+async def submit_handwriting_job(file: UploadFile = File(...)):
+    """
+    Queue a handwriting image for background analysis; poll the job for the result
+    """
+    try:
+        data = await read_handwriting_upload(file)
+        job = await handwriting_jobs.submit("handwriting", data, {"filename": file.filename})
+        return job_response(job)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/ml/handwriting/jobs/{job_id}", response_model=JobResponse)
+async def get_handwriting_job(job_id: str):
+    job = await handwriting_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
+
 # Keystroke analysis endpoint
 @app.post("/api/ml/keystroke/analyze", response_model=KeystrokeResponse)
 async def analyze_keystroke(data: KeystrokeRequest):
@@ -90,16 +483,28 @@ async def analyze_keystroke(data: KeystrokeRequest):
     Analyze keystroke timing patterns for anomalies
     """
     try:
-        # TODO: Extract features, run anomaly detection
-        return KeystrokeResponse(
-            risk_score=0.55,
-            anomaly_score=0.48,
-            features={
-                "avg_dwell_time": 145.3,
-                "avg_flight_time": 89.2,
-                "backspace_frequency": 0.12
-            }
+        return await keystroke_batcher.submit(data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ml/keystroke/analyze_batch", response_model=KeystrokeBatchResponse)
+def analyze_keystroke_batch(data: KeystrokeBatchRequest):
+    """
+    Score many keystroke sessions at once, e.g. when re-scoring stored
+    KeystrokeResult documents after retraining. A plain def, so FastAPI
+    runs the NumPy/sklearn scoring (and any lazy model load) in its
+    threadpool instead of on the event loop
+    """
+    try:
+        if not data.sessions:
+            return KeystrokeBatchResponse(results=[])
+        return KeystrokeBatchResponse(
+            results=score_keystroke_sessions(data.sessions)
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -110,57 +515,75 @@ async def analyze_reading(data: ReadingRequest):
     Analyze reading behavior metrics
     """
     try:
-        # TODO: Map to eye-tracking features, run classifier
-        return ReadingResponse(
-            risk_score=0.58,
-            reading_difficulty_score=0.62,
-            features={
-                "regression_ratio": 0.25,
-                "avg_fixation_duration": 312.5,
-                "reading_speed": 85.3
-            }
+        return await reading_batcher.submit(data.metrics)
+    except HTTPException:
+        raise
+    except InvalidReadingMetrics as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ml/reading/analyze_batch", response_model=ReadingBatchResponse)
+def analyze_reading_batch(data: ReadingBatchRequest):
+    """
+    Score many reading results at once (plain def: runs in the threadpool,
+    off the event loop)
+    """
+    try:
+        if not data.items:
+            return ReadingBatchResponse(results=[])
+        return ReadingBatchResponse(
+            results=score_reading_payloads([item.metrics for item in data.items])
         )
+    except HTTPException:
+        raise
+    except InvalidReadingMetrics as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Fusion endpoint - combines all three modules
-@app.post("/api/ml/fusion/calculate")
-async def calculate_fusion_score(
-    handwriting_score: float,
-    keystroke_score: float,
-    reading_score: float
+@app.post("/api/ml/fusion/calculate", response_model=FusionResult)
+def calculate_fusion_score(
+    handwriting_score: Optional[float] = Query(None, ge=0, le=1),
+    keystroke_score: Optional[float] = Query(None, ge=0, le=1),
+    reading_score: Optional[float] = Query(None, ge=0, le=1)
 ):
     """
     Combine individual module scores into final risk assessment
     """
     try:
-        # Weighted fusion (to be refined)
-        weights = {"handwriting": 0.4, "keystroke": 0.3, "reading": 0.3}
-        
-        final_score = (
-            handwriting_score * weights["handwriting"] +
-            keystroke_score * weights["keystroke"] +
-            reading_score * weights["reading"]
+        item = FusionItem(
+            handwriting=ModuleScore(score=handwriting_score) if handwriting_score is not None else None,
+            keystroke=ModuleScore(score=keystroke_score) if keystroke_score is not None else None,
+            reading=ModuleScore(score=reading_score) if reading_score is not None else None
         )
-        
-        # Classify risk level
-        if final_score < 0.3:
-            risk_level = "Low"
-        elif final_score < 0.6:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-        
-        return {
-            "final_risk_score": round(final_score, 2),
-            "risk_level": risk_level,
-            "individual_scores": {
-                "handwriting": handwriting_score,
-                "keystroke": keystroke_score,
-                "reading": reading_score
-            },
-            "confidence": 0.82
-        }
+        return fuse_items([item])[0]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ml/fusion/calculate_batch", response_model=FusionBatchResponse)
+def calculate_fusion_batch(data: FusionBatchRequest):
+    """
+    Fuse many assessments at once (e.g. cohort dashboards); modules may be missing per item,
+    and an item with no module at all gets a null result instead of failing the batch.
+    Plain def handlers: fusion (and a lazy artifact load) runs in the threadpool
+    """
+    try:
+        scored = [i for i, item in enumerate(data.items) if item.has_scores()]
+        results = [None] * len(data.items)
+        if scored:
+            for i, result in zip(scored, fuse_items([data.items[i] for i in scored])):
+                results[i] = result
+        return FusionBatchResponse(results=results)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
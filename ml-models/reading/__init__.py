@@ -0,0 +1,3 @@
+"""
+Reading module: ETDD70 classifier artifacts and web-proxy feature mapping
+"""
@@ -0,0 +1,75 @@
+"""
+Loader for the versioned reading-classifier artifact written by
+analysis/model_export.py (scaler + model + feature order + metrics).
+"""
+
+import os
+import numpy as np
+from pathlib import Path
+
+ARTIFACT_NAME = 'reading_classifier'
+SUPPORTED_FORMAT_VERSIONS = {1}
+
+DEFAULT_SAVED_MODELS_DIR = Path(__file__).resolve().parents[1] / 'saved_models'
+
+
+def get_saved_models_dir():
+    return Path(os.environ.get('SAVED_MODELS_DIR', DEFAULT_SAVED_MODELS_DIR))
+
+
+def latest_artifact_path(saved_dir=None, name=ARTIFACT_NAME):
+    """
+    Newest `<name>_v<version>.joblib` in saved_dir. Versions are
+    timestamps, so lexical order is chronological.
+    """
+    saved_dir = Path(saved_dir) if saved_dir else get_saved_models_dir()
+    candidates = sorted(saved_dir.glob(f"{name}_v*.joblib"))
+    return candidates[-1] if candidates else None
+
+
+class ReadingArtifact:
+    """In-process reading classifier: scaler + model in training column order."""
+
+    def __init__(self, payload, path):
+        fmt = payload.get('format_version')
+        if fmt not in SUPPORTED_FORMAT_VERSIONS:
+            raise ValueError(f"Unsupported artifact format version: {fmt}")
+
+        self.path = Path(path)
+        self.version = payload['version']
+        self.created_at = payload.get('created_at')
+        self.model_type = payload.get('model_type')
+        self.feature_names = list(payload['feature_names'])
+        self.metrics = payload.get('metrics', {})
+        self.proxy_constants = payload.get('proxy_constants', {})
+        self.scaler = payload['scaler']
+        self.model = payload['model']
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def predict_proba(self, X):
+        """Dyslexia probability (class 1) for each row of X."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        return self.model.predict_proba(self.scaler.transform(X))[:, 1]
+
+
+def load_reading_artifact(path=None, mmap=True):
+    """
+    Load a reading artifact, memory-mapping its numpy arrays by default so
+    several uvicorn workers share one copy of the forest in the page cache.
+    """
+    path = Path(path) if path else latest_artifact_path()
+    if path is None or not path.exists():
+        raise FileNotFoundError(
+            f"No {ARTIFACT_NAME} artifact found in {get_saved_models_dir()}. Run analysis/train_ml_model.py first."
+        )
+
+    import joblib
+    payload = joblib.load(path, mmap_mode='r' if mmap else None)
+    return ReadingArtifact(payload, path)
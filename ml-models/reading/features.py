@@ -0,0 +1,182 @@
+"""
+Map web reading-test metrics (ReadingResult payloads) onto the ETDD70
+eye-tracking features the reading classifier was trained on.
+
+The web test measures behavioural proxies: total reading time, revisits
+(scroll-backs) and inactivity pauses. Each eye-tracking feature is
+reconstructed from those proxies with conversion constants. The
+constants are precomputed from ETDD70 at training time and stored in the
+artifact (`proxy_constants`). DEFAULT_PROXY_CONSTANTS below are the
+pooled ETDD70 values from analysis/ETDD70_descriptive_stats.csv and are
+only used for artifacts that predate them.
+"""
+
+import numpy as np
+from typing import Dict, List
+
+DEFAULT_PROXY_CONSTANTS = {
+    # Eye regressions happen ~4x more often than manual revisits
+    'regression_per_revisit': 4.0,
+    # Web inactivity pauses run ~1.8x longer than eye fixations
+    'pause_per_fixation': 1.8,
+    # Total reading time maps directly onto dwell time
+    'dwell_per_reading_time': 1.0,
+    # Share of dwell time spent fixating (sum_fix_dur / dwell_time)
+    'fixation_share_of_dwell': 0.9287,
+    # Fallback mean fixation duration (ms) when no pauses were recorded
+    'mean_fix_dur': 422.34,
+    # No web proxy for saccade amplitude; use the pooled ETDD70 mean
+    'mean_sacc_ampl': 83.64,
+    # Share of regressions that stay within the current line
+    'within_line_regress_share': 0.8,
+    # Assumed ETDD70 meaningful-text length, used to length-normalise
+    'reference_text_words': 200,
+}
+
+MAPPED_FEATURES = [
+    'n_fix_trial', 'sum_fix_dur_trial', 'mean_fix_dur_trial',
+    'n_sacc_trial', 'mean_sacc_ampl_trial', 'n_regress_trial',
+    'n_within_line_regress_trial', 'n_between_line_regress_trial',
+    'ratio_progress_regress_trial', 'dwell_time_trial'
+]
+
+
+# Web metrics every payload must carry; nothing is defaulted for these
+REQUIRED_METRICS = ['totalReadingTime', 'totalRevisits']
+OPTIONAL_METRICS = ['averagePauseDuration', 'passageTotalWords', 'comprehensionScore']
+
+
+class InvalidReadingMetrics(ValueError):
+    """A payload is missing a required metric or carries an invalid one (a client error)."""
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and np.isfinite(value)
+
+
+def validate_reading_metrics(metrics: Dict) -> Dict:
+    """
+    Check a ReadingResult payload before mapping it.
+
+    totalReadingTime must be a positive number of ms and totalRevisits a
+    non-negative count; the optional metrics must be numbers when sent,
+    comprehensionScore within 0-100.
+
+    Raises:
+        InvalidReadingMetrics: describing the first problem found
+    """
+    for key in REQUIRED_METRICS:
+        if not _is_number(metrics.get(key)):
+            raise InvalidReadingMetrics(f"{key} is required and must be a number")
+    if metrics['totalReadingTime'] <= 0:
+        raise InvalidReadingMetrics("totalReadingTime must be positive")
+    if metrics['totalRevisits'] < 0:
+        raise InvalidReadingMetrics("totalRevisits must not be negative")
+
+    for key in OPTIONAL_METRICS:
+        if metrics.get(key) is not None and not _is_number(metrics[key]):
+            raise InvalidReadingMetrics(f"{key} must be a number")
+    pauses = metrics.get('pauseDurations')
+    if pauses is not None and not (isinstance(pauses, list) and all(_is_number(p) for p in pauses)):
+        raise InvalidReadingMetrics("pauseDurations must be a list of numbers")
+    score = metrics.get('comprehensionScore')
+    if score is not None and not 0 <= score <= 100:
+        raise InvalidReadingMetrics("comprehensionScore must be between 0 and 100")
+    return metrics
+
+
+def _column(payloads, key, default=None):
+    """Float column for `key`; without a default, a missing value is an error."""
+    values = []
+    for i, p in enumerate(payloads):
+        value = p.get(key)
+        if value is None:
+            if default is None:
+                raise InvalidReadingMetrics(f"{key} is required (item {i})")
+            value = default
+        values.append(float(value))
+    return np.asarray(values, dtype=np.float64)
+
+
+def _average_pause(payloads):
+    """averagePauseDuration, or the mean of pauseDurations when absent."""
+    values = []
+    for p in payloads:
+        avg = p.get('averagePauseDuration')
+        if not avg and p.get('pauseDurations'):
+            avg = float(np.mean(p['pauseDurations']))
+        values.append(float(avg or 0.0))
+    return np.asarray(values, dtype=np.float64)
+
+
+def map_reading_metrics(payloads: List[Dict], constants: Dict = None) -> Dict[str, np.ndarray]:
+    """
+    Convert a batch of ReadingResult payloads into eye-tracking features.
+
+    Args:
+        payloads: Dicts with totalReadingTime (ms), totalRevisits,
+            averagePauseDuration or pauseDurations (ms) and optionally
+            passageTotalWords
+        constants: Conversion constants (defaults to DEFAULT_PROXY_CONSTANTS)
+
+    Returns:
+        {feature_name: array of length len(payloads)}
+    """
+    c = {**DEFAULT_PROXY_CONSTANTS, **(constants or {})}
+
+    reading_time = _column(payloads, 'totalReadingTime')
+    revisits = _column(payloads, 'totalRevisits')
+    avg_pause = _average_pause(payloads)
+    words = _column(payloads, 'passageTotalWords', default=c['reference_text_words'])
+
+    # Scale reading time to the length of the ETDD70 text
+    length_scale = c['reference_text_words'] / np.where(words > 0, words, c['reference_text_words'])
+    dwell = reading_time * c['dwell_per_reading_time'] * length_scale
+
+    sum_fix = dwell * c['fixation_share_of_dwell']
+    mean_fix = np.where(avg_pause > 0, avg_pause / c['pause_per_fixation'], c['mean_fix_dur'])
+    n_fix = sum_fix / mean_fix
+    # One saccade between each pair of consecutive fixations
+    n_sacc = np.maximum(n_fix - 1, 0)
+
+    n_regress = revisits * c['regression_per_revisit'] * length_scale
+    n_within = n_regress * c['within_line_regress_share']
+    n_between = n_regress - n_within
+    ratio = np.maximum(n_sacc - n_regress, 0) / np.maximum(n_regress, 1)
+
+    return {
+        'n_fix_trial': n_fix,
+        'sum_fix_dur_trial': sum_fix,
+        'mean_fix_dur_trial': mean_fix,
+        'n_sacc_trial': n_sacc,
+        'mean_sacc_ampl_trial': np.full(len(payloads), c['mean_sacc_ampl']),
+        'n_regress_trial': n_regress,
+        'n_within_line_regress_trial': n_within,
+        'n_between_line_regress_trial': n_between,
+        'ratio_progress_regress_trial': ratio,
+        'dwell_time_trial': dwell,
+    }
+
+
+def build_feature_matrix(payloads: List[Dict], feature_names: List[str], constants: Dict = None) -> np.ndarray:
+    """
+    Feature matrix in the artifact's column order.
+
+    Raises:
+        ValueError: if the model expects features that cannot be derived
+            from web metrics (e.g. a multi-task ETDD70 model)
+    """
+    missing = [name for name in feature_names if name not in MAPPED_FEATURES]
+    if missing:
+        raise ValueError(f"Model features cannot be derived from web metrics: {missing}")
+
+    mapped = map_reading_metrics(payloads, constants)
+    return np.column_stack([mapped[name] for name in feature_names])
+
+
+def comprehension_risk(payloads: List[Dict]) -> np.ndarray:
+    """1 - comprehension fraction; NaN where no comprehension score was sent."""
+    return np.array([
+        1.0 - float(p['comprehensionScore']) / 100 if p.get('comprehensionScore') is not None else np.nan
+        for p in payloads
+    ])
@@ -0,0 +1,3 @@
+"""
+Serving infrastructure shared by the ML API: model registry and friends
+"""
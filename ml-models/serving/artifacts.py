@@ -0,0 +1,76 @@
+"""
+Versioned model artifacts in saved_models/.
+
+An artifact is `<name>_v<version>.joblib` plus a `<name>_v<version>.json`
+sidecar with its metadata. Versions are creation timestamps down to the
+microsecond, so they sort in creation order and two exports in the same
+second get different versions. An existing version is never overwritten.
+
+The artifact is written to a temp file, the sidecar next, and the
+artifact is renamed into place last, so the registry's watcher never sees
+a model without its sidecar.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+
+VERSION_FORMAT = '%Y%m%d-%H%M%S-%f'
+
+
+def new_version(created_at: datetime = None) -> str:
+    return (created_at or datetime.now()).strftime(VERSION_FORMAT)
+
+
+def write_json_atomic(path, payload):
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def publish_artifact(saved_dir, name, version, obj, metadata, compress=0):
+    """
+    Write `obj` as `<name>_v<version>.joblib` and `metadata` as its sidecar.
+    compress=0 keeps numpy arrays mmap-able at load time.
+
+    Returns:
+        Path of the .joblib artifact
+
+    Raises:
+        FileExistsError: if that version exists or is being written
+    """
+    saved_dir = Path(saved_dir)
+    saved_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}_v{version}"
+    artifact_path = saved_dir / f"{stem}.joblib"
+    sidecar_path = saved_dir / f"{stem}.json"
+
+    # Creating the sidecar's temp file exclusively reserves the version
+    # against a concurrent writer
+    sidecar_tmp = sidecar_path.with_name(sidecar_path.name + '.tmp')
+    try:
+        reservation = open(sidecar_tmp, 'x')
+    except FileExistsError:
+        raise FileExistsError(f"{stem} is already being written in {saved_dir}") from None
+
+    artifact_tmp = artifact_path.with_name(artifact_path.name + '.tmp')
+    published = False
+    try:
+        with reservation:
+            if artifact_path.exists() or sidecar_path.exists():
+                raise FileExistsError(f"{stem} already exists in {saved_dir}; refusing to overwrite it")
+            json.dump(metadata, reservation, indent=2)
+        joblib.dump(obj, artifact_tmp, compress=compress)
+        os.replace(sidecar_tmp, sidecar_path)
+        os.replace(artifact_tmp, artifact_path)
+        published = True
+    finally:
+        if not published:
+            sidecar_tmp.unlink(missing_ok=True)
+            artifact_tmp.unlink(missing_ok=True)
+    return artifact_path
@@ -0,0 +1,121 @@
+"""
+Asyncio micro-batching for single-item inference endpoints.
+
+Concurrent requests are collected for at most `max_latency_ms` (or until
+`max_batch_size` items are waiting), scored with one call to the batch
+function, and each waiting coroutine gets its own result back. A burst of
+single-session requests then costs one score_samples / predict_proba
+call instead of one per request.
+"""
+
+import asyncio
+import os
+from typing import Callable, List
+
+
+class MicroBatcher:
+    def __init__(self, process_batch: Callable[[List], List], max_batch_size: int = 64,
+                 max_latency_ms: float = 5.0):
+        """
+        Args:
+            process_batch: Sync function mapping a list of items to a list
+                of results in the same order; run in a worker thread
+            max_batch_size: Flush as soon as this many items are waiting
+            max_latency_ms: Longest an item waits for others to arrive;
+                0 disables batching (each item is processed on its own)
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_latency = max(0.0, float(max_latency_ms)) / 1000
+        self._items = []
+        self._futures = []
+        self._timer = None
+        # The event loop only keeps weak references to tasks
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+
+    @classmethod
+    def from_env(cls, process_batch, prefix='MICROBATCH'):
+        """<prefix>_MAX_SIZE (default 64) and <prefix>_MAX_LATENCY_MS (default 5)."""
+        return cls(
+            process_batch,
+            max_batch_size=int(os.getenv(f'{prefix}_MAX_SIZE', 64)),
+            max_latency_ms=float(os.getenv(f'{prefix}_MAX_LATENCY_MS', 5)),
+        )
+
+    async def submit(self, item):
+        """Queue one item and wait for its result (exceptions propagate)."""
+        if self.max_latency == 0 or self.max_batch_size == 1:
+            return (await asyncio.to_thread(self.process_batch, [item]))[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+
+        if len(self._items) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        if items:
+            task = asyncio.ensure_future(self._run(items, futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items, futures):
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await asyncio.to_thread(self.process_batch, items)
+        except Exception as e:
+            if len(items) == 1:
+                self._resolve(futures[0], None, e)
+                return
+            # One bad payload must not fail its batch-mates: retry one by one
+            outcomes = await asyncio.to_thread(lambda: [self._capture(item) for item in items])
+            for future, outcome in zip(futures, outcomes):
+                self._resolve(future, *outcome)
+            return
+
+        for future, result in zip(futures, results):
+            self._resolve(future, result, None)
+
+    def _capture(self, item):
+        try:
+            return self.process_batch([item])[0], None
+        except Exception as e:
+            return None, e
+
+    @staticmethod
+    def _resolve(future, result, error):
+        # The caller may have been cancelled (client disconnected)
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def close(self):
+        """Flush waiting items and wait for every in-flight batch to finish."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency * 1000,
+            "pending": len(self._items),
+            "batches": self.batches,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
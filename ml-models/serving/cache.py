@@ -0,0 +1,172 @@
+"""
+Content-addressed inference cache.
+
+Results are keyed by a hash of the model name, the model version and the
+exact input (image bytes or feature vector bytes). A new model version
+therefore never sees results from the previous one, so no explicit
+invalidation is needed. An in-memory LRU with TTL sits in front of an
+optional on-disk tier (one JSON file per key) that survives restarts
+and is shared by every API process pointed at the same directory.
+
+The disk tier is swept at most every `sweep_interval` seconds, from
+whichever write comes due: expired files are deleted, then the oldest
+files until at most `max_disk_entries` remain. Between sweeps the
+directory can overshoot the limit by the writes made in that interval.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def content_key(model: str, version: str, payload) -> str:
+    """sha256 over model, version and the raw payload (bytes-like)."""
+    digest = hashlib.sha256()
+    digest.update(f"{model}\0{version}\0".encode())
+    digest.update(memoryview(payload).cast('B'))
+    return digest.hexdigest()
+
+
+class InferenceCache:
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 3600, disk_dir=None,
+                 max_disk_entries: int = 100_000, sweep_interval: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self.sweep_interval = sweep_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._last_sweep = float('-inf')
+        self.hits = 0
+        self.misses = 0
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """
+        INFERENCE_CACHE_SIZE (0 disables), INFERENCE_CACHE_TTL, INFERENCE_CACHE_DIR (disk tier),
+        INFERENCE_CACHE_DISK_SIZE and INFERENCE_CACHE_SWEEP_INTERVAL.
+        """
+        return cls(
+            max_entries=int(os.getenv('INFERENCE_CACHE_SIZE', 4096)),
+            ttl_seconds=float(os.getenv('INFERENCE_CACHE_TTL', 3600)),
+            disk_dir=os.getenv('INFERENCE_CACHE_DIR') or None,
+            max_disk_entries=int(os.getenv('INFERENCE_CACHE_DISK_SIZE', 100_000)),
+            sweep_interval=float(os.getenv('INFERENCE_CACHE_SWEEP_INTERVAL', 300)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _disk_path(self, key):
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key) -> Optional[Dict]:
+        path = self._disk_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, value):
+        path = self._disk_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval and self._sweep_lock.acquire(blocking=False):
+            try:
+                self._last_sweep = now
+                self.sweep_disk()
+            finally:
+                self._sweep_lock.release()
+
+    def sweep_disk(self) -> int:
+        """Delete expired files, then the oldest beyond max_disk_entries; returns files deleted."""
+        if self.disk_dir is None:
+            return 0
+        files = []
+        for path in self.disk_dir.glob('*/*.json'):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                pass  # removed by another process
+        files.sort()
+
+        cutoff = time.time() - self.ttl_seconds
+        expired = sum(1 for mtime, _ in files if mtime < cutoff)
+        excess = max(0, len(files) - expired - self.max_disk_entries)
+        doomed = files[:expired + excess]
+        for _, path in doomed:
+            path.unlink(missing_ok=True)
+        return len(doomed)
+
+    def get(self, key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        value = self._read_disk(key) if self.disk_dir is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, now)
+        return value
+
+    def _store(self, key, value, now):
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Dict):
+        """Store a JSON-serialisable result."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        if self.disk_dir is not None:
+            self._write_disk(key, value)
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'disk': str(self.disk_dir) if self.disk_dir else None,
+            'max_disk_entries': self.max_disk_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,269 @@
+"""
+Asynchronous job queue for slow analyses (handwriting images).
+
+Submitting a job spools the payload to disk, records it in SQLite and
+returns a job id immediately. Background asyncio workers take jobs in
+submission order and run the handler. Clients poll the job by id.
+
+SQLite is the local stand-in for an external broker. Jobs survive a
+restart: anything still queued or running at startup is requeued. SQLite
+and spool-file I/O block, so the public coroutines run them in a thread
+instead of on the event loop.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from serving.workers import PoolSaturated, WorkerCrashed
+
+DEFAULT_JOBS_DIR = Path(__file__).resolve().parents[1] / 'jobs'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# Why a job failed, so clients can tell a bad input from a server fault:
+# only UNREADABLE is the caller's problem; the others are worth a retry
+UNREADABLE = 'unreadable'
+WORKER_CRASHED = 'worker_crashed'
+INTERNAL_ERROR = 'internal_error'
+
+
+class QueueFull(Exception):
+    """Too many jobs are waiting; the client should retry later."""
+
+
+class JobQueue:
+    def __init__(self, handler: Callable[[bytes], Awaitable[Dict]], jobs_dir=DEFAULT_JOBS_DIR,
+                 concurrency: int = 2, max_queued: int = 1000, retention_seconds: float = 86400,
+                 retry_delay: float = 0.5):
+        """
+        Args:
+            handler: async callable taking the payload bytes and returning a
+                JSON-serialisable result. ValueError marks the job failed
+                as UNREADABLE with that message, WorkerCrashed as
+                WORKER_CRASHED and anything else as INTERNAL_ERROR;
+                PoolSaturated retries after retry_delay.
+            jobs_dir: Holds jobs.sqlite3 and the spooled payloads
+            concurrency: Number of background workers
+            max_queued: Submissions beyond this many queued jobs raise QueueFull
+            retention_seconds: Finished jobs older than this are purged
+        """
+        self.handler = handler
+        self.jobs_dir = Path(jobs_dir)
+        self.spool_dir = self.jobs_dir / 'spool'
+        self.concurrency = max(1, int(concurrency))
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.retry_delay = retry_delay
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._pending = None
+        self._workers = []
+
+    @classmethod
+    def from_env(cls, handler, concurrency: int = 2):
+        """JOBS_DIR, JOB_MAX_QUEUED and JOB_RETENTION_SECONDS override the defaults."""
+        return cls(
+            handler,
+            jobs_dir=os.getenv('JOBS_DIR', DEFAULT_JOBS_DIR),
+            concurrency=concurrency,
+            max_queued=int(os.getenv('JOB_MAX_QUEUED', 1000)),
+            retention_seconds=float(os.getenv('JOB_RETENTION_SECONDS', 86400)),
+        )
+
+    # -- storage -----------------------------------------------------------
+
+    def _connect(self):
+        if self._db is None:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.jobs_dir / 'jobs.sqlite3', check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    meta TEXT,
+                    result TEXT,
+                    error TEXT,
+                    error_code TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            # Databases created before error_code existed
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(jobs)')}
+            if 'error_code' not in columns:
+                self._db.execute('ALTER TABLE jobs ADD COLUMN error_code TEXT')
+            self._db.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)')
+            self._db.commit()
+        return self._db
+
+    def _execute(self, sql, params=()):
+        with self._db_lock:
+            db = self._connect()
+            rows = db.execute(sql, params).fetchall()
+            db.commit()
+            return rows
+
+    def _spool_path(self, job_id):
+        return self.spool_dir / f"{job_id}.bin"
+
+    def _set_status(self, job_id, status, result=None, error=None, error_code=None):
+        now = time.time()
+        if status == RUNNING:
+            self._execute('UPDATE jobs SET status = ?, started_at = ? WHERE id = ?', (status, now, job_id))
+        else:
+            self._execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, error_code = ?, finished_at = ? WHERE id = ?',
+                (status, json.dumps(result) if result is not None else None, error, error_code, now, job_id)
+            )
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.retention_seconds
+        self._execute(
+            'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?', (COMPLETED, FAILED, cutoff)
+        )
+
+    # -- public API --------------------------------------------------------
+
+    async def submit(self, kind: str, data: bytes, meta: Optional[Dict] = None) -> Dict:
+        """
+        Spool the payload and enqueue it.
+
+        Raises:
+            QueueFull: if max_queued jobs are already waiting
+        """
+        if self._pending is not None and self._pending.qsize() >= self.max_queued:
+            raise QueueFull(f"{self._pending.qsize()} jobs queued (limit {self.max_queued})")
+
+        job_id = uuid.uuid4().hex
+        job = await asyncio.to_thread(self._store, job_id, kind, data, meta)
+        if self._pending is not None:
+            self._pending.put_nowait(job_id)
+        return job
+
+    def _store(self, job_id, kind, data, meta):
+        self._connect()
+        tmp_path = self._spool_path(job_id).with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._spool_path(job_id))
+
+        self._execute(
+            'INSERT INTO jobs (id, kind, status, meta, created_at) VALUES (?, ?, ?, ?, ?)',
+            (job_id, kind, QUEUED, json.dumps(meta or {}), time.time())
+        )
+        return self._get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    def _get(self, job_id):
+        rows = self._execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        if not rows:
+            return None
+        row = dict(rows[0])
+        row['meta'] = json.loads(row['meta']) if row['meta'] else {}
+        row['result'] = json.loads(row['result']) if row['result'] else None
+        return row
+
+    async def stats(self) -> Dict:
+        return await asyncio.to_thread(self._stats)
+
+    def _stats(self):
+        counts = dict(self._execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+        return {
+            'workers': self.concurrency,
+            'queued': counts.get(QUEUED, 0),
+            'running': counts.get(RUNNING, 0),
+            'completed': counts.get(COMPLETED, 0),
+            'failed': counts.get(FAILED, 0),
+        }
+
+    # -- workers -----------------------------------------------------------
+
+    async def _run_job(self, job_id):
+        path = self._spool_path(job_id)
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            await asyncio.to_thread(
+                self._set_status, job_id, FAILED, error='Job payload missing', error_code=INTERNAL_ERROR
+            )
+            return
+
+        await asyncio.to_thread(self._set_status, job_id, RUNNING)
+        while True:
+            try:
+                result = await self.handler(data)
+                await asyncio.to_thread(self._set_status, job_id, COMPLETED, result=result)
+                break
+            except PoolSaturated:
+                # Synchronous requests are using the CPU pool; wait our turn
+                await asyncio.sleep(self.retry_delay)
+            except ValueError as e:
+                await asyncio.to_thread(self._set_status, job_id, FAILED, error=str(e), error_code=UNREADABLE)
+                break
+            except WorkerCrashed as e:
+                await asyncio.to_thread(self._set_status, job_id, FAILED, error=str(e), error_code=WORKER_CRASHED)
+                break
+            except Exception as e:
+                await asyncio.to_thread(
+                    self._set_status, job_id, FAILED, error=f"{type(e).__name__}: {e}", error_code=INTERNAL_ERROR
+                )
+                break
+
+        await asyncio.to_thread(self._finish, path)
+
+    def _finish(self, path):
+        path.unlink(missing_ok=True)
+        self._purge_expired()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._pending.get()
+            try:
+                await self._run_job(job_id)
+            finally:
+                self._pending.task_done()
+
+    async def start(self):
+        """Requeue unfinished jobs from a previous run and start the workers."""
+        self._pending = asyncio.Queue()
+        for job_id in await asyncio.to_thread(self._requeue_unfinished):
+            self._pending.put_nowait(job_id)
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def _requeue_unfinished(self):
+        # Anything left running was interrupted by a restart
+        self._execute('UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?', (QUEUED, RUNNING))
+        rows = self._execute('SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (QUEUED,))
+        return [job_id for (job_id,) in rows]
+
+    async def stop(self):
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,216 @@
+"""
+Model registry with lazy/eager loading and hot reload.
+
+Each model is registered with a `locate` callable (returns the path of the
+newest artifact, or None) and a `load` callable (path -> model). A
+background watcher re-runs `locate` periodically; when the path or its
+mtime changes the new version is loaded off the event loop and swapped in
+with a single reference assignment of the (model, version) pair, so a
+reader never sees a new model with an old version or vice versa. Requests
+that already hold the old model finish with it, so uvicorn never needs a
+restart.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+def file_version(path: Path) -> str:
+    """`<name>_v<version>.<ext>` -> version, otherwise the file's mtime."""
+    stem = path.stem
+    if '_v' in stem:
+        return stem.rsplit('_v', 1)[1]
+    return datetime.fromtimestamp(path.stat().st_mtime).strftime('%Y%m%d-%H%M%S')
+
+
+class ModelNotAvailable(Exception):
+    """Raised when a model has no artifact or failed to load."""
+
+
+class ModelEntry:
+    def __init__(self, name: str, locate: Callable[[], Optional[Path]], load: Callable[[Path], object],
+                 version_of: Callable[[object, Path], str] = None, required: bool = True):
+        self.name = name
+        self.locate = locate
+        self.load = load
+        self.version_of = version_of or (lambda model, path: file_version(path))
+        # Optional models have a built-in fallback and don't affect health
+        self.required = required
+
+        # (model, version), replaced as a whole on reload
+        self.snapshot = None
+        self.path = None
+        self.mtime = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.error = None
+        self.missing = False
+        # monotonic time of the last locate() that found nothing
+        self.missing_since_check = None
+        self.failed_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def model(self):
+        snapshot = self.snapshot
+        return snapshot[0] if snapshot else None
+
+    @property
+    def version(self):
+        snapshot = self.snapshot
+        return snapshot[1] if snapshot else None
+
+    @property
+    def state(self):
+        if self.model is not None:
+            return 'loaded'
+        if self.missing:
+            return 'missing'
+        if self.error is not None:
+            return 'failed'
+        return 'not_loaded'
+
+    def status(self) -> Dict:
+        return {
+            'state': self.state,
+            'required': self.required,
+            'version': self.version,
+            'path': str(self.path) if self.path else None,
+            'loaded_at': self.loaded_at,
+            'load_seconds': round(self.load_seconds, 4) if self.load_seconds is not None else None,
+            'error': self.error,
+        }
+
+
+class ModelRegistry:
+    def __init__(self, eager: bool = True, watch_interval: float = 10.0, missing_retry: float = 5.0):
+        """
+        Args:
+            missing_retry: seconds a model found missing is reported missing
+                without looking again, so optional models that have no
+                artifact (fusion) don't glob the directory under a lock on
+                every request
+        """
+        self.eager = eager
+        self.watch_interval = watch_interval
+        self.missing_retry = missing_retry
+        self.entries: Dict[str, ModelEntry] = {}
+        self._watch_task = None
+
+    @classmethod
+    def from_env(cls):
+        """MODEL_LOADING=eager|lazy, MODEL_WATCH_INTERVAL seconds (0 disables), MODEL_MISSING_RETRY seconds."""
+        return cls(
+            eager=os.environ.get('MODEL_LOADING', 'eager').lower() != 'lazy',
+            watch_interval=float(os.environ.get('MODEL_WATCH_INTERVAL', 10)),
+            missing_retry=float(os.environ.get('MODEL_MISSING_RETRY', 5)),
+        )
+
+    def register(self, name, locate, load, version_of=None, required=True):
+        self.entries[name] = ModelEntry(name, locate, load, version_of, required)
+
+    def _load(self, entry: ModelEntry, force: bool = False) -> bool:
+        """Load the newest artifact if it differs from the current one. Returns True on swap."""
+        with entry.lock:
+            path = entry.locate()
+            if path is None or not Path(path).exists():
+                entry.missing = entry.model is None
+                if entry.missing:
+                    entry.error = 'No model artifact found'
+                    entry.missing_since_check = time.monotonic()
+                return False
+
+            entry.missing = False
+            entry.missing_since_check = None
+            path = Path(path)
+            mtime = path.stat().st_mtime
+            if not force and entry.model is not None and path == entry.path and mtime == entry.mtime:
+                return False
+            # Don't retry a broken artifact every watch tick
+            if not force and entry.failed_at == (path, mtime):
+                return False
+
+            start = time.perf_counter()
+            try:
+                model = entry.load(path)
+            except Exception as e:
+                # Keep serving the previous version if a new one is broken
+                entry.error = f"{type(e).__name__}: {e}"
+                entry.failed_at = (path, mtime)
+                print(f"Warning: failed to load {entry.name} from {path}: {entry.error}")
+                return False
+
+            entry.load_seconds = time.perf_counter() - start
+            version = entry.version_of(model, path)
+            entry.path, entry.mtime = path, mtime
+            entry.loaded_at = datetime.now().isoformat(timespec='seconds')
+            entry.error = None
+            entry.failed_at = None
+            # Single reference swap; in-flight requests keep the old object
+            entry.snapshot = (model, version)
+            print(f"✓ Loaded {entry.name} v{entry.version} in {entry.load_seconds:.2f}s")
+            return True
+
+    def get(self, name: str):
+        """Model for `name`, loading it on first use."""
+        return self.get_versioned(name)[0]
+
+    def get_versioned(self, name: str):
+        """
+        (model, version) for `name` from one snapshot, loading it on first
+        use. Use this when the version keys anything derived from the
+        model's output (e.g. cached results), so a concurrent reload can't
+        pair one version's scores with the other's version.
+        """
+        entry = self.entries[name]
+        snapshot = entry.snapshot
+        checked = entry.missing_since_check
+        if snapshot is None and checked is not None and time.monotonic() - checked < self.missing_retry:
+            # Known missing: answer without the lock or a directory scan
+            raise ModelNotAvailable(f"{name} model is not loaded: {entry.error}")
+        if snapshot is None:
+            self._load(entry)
+            snapshot = entry.snapshot
+        if snapshot is None:
+            raise ModelNotAvailable(f"{name} model is not loaded: {entry.error}")
+        return snapshot
+
+    def entry(self, name: str) -> ModelEntry:
+        return self.entries[name]
+
+    def load_all(self):
+        for entry in self.entries.values():
+            self._load(entry)
+
+    def refresh(self):
+        """Pick up new artifact versions for already-loaded (or eager) models."""
+        for entry in self.entries.values():
+            if entry.model is not None or self.eager:
+                self._load(entry)
+
+    def status(self) -> Dict:
+        return {name: entry.status() for name, entry in self.entries.items()}
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"Warning: model refresh failed: {e}")
+
+    async def start(self):
+        if self.eager:
+            await asyncio.to_thread(self.load_all)
+        if self.watch_interval > 0:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
@@ -0,0 +1,185 @@
+"""
+Cold-start profiling for the ML API.
+
+Two views of startup cost:
+
+* In-process: main.py marks how long its own imports and the startup
+  event took, and /health lists which heavy frameworks have been imported
+  so far. Model loaders import joblib/sklearn (and the handwriting workers
+  import OpenCV) on first use, so a fresh process should show none of them
+  until MODEL_LOADING=eager loads the models or a request arrives.
+* Offline report: `python -m serving.startup` imports a module in a fresh
+  interpreter under `-X importtime` and breaks the time down per module and
+  per top-level package, flagging heavy frameworks and the first-party
+  module that pulled each one in:
+
+    python -m serving.startup                  # import main
+    python -m serving.startup --module keystroke.model --top 15
+    python -m serving.startup --json > startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ML_MODELS_DIR = Path(__file__).resolve().parent.parent
+
+# Frameworks whose import alone costs hundreds of ms to tens of seconds
+HEAVY_MODULES = (
+    'cv2', 'sklearn', 'joblib', 'scipy', 'pandas', 'onnxruntime',
+    'tensorflow', 'torch', 'ultralytics', 'shap', 'lime', 'matplotlib',
+)
+FIRST_PARTY = ('main', 'keystroke', 'reading', 'fusion', 'handwriting', 'serving')
+
+
+def loaded_heavy_modules() -> List[str]:
+    """Heavy frameworks already imported into this process."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+class StartupProfile:
+    """Named phase durations recorded once while the process starts."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str, started: float):
+        """Record the time since `started` (a perf_counter value) for `phase`."""
+        self.phases[phase] = round(time.perf_counter() - started, 4)
+
+    def stats(self) -> Dict:
+        return {
+            "phases_s": dict(self.phases),
+            "heavy_modules_loaded": loaded_heavy_modules()
+        }
+
+
+def parse_importtime(output: str) -> List[Dict]:
+    """
+    Rows of `-X importtime` output as dicts with module, depth, self_us,
+    cumulative_us and the nearest first-party importer (None if the module
+    was imported directly or only by third-party code).
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+
+    # Children are printed before their parent, so walk backwards to see
+    # each parent first and keep the chain of ancestors on a stack
+    ancestors: List[str] = []
+    for row in reversed(rows):
+        del ancestors[row["depth"]:]
+        importer = None
+        for parent in reversed(ancestors):
+            if parent.split('.')[0] in FIRST_PARTY:
+                importer = parent
+                break
+        row["imported_by"] = importer
+        ancestors.append(row["module"])
+    return rows
+
+
+def summarize(rows: List[Dict], top: int = 20) -> Dict:
+    """Totals, slowest modules, per-package self time and heavy frameworks."""
+    packages: Dict[str, int] = {}
+    for row in rows:
+        package = row["module"].split('.')[0]
+        packages[package] = packages.get(package, 0) + row["self_us"]
+
+    heavy = {}
+    for row in rows:
+        package = row["module"].split('.')[0]
+        if package in HEAVY_MODULES and row["module"] == package:
+            heavy[package] = {
+                "import_s": round(row["cumulative_us"] / 1e6, 4),
+                "imported_by": row["imported_by"]
+            }
+
+    total_us = sum(row["self_us"] for row in rows)
+    return {
+        "total_import_s": round(total_us / 1e6, 4),
+        "modules": len(rows),
+        "slowest_modules": [
+            {"module": row["module"], "self_s": round(row["self_us"] / 1e6, 4),
+             "cumulative_s": round(row["cumulative_us"] / 1e6, 4)}
+            for row in sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+        ],
+        "packages": [
+            {"package": name, "self_s": round(us / 1e6, 4),
+             "share": round(us / total_us, 4) if total_us else 0.0}
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        "heavy_modules": heavy
+    }
+
+
+def profile_imports(module: str = 'main', cwd: Optional[Path] = None) -> Dict:
+    """Import `module` in a fresh interpreter and summarize where the time went."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd or ML_MODELS_DIR, capture_output=True, text=True
+    )
+    wall_s = time.perf_counter() - started
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"import {module} failed:\n" + '\n'.join(errors[-20:]))
+    return {"module": module, "wall_s": round(wall_s, 4), "rows": parse_importtime(result.stderr)}
+
+
+def print_report(module: str, wall_s: float, summary: Dict):
+    print(f"Cold import of '{module}': {wall_s:.2f}s wall, "
+          f"{summary['total_import_s']:.2f}s in {summary['modules']} module imports")
+
+    print("\nBy top-level package (self time):")
+    for item in summary["packages"]:
+        print(f"  {item['package']:<28} {item['self_s']:>8.3f}s  {item['share'] * 100:5.1f}%")
+
+    print("\nSlowest imports (cumulative):")
+    for item in summary["slowest_modules"]:
+        print(f"  {item['module']:<48} {item['cumulative_s']:>8.3f}s  (self {item['self_s']:.3f}s)")
+
+    heavy = summary["heavy_modules"]
+    if heavy:
+        print("\nWarning: heavy frameworks imported at startup:")
+        for name, item in heavy.items():
+            source = item["imported_by"] or "imported directly"
+            print(f"  {name:<14} {item['import_s']:>8.3f}s  via {source}")
+    else:
+        print("\n✓ No heavy frameworks imported at startup")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Break down the import time of the ML API')
+    parser.add_argument('--module', default='main', help='Module to import (default: main)')
+    parser.add_argument('--top', type=int, default=20, help='Rows per table')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(args.module)
+    summary = summarize(profile["rows"], args.top)
+    if args.json:
+        print(json.dumps({"module": args.module, "wall_s": profile["wall_s"], **summary}, indent=2))
+    else:
+        print_report(args.module, profile["wall_s"], summary)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Bounded process pool for CPU-heavy work (handwriting image analysis).
+
+The pool admits at most `max_workers + max_pending` jobs at once. Anything
+beyond that is rejected immediately with PoolSaturated instead of queueing
+without limit, so the API can answer 429 and the caller can retry later.
+
+If a worker process dies (e.g. killed for memory on a huge image) the
+executor is broken for good, so it is dropped and a fresh one is created
+on the next call; the requests that were on it fail with WorkerCrashed.
+An executor that is broken or shut down by the time a job is submitted
+to it is replaced the same way and the submit is retried once.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class PoolSaturated(Exception):
+    """All workers are busy and the pending queue is full."""
+
+
+class WorkerCrashed(Exception):
+    """A worker process died while the job was running; the pool was reset."""
+
+
+class BoundedProcessPool:
+    def __init__(self, max_workers: int = 2, max_pending: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(0, int(max_pending))
+        self._capacity = self.max_workers + self.max_pending
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @classmethod
+    def from_env(cls, prefix: str):
+        """<prefix>_WORKERS (default: half the CPUs) and <prefix>_MAX_PENDING (default: 2x workers)."""
+        workers = int(os.getenv(f'{prefix}_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+        pending = int(os.getenv(f'{prefix}_MAX_PENDING', 2 * workers))
+        return cls(workers, pending)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self._capacity:
+                raise PoolSaturated(f"{self._in_flight} jobs in flight (limit {self._capacity})")
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard(self, executor):
+        """Drop a broken executor unless another caller already replaced it."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        """
+        Run fn(*args) in a worker process.
+
+        Raises:
+            PoolSaturated: if the pool is already at capacity
+            WorkerCrashed: if a worker process died during the call
+        """
+        self._acquire()
+        try:
+            executor, future = self._submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Free the slot when the process is done, not when the caller stops
+        # waiting: a cancelled request (client gone, timeout) keeps running
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            self._discard(executor)
+            raise WorkerCrashed(f"Worker process died: {e}") from e
+
+    def _submit(self, fn, *args):
+        """
+        (executor, future). Another caller may break the executor, or
+        shutdown() may close it, between start() and submit(); submit then
+        raises BrokenProcessPool or RuntimeError('cannot schedule new
+        futures after shutdown'). Replace it and try once more.
+        """
+        for attempt in range(2):
+            executor = self.start()
+            try:
+                return executor, executor.submit(fn, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._discard(executor)
+                if attempt:
+                    raise WorkerCrashed(f"Worker pool unavailable: {e}") from e
+
+    def stats(self):
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'in_flight': self._in_flight,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,97 @@
+"""
+Shared fixtures for the ML service tests.
+
+Models are fitted on small synthetic data, and the API is configured
+through the same environment variables as in production: lazy loading,
+no watcher, no cache, and every artifact/job directory under tmp.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ML_MODELS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ML_MODELS_DIR))
+
+
+def keystroke_features(rng, n, scale=1.0):
+    """Rows of the six IsolationForest inputs around typical CMU timings."""
+    avg_hold = rng.normal(100, 15, n) * scale
+    std_hold = rng.normal(25, 5, n) * scale
+    avg_flight = rng.normal(250, 50, n) * scale
+    std_flight = rng.normal(80, 20, n) * scale
+    return np.column_stack([
+        avg_hold, std_hold, std_hold / avg_hold * 100,
+        avg_flight, std_flight, std_flight / avg_flight * 100,
+    ])
+
+
+@pytest.fixture(scope='session')
+def keystroke_model():
+    from sklearn.ensemble import IsolationForest
+
+    rng = np.random.default_rng(0)
+    return IsolationForest(n_estimators=50, contamination=0.1, random_state=42).fit(
+        keystroke_features(rng, 1000)
+    )
+
+
+@pytest.fixture(scope='session')
+def reading_artifact_payload():
+    """Payload in the analysis/model_export.py layout, fitted on MAPPED_FEATURES."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+    from reading.features import MAPPED_FEATURES, map_reading_metrics
+
+    rng = np.random.default_rng(1)
+    payloads = [
+        {'totalReadingTime': t, 'totalRevisits': r, 'averagePauseDuration': p}
+        for t, r, p in zip(rng.normal(90_000, 30_000, 200).clip(10_000),
+                           rng.poisson(6, 200), rng.normal(700, 150, 200).clip(100))
+    ]
+    mapped = map_reading_metrics(payloads)
+    X = np.column_stack([mapped[name] for name in MAPPED_FEATURES])
+    y = (X[:, MAPPED_FEATURES.index('dwell_time_trial')] > 90_000).astype(int)
+    scaler = StandardScaler().fit(X)
+    return {
+        'format_version': 1,
+        'name': 'reading_classifier',
+        'version': '20260101-000000',
+        'model_type': 'LogisticRegression',
+        'feature_names': list(MAPPED_FEATURES),
+        'scaler': scaler,
+        'model': LogisticRegression().fit(scaler.transform(X), y),
+        'metrics': {},
+        'proxy_constants': {},
+    }
+
+
+@pytest.fixture(scope='session')
+def client(tmp_path_factory, keystroke_model, reading_artifact_payload):
+    """TestClient for main.app with synthetic keystroke and reading models."""
+    import joblib
+
+    root = tmp_path_factory.mktemp('service')
+    saved = root / 'saved_models'
+    saved.mkdir()
+    joblib.dump(keystroke_model, saved / 'keystroke_anomaly_v20260101-000000.joblib')
+    joblib.dump(reading_artifact_payload, saved / 'reading_classifier_v20260101-000000.joblib')
+
+    os.environ.update({
+        'SAVED_MODELS_DIR': str(saved),
+        'MODEL_LOADING': 'lazy',
+        'MODEL_WATCH_INTERVAL': '0',
+        'INFERENCE_CACHE_SIZE': '0',
+        'JOBS_DIR': str(root / 'jobs'),
+        'HANDWRITING_WORKERS': '1',
+    })
+    os.environ.pop('KEYSTROKE_MODEL_PATH', None)
+
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,30 @@
+import json
+from datetime import datetime
+
+import joblib
+import pytest
+
+from serving.artifacts import new_version, publish_artifact
+
+
+def test_versions_in_the_same_second_differ_and_sort_in_order():
+    first = new_version(datetime(2026, 1, 1, 12, 0, 0, 1000))
+    second = new_version(datetime(2026, 1, 1, 12, 0, 0, 2000))
+    assert first != second and sorted([second, first]) == [first, second]
+
+
+def test_publishes_artifact_and_sidecar(tmp_path):
+    path = publish_artifact(tmp_path, 'model', 'v1', {'weights': [1, 2]}, {'version': 'v1'})
+    assert path.name == 'model_vv1.joblib'
+    assert joblib.load(path) == {'weights': [1, 2]}
+    assert json.loads((tmp_path / 'model_vv1.json').read_text()) == {'version': 'v1'}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['model_vv1.joblib', 'model_vv1.json']
+
+
+def test_refuses_to_overwrite_a_version(tmp_path):
+    publish_artifact(tmp_path, 'model', '1', 'first', {'n': 1})
+    with pytest.raises(FileExistsError):
+        publish_artifact(tmp_path, 'model', '1', 'second', {'n': 2})
+    assert joblib.load(tmp_path / 'model_v1.joblib') == 'first'
+    assert json.loads((tmp_path / 'model_v1.json').read_text()) == {'n': 1}
+    assert not list(tmp_path.glob('*.tmp'))
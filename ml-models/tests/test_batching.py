@@ -0,0 +1,105 @@
+import asyncio
+import gc
+
+from serving.batching import MicroBatcher
+
+
+def test_coalesces_concurrent_items_into_one_call():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(double, max_batch_size=8, max_latency_ms=20)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5))), batcher
+
+    results, batcher = asyncio.run(scenario())
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()['mean_batch_size'] == 5
+
+
+def test_flushes_when_the_batch_is_full():
+    calls = []
+
+    def identity(items):
+        calls.append(len(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(identity, max_batch_size=2, max_latency_ms=1000)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 3]
+    assert calls == [2, 2]
+
+
+def test_a_bad_item_fails_alone():
+    def strict(items):
+        if any(item < 0 for item in items):
+            raise ValueError('negative')
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(strict, max_latency_ms=10)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(-1), batcher.submit(2), return_exceptions=True
+        )
+
+    ok, bad, other = asyncio.run(scenario())
+    assert (ok, other) == (1, 2)
+    assert isinstance(bad, ValueError)
+
+
+def test_batches_survive_garbage_collection():
+    def slow(items):
+        import time
+        time.sleep(0.05)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(slow, max_latency_ms=1)
+        pending = asyncio.ensure_future(batcher.submit('x'))
+        await asyncio.sleep(0.01)
+        assert len(batcher._tasks) == 1
+        gc.collect()
+        result = await asyncio.wait_for(pending, 1)
+        return result, batcher
+
+    result, batcher = asyncio.run(scenario())
+    assert result == 'x'
+    assert not batcher._tasks
+
+
+def test_close_flushes_and_waits_for_in_flight_batches():
+    def identity(items):
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(identity, max_latency_ms=10_000)
+        pending = asyncio.ensure_future(batcher.submit('x'))
+        await asyncio.sleep(0)
+        await batcher.close()
+        assert pending.done()
+        return pending.result(), batcher
+
+    result, batcher = asyncio.run(scenario())
+    assert result == 'x'
+    assert batcher.stats()['pending'] == 0 and not batcher._tasks
+
+
+def test_zero_latency_skips_batching():
+    calls = []
+
+    def identity(items):
+        calls.append(len(items))
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(identity, max_latency_ms=0)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+    assert asyncio.run(scenario()) == [1, 2]
+    assert calls == [1, 1]
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+
+from serving.cache import InferenceCache, content_key
+
+
+def test_key_depends_on_model_version_and_payload():
+    features = np.array([1.0, 2.0, 3.0])
+    key = content_key('keystroke', 'v1', features)
+    assert key == content_key('keystroke', 'v1', features.copy())
+    assert key != content_key('keystroke', 'v2', features)
+    assert key != content_key('reading', 'v1', features)
+    assert key != content_key('keystroke', 'v1', features + 1)
+
+
+def test_evicts_least_recently_used():
+    cache = InferenceCache(max_entries=2)
+    cache.set('a', {'v': 1})
+    cache.set('b', {'v': 2})
+    assert cache.get('a') == {'v': 1}
+    cache.set('c', {'v': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+    assert cache.get('c') == {'v': 3}
+    assert cache.stats()['entries'] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    import serving.cache as cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    cache = InferenceCache(ttl_seconds=10)
+    cache.set('a', {'v': 1})
+
+    now[0] += 9
+    assert cache.get('a') == {'v': 1}
+    now[0] += 2
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_disabled_cache_stores_nothing():
+    cache = InferenceCache(max_entries=0)
+    cache.set('a', {'v': 1})
+    assert cache.get('a') is None
+
+
+def test_disk_tier_is_shared_and_survives_restarts(tmp_path):
+    InferenceCache(disk_dir=tmp_path).set('ab' * 32, {'v': 1})
+
+    fresh = InferenceCache(disk_dir=tmp_path)
+    assert fresh.get('ab' * 32) == {'v': 1}
+    assert fresh.stats()['hits'] == 1
+
+
+def test_disk_tier_drops_expired_files(tmp_path):
+    InferenceCache(disk_dir=tmp_path).set('cd' * 32, {'v': 1})
+
+    expired = InferenceCache(disk_dir=tmp_path, ttl_seconds=-1)
+    assert expired.get('cd' * 32) is None
+    assert not list(tmp_path.rglob('*.json'))
+
+
+def test_disk_sweep_drops_expired_and_oldest_files(tmp_path):
+    cache = InferenceCache(disk_dir=tmp_path, ttl_seconds=100, max_disk_entries=2, sweep_interval=3600)
+    keys = [f"{i:02d}" * 32 for i in range(5)]
+    for key in keys:
+        cache.set(key, {'key': key})
+    paths = [cache._disk_path(key) for key in keys]
+    # 0 expired; 1..4 written in order
+    now = time.time()
+    for age, path in zip([500, 40, 30, 20, 10], paths):
+        os.utime(path, (now - age, now - age))
+
+    assert cache.sweep_disk() == 3
+    assert [path.exists() for path in paths] == [False, False, False, True, True]
+
+
+def test_writes_sweep_the_disk_tier_at_most_once_per_interval(tmp_path, monkeypatch):
+    import serving.cache as cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    cache = InferenceCache(disk_dir=tmp_path, max_disk_entries=1, sweep_interval=60)
+    for i in range(3):
+        cache.set(f"{i:02d}" * 32, {'v': i})
+    # The first write swept an almost empty directory; the next two overshoot until the next sweep
+    assert len(list(tmp_path.rglob('*.json'))) == 3
+
+    now[0] += 61
+    cache.set('ff' * 32, {'v': 3})
+    assert len(list(tmp_path.rglob('*.json'))) == 1
+
+
+def test_handwriting_cache_hit_reports_its_own_processing_time(client, monkeypatch):
+    import main
+
+    calls = []
+
+    async def slow_pool_run(fn, data):
+        calls.append(data)
+        return {'risk_score': 0.2, 'processing_time_ms': 5000.0}
+
+    monkeypatch.setattr(main, 'inference_cache', InferenceCache())
+    monkeypatch.setattr(main.handwriting_pool, 'run', slow_pool_run)
+
+    first = asyncio.run(main.run_handwriting_analysis(b'image'))
+    second = asyncio.run(main.run_handwriting_analysis(b'image'))
+
+    assert len(calls) == 1
+    assert first['processing_time_ms'] == 5000.0
+    assert second['risk_score'] == 0.2
+    assert second['processing_time_ms'] < 5000.0
+    # The stored result keeps the original timing for later hits
+    assert main.inference_cache.get(content_key('handwriting', main.PIPELINE_VERSION, b'image'))[
+        'processing_time_ms'] == 5000.0
+
+
+def test_handwriting_hashing_and_cache_io_run_off_the_event_loop(client, monkeypatch):
+    import main
+
+    on_loop_thread = []
+
+    class RecordingCache(InferenceCache):
+        def get(self, key):
+            on_loop_thread.append(threading.current_thread() is threading.main_thread())
+            return super().get(key)
+
+        def set(self, key, value):
+            on_loop_thread.append(threading.current_thread() is threading.main_thread())
+            super().set(key, value)
+
+    async def pool_run(fn, data):
+        return {'risk_score': 0.2, 'processing_time_ms': 1.0}
+
+    def recording_key(*args):
+        on_loop_thread.append(threading.current_thread() is threading.main_thread())
+        return content_key(*args)
+
+    monkeypatch.setattr(main, 'inference_cache', RecordingCache())
+    monkeypatch.setattr(main, 'content_key', recording_key)
+    monkeypatch.setattr(main.handwriting_pool, 'run', pool_run)
+
+    asyncio.run(main.run_handwriting_analysis(b'image'))
+    assert len(on_loop_thread) == 3 and not any(on_loop_thread)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from fusion.model import DEFAULT_FUSION, FEATURE_NAMES, WeightedFusion, build_design_matrix, load_fusion_model, risk_levels
+from fusion.train import export_fusion_artifact, train_fusion_model
+
+
+def test_weighted_fusion_renormalises_over_present_modalities():
+    scores = np.array([[0.8, 0.2, 0.0], [0.8, 0.2, 0.5]])
+    confidences = np.ones((2, 3))
+    present = np.array([[True, True, False], [True, True, True]])
+
+    risk, confidence = WeightedFusion().predict(scores, confidences, present)
+
+    assert risk[0] == pytest.approx((0.4 * 0.8 + 0.3 * 0.2) / 0.7)
+    assert risk[1] == pytest.approx(0.4 * 0.8 + 0.3 * 0.2 + 0.3 * 0.5)
+    # Missing modalities lower the fused confidence
+    assert confidence[0] == pytest.approx(0.7)
+    assert confidence[1] == pytest.approx(1.0)
+
+
+def test_every_item_needs_a_module():
+    with pytest.raises(ValueError):
+        DEFAULT_FUSION.predict(np.zeros((1, 3)), np.ones((1, 3)), np.zeros((1, 3), bool))
+
+
+def test_absent_modalities_only_contribute_their_presence_flag():
+    design = build_design_matrix([[0.9, 0.7, 0.3]], [[1, 1, 1]], [[True, False, True]])
+    row = dict(zip(FEATURE_NAMES, design[0]))
+    assert row['keystroke_score'] == row['keystroke_weighted_score'] == row['keystroke_present'] == 0
+    assert row['handwriting_score'] == pytest.approx(0.4)
+    assert row['reading_present'] == 1
+
+
+def test_risk_levels_use_cutoffs():
+    assert list(risk_levels(np.array([0.1, 0.3, 0.59, 0.6]))) == ['Low', 'Medium', 'Medium', 'High']
+
+
+def test_trained_artifact_round_trips(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 200
+    labels = rng.integers(0, 2, n)
+    scores = np.clip(0.3 + 0.4 * labels[:, None] + rng.normal(0, 0.15, (n, 3)), 0, 1)
+    present = rng.random((n, 3)) > 0.2
+    present[:, 0] = True
+    confidences = np.ones((n, 3))
+
+    model, metrics = train_fusion_model(scores, confidences, present, labels)
+    path = export_fusion_artifact(model, metrics, output_dir=tmp_path, version='20260101-000000')
+    fusion = load_fusion_model(path)
+
+    risk, _ = fusion.predict(scores, confidences, present)
+    expected = model.predict_proba(build_design_matrix(scores, confidences, present))[:, 1]
+    np.testing.assert_allclose(risk, expected)
+    assert fusion.version == '20260101-000000'
+    assert metrics['cv_roc_auc'] > 0.8
+
+
+def test_batch_endpoint_handles_missing_modules(client):
+    response = client.post('/api/ml/fusion/calculate_batch', json={'items': [
+        {'handwriting': {'score': 0.9}, 'reading': {'score': 0.8, 'confidence': 0.5}},
+        {'keystroke': {'score': 0.1}},
+    ]})
+    assert response.status_code == 200
+    first, second = response.json()['results']
+    assert first['modalities_used'] == ['handwriting', 'reading']
+    assert first['individual_scores']['keystroke'] is None
+    assert second['risk_level'] == 'Low'
+    assert second['model_version'] == 'weighted-default'
+
+
+def test_batch_endpoint_returns_null_for_items_without_modules(client):
+    response = client.post('/api/ml/fusion/calculate_batch', json={'items': [
+        {}, {'keystroke': {'score': 0.1}}, {},
+    ]})
+    assert response.status_code == 200
+    empty, scored, last = response.json()['results']
+    assert empty is None and last is None
+    assert scored['modalities_used'] == ['keystroke']
+
+    response = client.post('/api/ml/fusion/calculate_batch', json={'items': [{}]})
+    assert response.status_code == 200 and response.json()['results'] == [None]
+
+
+def test_single_endpoint_rejects_no_modules(client):
+    assert client.post('/api/ml/fusion/calculate').status_code == 422
+
+
+def test_out_of_range_scores_are_rejected_not_clipped():
+    with pytest.raises(ValueError, match=r'\[0, 1\]'):
+        DEFAULT_FUSION.predict([[65.0, 0.2, 0.0]], np.ones((1, 3)), [[True, True, False]])
+    # Absent modalities may carry anything; they are zeroed
+    risk, _ = DEFAULT_FUSION.predict([[0.5, 0.5, 99.0]], np.ones((1, 3)), [[True, True, False]])
+    assert risk[0] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize('item', [
+    {'handwriting': {'score': 65}},
+    {'reading': {'score': 0.5, 'confidence': -0.1}},
+])
+def test_batch_endpoint_rejects_out_of_range_values(client, item):
+    response = client.post('/api/ml/fusion/calculate_batch', json={'items': [item]})
+    assert response.status_code == 422
+
+
+def test_single_endpoint_rejects_percentages(client):
+    assert client.post('/api/ml/fusion/calculate?keystroke_score=65').status_code == 422
+    ok = client.post('/api/ml/fusion/calculate?keystroke_score=0.65')
+    assert ok.status_code == 200
+    assert ok.json()['final_risk_score'] == pytest.approx(0.65)
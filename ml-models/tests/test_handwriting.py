@@ -0,0 +1,115 @@
+import cv2
+import numpy as np
+import pytest
+
+from handwriting.pipeline import (
+    MIN_GLYPHS, analyze_image_bytes, binarize, group_lines, segment_glyphs, spacing_irregularity, split_gaps
+)
+
+
+def render(lines, font=cv2.FONT_HERSHEY_SIMPLEX):
+    """Black text on white, one line of text every 120 px."""
+    image = np.full((120 * len(lines) + 60, 1400), 255, np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(image, text, (30, 100 + 120 * i), font, 2, 0, 4)
+    return image
+
+
+def glyph_boxes(image):
+    boxes = segment_glyphs(binarize(image))
+    return boxes, group_lines(boxes)
+
+
+def test_split_gaps_separates_letter_and_word_gaps():
+    letters, words = split_gaps([5, 6, 4, 5, 40, 6, 5, 42])
+    assert sorted(letters) == [4, 5, 5, 5, 6, 6]
+    assert sorted(words) == [40, 42]
+
+
+def test_split_gaps_keeps_one_class_without_word_gaps():
+    letters, words = split_gaps([5, 6, 7, 9, 12])
+    assert len(letters) == 5
+    assert len(words) == 0
+
+
+def test_lines_keep_ascenders_descenders_and_dots():
+    _, line_ids = glyph_boxes(render(['the quick brown fox', 'jumps over the lazy dig']))
+    assert line_ids.max() + 1 == 2
+
+
+def test_uniform_letter_and_word_spacing_is_regular():
+    boxes, line_ids = glyph_boxes(render(['mmmmmm nnnnnn']))
+    assert spacing_irregularity(boxes, line_ids) < 0.1
+
+
+@pytest.mark.parametrize('font', [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX])
+def test_typeset_lines_are_not_flagged_for_spacing(font):
+    result = analyze_image_bytes(render(['the quick brown fox', 'jumps over the lazy dog'], font))
+    assert result['features']['spacing_irregularity'] < 0.33
+    assert 'irregular_spacing' not in [issue['type'] for issue in result['detected_issues']]
+
+
+def test_random_gaps_score_higher_than_regular_ones():
+    rng = np.random.default_rng(0)
+    image = np.full((200, 1800), 255, np.uint8)
+    x = 30
+    for _ in range(20):
+        cv2.putText(image, 'n', (x, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+        x += 40 + int(rng.integers(2, 60))
+    boxes, line_ids = glyph_boxes(image)
+    assert spacing_irregularity(boxes, line_ids) > 0.33
+
+
+@pytest.mark.parametrize('lines', [['bad dog and bird', 'bed bud dab'], ['pq qp dbdb', 'bdbd pqpq']])
+def test_legitimate_b_d_and_p_q_are_not_reversals(lines):
+    result = analyze_image_bytes(render(lines))
+    assert result['reversals_detected'] == 0
+    assert 'letter_reversal' not in [issue['type'] for issue in result['detected_issues']]
+
+
+def compose_letters(lines, mirrored=''):
+    """Letters rendered one by one, flipping those in `mirrored`, one line every 120 px."""
+    rows = []
+    for text in lines:
+        tiles = []
+        for char in text:
+            tile = np.full((120, 100), 255, np.uint8)
+            cv2.putText(tile, char, (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 4)
+            ink = np.flatnonzero((tile < 128).any(axis=0))
+            tile = tile[:, ink[0] - 6:ink[-1] + 7] if len(ink) else tile[:, :60]
+            tiles.append(tile[:, ::-1] if char in mirrored else tile)
+        rows.append(np.hstack(tiles))
+    width = max(row.shape[1] for row in rows) + 60
+    return np.vstack([np.pad(row, ((0, 0), (30, width - 30 - row.shape[1])), constant_values=255) for row in rows])
+
+
+def test_mirrored_letters_are_reversals():
+    lines = ['sick frogs jest', 'crazy creek']
+    normal = analyze_image_bytes(compose_letters(lines))
+    mirrored = analyze_image_bytes(compose_letters(lines, mirrored='sekr'))
+
+    assert normal['reversals_detected'] == 0
+    assert mirrored['reversals_detected'] == sum(char in 'sekr' for char in ''.join(lines))
+    assert mirrored['features']['reversal_count'] == mirrored['reversals_detected']
+    assert mirrored['risk_score'] > normal['risk_score'] + 0.3
+    assert 'letter_reversal' in [issue['type'] for issue in mirrored['detected_issues']]
+
+
+@pytest.mark.parametrize('font', [cv2.FONT_HERSHEY_PLAIN, cv2.FONT_HERSHEY_SCRIPT_SIMPLEX])
+def test_fonts_without_templates_have_no_reversals(font):
+    result = analyze_image_bytes(render(['sphinx of black quartz', 'a zesty jerk fixes cogs'], font))
+    assert result['reversals_detected'] == 0
+
+
+def test_encoded_images_are_decoded():
+    ok, png = cv2.imencode('.png', render(['hello world']))
+    result = analyze_image_bytes(png.tobytes())
+    assert result['features']['glyph_count'] >= MIN_GLYPHS
+    assert 0 <= result['risk_score'] <= 1
+
+
+def test_blank_and_undecodable_images_are_rejected():
+    with pytest.raises(ValueError, match='Not enough handwriting'):
+        analyze_image_bytes(np.full((100, 100), 255, np.uint8))
+    with pytest.raises(ValueError, match='Could not decode'):
+        analyze_image_bytes(b'not an image')
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+from conftest import keystroke_features
+from keystroke.incremental import FeatureStore, population_stability_index, read_feature_rows, retrain
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(tmp_path / 'store')
+
+
+def test_store_reads_windows_across_segments(store):
+    rows = np.arange(60, dtype=np.float32).reshape(10, 6)
+    store.append(rows[:4])
+    store.append(rows[4:])
+
+    assert store.total_rows == 10
+    np.testing.assert_array_equal(store.rows(2, 7), rows[2:7])
+
+    store.compact()
+    assert len(store.manifest['segments']) == 1
+    np.testing.assert_array_equal(FeatureStore(store.root).rows(), rows)
+
+
+def test_psi_detects_a_shift():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(0, 1, 2000)
+    assert population_stability_index(reference, rng.normal(0, 1, 2000)) < 0.05
+    assert population_stability_index(reference, rng.normal(1.5, 1, 2000)) > 0.2
+
+
+def test_retrains_on_drift_and_records_the_watermark(store, tmp_path):
+    rng = np.random.default_rng(1)
+    saved = tmp_path / 'saved'
+    store.append(keystroke_features(rng, 500))
+    first = retrain(store, saved, min_new_rows=100)
+    assert json.loads(first.with_suffix('.json').read_text())['trained_through_row'] == 500
+
+    store.append(keystroke_features(rng, 300))
+    assert retrain(store, saved, min_new_rows=100) is None
+
+    store.append(keystroke_features(rng, 300, scale=2.0))
+    second = retrain(store, saved, mode='warm_start', min_new_rows=100)
+    meta = json.loads(second.with_suffix('.json').read_text())
+    assert meta['mode'] == 'warm_start'
+    assert meta['trained_through_row'] == 1100
+    assert meta['drift_psi'] > meta['drift_threshold']
+
+
+def test_refuses_a_store_smaller_than_the_watermark(store, tmp_path):
+    rng = np.random.default_rng(2)
+    saved = tmp_path / 'saved'
+    store.append(keystroke_features(rng, 400))
+    retrain(store, saved, min_new_rows=100)
+
+    reset = FeatureStore(tmp_path / 'reset_store')
+    reset.append(keystroke_features(rng, 150))
+    with pytest.raises(ValueError, match='trained through row 400'):
+        retrain(reset, saved, force=True)
+
+
+def test_csv_rows_without_created_at_are_ignored_for_the_watermark(tmp_path):
+    from keystroke.features import FEATURE_NAMES
+
+    path = tmp_path / 'export.csv'
+    header = ','.join(FEATURE_NAMES + ['createdAt'])
+    values = ','.join(['100'] * len(FEATURE_NAMES))
+    path.write_text(f"{header}\n{values},2026-01-02T00:00:00Z\n{values},\n")
+
+    X, latest = read_feature_rows(path)
+    assert X.shape == (2, len(FEATURE_NAMES))
+    assert latest == '2026-01-02T00:00:00Z'
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+import pytest
+
+from serving.jobs import COMPLETED, FAILED, INTERNAL_ERROR, QUEUED, UNREADABLE, WORKER_CRASHED, JobQueue, QueueFull
+from serving.workers import PoolSaturated, WorkerCrashed
+
+
+async def wait_for_status(queue, job_id, statuses=(COMPLETED, FAILED), timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError(f"job stuck in {job['status']}")
+        await asyncio.sleep(0.01)
+
+
+def test_runs_jobs_and_records_results(tmp_path):
+    async def handler(data):
+        if data == b'bad':
+            raise ValueError('unreadable image')
+        return {'size': len(data)}
+
+    async def scenario():
+        queue = JobQueue(handler, jobs_dir=tmp_path, concurrency=1)
+        await queue.start()
+        try:
+            ok = await queue.submit('handwriting', b'abcd', {'filename': 'a.png'})
+            bad = await queue.submit('handwriting', b'bad')
+            assert ok['status'] == QUEUED
+            assert ok['meta'] == {'filename': 'a.png'}
+
+            done = await wait_for_status(queue, ok['id'])
+            failed = await wait_for_status(queue, bad['id'])
+            return done, failed, await queue.stats()
+        finally:
+            await queue.stop()
+
+    done, failed, stats = asyncio.run(scenario())
+    assert done['status'] == COMPLETED and done['result'] == {'size': 4}
+    assert failed['status'] == FAILED and failed['error'] == 'unreadable image'
+    assert failed['error_code'] == UNREADABLE and done['error_code'] is None
+    assert stats['completed'] == 1 and stats['failed'] == 1
+    assert not list((tmp_path / 'spool').iterdir())
+
+
+def test_storage_runs_off_the_event_loop(tmp_path):
+    loop_threads = []
+
+    async def handler(data):
+        return {}
+
+    queue = JobQueue(handler, jobs_dir=tmp_path)
+    execute = queue._execute
+
+    def recording_execute(sql, params=()):
+        loop_threads.append(threading.current_thread() is threading.main_thread())
+        return execute(sql, params)
+
+    queue._execute = recording_execute
+
+    async def scenario():
+        job = await queue.submit('handwriting', b'x')
+        await queue.get(job['id'])
+        await queue.stats()
+
+    asyncio.run(scenario())
+    assert loop_threads and not any(loop_threads)
+
+
+def test_retries_while_the_pool_is_saturated(tmp_path):
+    attempts = []
+
+    async def handler(data):
+        attempts.append(data)
+        if len(attempts) < 3:
+            raise PoolSaturated('busy')
+        return {'ok': True}
+
+    async def scenario():
+        queue = JobQueue(handler, jobs_dir=tmp_path, retry_delay=0.01)
+        await queue.start()
+        try:
+            job = await queue.submit('handwriting', b'x')
+            return await wait_for_status(queue, job['id'])
+        finally:
+            await queue.stop()
+
+    assert asyncio.run(scenario())['status'] == COMPLETED
+    assert len(attempts) == 3
+
+
+def test_rejects_submissions_beyond_max_queued(tmp_path):
+    release = None
+
+    async def handler(data):
+        await release.wait()
+        return {}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        queue = JobQueue(handler, jobs_dir=tmp_path, concurrency=1, max_queued=1)
+        await queue.start()
+        try:
+            await queue.submit('handwriting', b'running')
+            await asyncio.sleep(0.05)
+            await queue.submit('handwriting', b'waiting')
+            with pytest.raises(QueueFull):
+                await queue.submit('handwriting', b'rejected')
+        finally:
+            release.set()
+            await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_requeues_unfinished_jobs_after_a_restart(tmp_path):
+    async def never_started(data):
+        raise AssertionError('queue was not started')
+
+    async def handler(data):
+        return {'restarted': data.decode()}
+
+    async def scenario():
+        first = JobQueue(never_started, jobs_dir=tmp_path)
+        job = await first.submit('handwriting', b'payload')
+        await first.stop()
+
+        second = JobQueue(handler, jobs_dir=tmp_path)
+        await second.start()
+        try:
+            return await wait_for_status(second, job['id'])
+        finally:
+            await second.stop()
+
+    job = asyncio.run(scenario())
+    assert job['status'] == COMPLETED
+    assert job['result'] == {'restarted': 'payload'}
+
+
+def test_server_faults_are_not_reported_as_unreadable(tmp_path):
+    async def handler(data):
+        if data == b'crash':
+            raise WorkerCrashed('Worker process died')
+        raise RuntimeError('boom')
+
+    async def scenario():
+        queue = JobQueue(handler, jobs_dir=tmp_path, concurrency=1)
+        await queue.start()
+        try:
+            crashed = await queue.submit('handwriting', b'crash')
+            broken = await queue.submit('handwriting', b'other')
+            return await wait_for_status(queue, crashed['id']), await wait_for_status(queue, broken['id'])
+        finally:
+            await queue.stop()
+
+    crashed, broken = asyncio.run(scenario())
+    assert crashed['status'] == FAILED and crashed['error_code'] == WORKER_CRASHED
+    assert broken['status'] == FAILED and broken['error_code'] == INTERNAL_ERROR
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from conftest import keystroke_features
+from keystroke.features import (
+    EVENT_FEATURE_NAMES, FEATURE_NAMES, extract_event_features, extract_feature_matrix,
+    padded_event_features, validate_session
+)
+from keystroke.model import anomaly_risk, score_matrix
+
+
+def timing_session(holds, flights):
+    return [{'holdTime': h, 'flightTime': f} for h, f in zip(holds, flights)]
+
+
+def test_feature_matrix_matches_population_statistics():
+    X = extract_feature_matrix([timing_session([100, 120, 80], [0, 200, 300]), timing_session([90], [0])])
+
+    assert X.shape == (2, len(FEATURE_NAMES))
+    holds = np.array([100, 120, 80])
+    assert X[0, 0] == pytest.approx(holds.mean())
+    assert X[0, 1] == pytest.approx(holds.std())
+    assert X[0, 2] == pytest.approx(holds.std() / holds.mean() * 100)
+    # Zero flights (first key) are excluded, as in statistics.js
+    assert X[0, 3] == pytest.approx(250)
+    assert X[1].tolist() == [90, 0, 0, 0, 0, 0]
+
+
+def test_event_features_derive_hold_and_down_down_flight():
+    events = [
+        {'key': 'a', 'keyDownTime': 0, 'keyUpTime': 100},
+        {'key': 'Backspace', 'keyDownTime': 300, 'keyUpTime': 380},
+        {'key': 'b', 'keyDownTime': 1500, 'keyUpTime': 1620},
+    ]
+    E = extract_event_features([events], texts=['b'])[0]
+    features = dict(zip(EVENT_FEATURE_NAMES, E))
+
+    assert features['avgHoldTime'] == pytest.approx(100)
+    assert features['avgFlightTime'] == pytest.approx((300 + 1200) / 2)
+    assert features['backspaceCount'] == 1
+    assert features['pauseCount'] == 1
+    assert features['durationMs'] == 1620
+
+
+def test_padded_and_ragged_inputs_agree():
+    sessions = [
+        [{'key': 'a', 'keyDownTime': 0, 'keyUpTime': 90}, {'key': 'b', 'keyDownTime': 200, 'keyUpTime': 310}],
+        [{'key': 'c', 'keyDownTime': 50, 'keyUpTime': 160}],
+    ]
+    down = np.array([[0, 200], [50, np.nan]])
+    up = np.array([[90, 310], [160, np.nan]])
+    chars = np.ones_like(down)
+
+    np.testing.assert_allclose(
+        padded_event_features(down, up, np.zeros_like(down), chars),
+        extract_event_features(sessions),
+    )
+
+
+@pytest.mark.parametrize('session, message', [
+    ([], 'at least one keystroke'),
+    ([{'holdTime': 'fast', 'flightTime': 10}], 'holdTime must be a number'),
+    ([{'holdTime': 100, 'flightTime': True}], 'flightTime must be a number'),
+    ([{'holdTime': float('nan')}], 'holdTime must be a number'),
+    ([{'holdTime': 0, 'flightTime': 0}], 'no keystroke with a positive hold time'),
+    ([{'key': 'a', 'keyDownTime': None, 'keyUpTime': 5}], 'keyDownTime must be a number'),
+])
+def test_validate_session_rejects_unscorable_input(session, message):
+    with pytest.raises(ValueError, match=message):
+        validate_session(session)
+
+
+def test_validate_session_accepts_missing_optional_timings():
+    session = [{'holdTime': 100}, {'holdTime': 90, 'flightTime': None}]
+    assert validate_session(session) is session
+
+
+def test_risk_is_centred_on_the_model_threshold(keystroke_model):
+    offset = keystroke_model.offset_
+    assert anomaly_risk([offset], offset)[0] == pytest.approx(0.5)
+
+    rng = np.random.default_rng(7)
+    _, flagged, risk = score_matrix(keystroke_model, keystroke_features(rng, 500))
+    assert np.median(risk) < 0.3
+    assert risk[flagged].min() > 0.5
+
+    _, flagged, risk = score_matrix(keystroke_model, keystroke_features(rng, 50, scale=2.5))
+    assert flagged.all()
+    assert risk.min() > 0.9
+
+
+def test_api_scores_a_session(client):
+    rng = np.random.default_rng(3)
+    holds, flights = rng.normal(100, 20, 40), rng.normal(250, 60, 40)
+    response = client.post('/api/ml/keystroke/analyze', json={'timings': timing_session(holds.tolist(), flights.tolist())})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert 0 <= body['risk_score'] <= 1
+    assert set(FEATURE_NAMES) <= set(body['features'])
+
+
+@pytest.mark.parametrize('timings', [[], [{'holdTime': 'x', 'flightTime': 1}], [{'holdTime': None}]])
+def test_api_rejects_unscorable_sessions(client, timings):
+    assert client.post('/api/ml/keystroke/analyze', json={'timings': timings}).status_code == 422
+    batch = {'sessions': [{'timings': timing_session([100], [0])}, {'timings': timings}]}
+    assert client.post('/api/ml/keystroke/analyze_batch', json=batch).status_code == 422
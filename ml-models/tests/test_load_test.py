@@ -0,0 +1,53 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.load_test import compare, percentile, summarize
+
+
+@pytest.mark.parametrize('q, expected', [(0, 1), (10, 1), (11, 2), (50, 5), (95, 10), (99, 10), (100, 10)])
+def test_percentile_is_nearest_rank(q, expected):
+    assert percentile(list(range(1, 11)), q) == expected
+
+
+def test_percentile_of_nothing_is_none():
+    assert percentile([], 95) is None
+
+
+def test_summarize_splits_successes_from_errors():
+    latencies = [0.010, 0.020, 0.030, 0.040]
+    error_latencies = [0.001, 0.500]
+    summary = summarize(latencies, error_latencies, Counter({200: 4, 503: 1, 422: 1}), elapsed=2.0)
+
+    assert summary['requests'] == 6 and summary['successes'] == 4 and summary['errors'] == 2
+    assert summary['error_rate'] == pytest.approx(0.3333)
+    assert summary['status_codes'] == {'200': 4, '422': 1, '503': 1}
+    # Only 2xx responses count towards throughput and the latency percentiles
+    assert summary['rps'] == 2.0
+    assert summary['latency_ms'] == {'mean': 25.0, 'p50': 20.0, 'p95': 40.0, 'p99': 40.0, 'max': 40.0}
+    assert summary['error_latency_ms']['max'] == 500.0
+
+
+def test_summarize_without_requests():
+    summary = summarize([], [], Counter(), elapsed=0)
+    assert summary['error_rate'] == 0.0 and summary['rps'] == 0.0
+    assert summary['latency_ms'] == {'mean': None, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+
+
+def result(endpoint, concurrency, p95):
+    return {'endpoint': endpoint, 'concurrency': concurrency, 'latency_ms': {'p95': p95}}
+
+
+def test_compare_flags_p95_regressions_beyond_the_threshold():
+    baseline = {'results': [result('keystroke', 1, 10.0), result('keystroke', 8, 20.0), result('reading', 1, 5.0)]}
+    report = {'results': [
+        result('keystroke', 1, 11.5),   # +15%: within the threshold
+        result('keystroke', 8, 30.0),   # +50%
+        result('reading', 1, None),     # no successful requests
+        result('fusion', 1, 50.0),      # not in the baseline
+    ]}
+
+    regressions = compare(report, baseline, max_regression=20)
+
+    assert regressions == ['keystroke @ c=8: p95 20.0 -> 30.0 ms (+50%)']
+    assert [r.get('p95_change_pct') for r in report['results']] == [15.0, 50.0, None, None]
@@ -0,0 +1,85 @@
+import re
+
+from serving.metrics import CONTENT_TYPE, MetricsRegistry
+
+SAMPLE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def unescape(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), value)
+
+
+def parse(text):
+    """Exposition text -> ({metric: (help, type)}, {(sample name, labels): value})"""
+    meta, samples = {}, {}
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            name, doc = line[7:].split(' ', 1)
+            meta[name] = (doc, meta.get(name, (None, None))[1])
+        elif line.startswith('# TYPE '):
+            name, kind = line[7:].split(' ', 1)
+            meta[name] = (meta.get(name, (None, None))[0], kind)
+        elif line:
+            match = SAMPLE.match(line)
+            assert match, f"malformed sample line: {line!r}"
+            labels = frozenset((k, unescape(v)) for k, v in LABEL.findall(match['labels'] or ''))
+            samples[(match['name'], labels)] = float(match['value'])
+    return meta, samples
+
+
+def test_renders_help_type_and_escaped_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter('jobs_total', 'Jobs seen', ('kind',))
+    counter.inc(kind='say "hi"\\now\n')
+    counter.inc(2, kind='plain')
+
+    meta, samples = parse(registry.render())
+    assert meta['jobs_total'] == ('Jobs seen', 'counter')
+    assert samples[('jobs_total', frozenset({('kind', 'say "hi"\\now\n')}))] == 1
+    assert samples[('jobs_total', frozenset({('kind', 'plain')}))] == 2
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency', ('model',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, model='m')
+
+    meta, samples = parse(registry.render())
+    assert meta['latency_seconds'] == ('Latency', 'histogram')
+    bucket = lambda le: samples[('latency_seconds_bucket', frozenset({('model', 'm'), ('le', le)}))]
+    assert [bucket('0.1'), bucket('1.0'), bucket('+Inf')] == [1, 3, 4]
+    assert samples[('latency_seconds_count', frozenset({('model', 'm')}))] == 4
+    assert samples[('latency_seconds_sum', frozenset({('model', 'm')}))] == 4.05
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client):
+    client.get('/health')
+    client.get('/api/ml/handwriting/jobs/no-such-job')
+    client.get('/api/ml/handwriting/jobs/another-missing-job')
+    client.get('/definitely/not/a/route')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == CONTENT_TYPE
+    meta, samples = parse(response.text)
+
+    assert meta['ml_api_requests_total'][1] == 'counter'
+    assert meta['ml_api_request_duration_seconds'][1] == 'histogram'
+
+    requests = lambda endpoint, status: samples.get((
+        'ml_api_requests_total',
+        frozenset({('method', 'GET'), ('endpoint', endpoint), ('status', status)}),
+    ), 0)
+    assert requests('/health', '200') >= 1
+    # Both job ids fall under one route label
+    assert requests('/api/ml/handwriting/jobs/{job_id}', '404') >= 2
+    assert requests('unmatched', '404') >= 1
+    assert not any('no-such-job' in dict(labels).get('endpoint', '') for _, labels in samples)
+
+    count = samples[('ml_api_request_duration_seconds_count',
+                     frozenset({('method', 'GET'), ('endpoint', '/health')}))]
+    inf_bucket = samples[('ml_api_request_duration_seconds_bucket',
+                          frozenset({('method', 'GET'), ('endpoint', '/health'), ('le', '+Inf')}))]
+    assert inf_bucket == count >= 1
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from reading.artifact import ReadingArtifact
+from reading.features import (
+    DEFAULT_PROXY_CONSTANTS, MAPPED_FEATURES, build_feature_matrix, comprehension_risk,
+    map_reading_metrics, validate_reading_metrics
+)
+
+METRICS = {'totalReadingTime': 120_000, 'totalRevisits': 5, 'averagePauseDuration': 900, 'passageTotalWords': 100}
+
+
+def test_mapping_scales_to_the_reference_text_length():
+    mapped = map_reading_metrics([METRICS])
+    scale = DEFAULT_PROXY_CONSTANTS['reference_text_words'] / METRICS['passageTotalWords']
+
+    assert mapped['dwell_time_trial'][0] == pytest.approx(120_000 * scale)
+    assert mapped['n_regress_trial'][0] == pytest.approx(5 * 4.0 * scale)
+    assert mapped['mean_fix_dur_trial'][0] == pytest.approx(900 / 1.8)
+    assert mapped['n_within_line_regress_trial'][0] + mapped['n_between_line_regress_trial'][0] == pytest.approx(
+        mapped['n_regress_trial'][0]
+    )
+
+
+def test_pause_durations_stand_in_for_the_average():
+    payload = {'totalReadingTime': 60_000, 'totalRevisits': 0, 'pauseDurations': [600, 1200]}
+    assert map_reading_metrics([payload])['mean_fix_dur_trial'][0] == pytest.approx(900 / 1.8)
+
+
+def test_feature_matrix_follows_the_artifact_column_order():
+    order = list(reversed(MAPPED_FEATURES))
+    X = build_feature_matrix([METRICS, METRICS], order)
+    assert X.shape == (2, len(order))
+    assert X[0, 0] == pytest.approx(map_reading_metrics([METRICS])[order[0]][0])
+
+
+def test_feature_matrix_rejects_features_without_a_web_proxy():
+    with pytest.raises(ValueError, match='cannot be derived'):
+        build_feature_matrix([METRICS], MAPPED_FEATURES + ['T1_Syllables__n_fix_trial'])
+
+
+def test_missing_required_metrics_are_not_defaulted():
+    with pytest.raises(ValueError, match='totalRevisits is required'):
+        map_reading_metrics([{'totalReadingTime': 1000}])
+
+
+@pytest.mark.parametrize('metrics, message', [
+    ({}, 'totalReadingTime is required'),
+    ({'totalReadingTime': 1000}, 'totalRevisits is required'),
+    ({'totalReadingTime': '1000', 'totalRevisits': 1}, 'totalReadingTime is required'),
+    ({'totalReadingTime': 0, 'totalRevisits': 1}, 'must be positive'),
+    ({'totalReadingTime': 1000, 'totalRevisits': -1}, 'must not be negative'),
+    ({**METRICS, 'pauseDurations': [100, 'x']}, 'pauseDurations'),
+    ({**METRICS, 'comprehensionScore': 140}, 'between 0 and 100'),
+])
+def test_validate_reading_metrics(metrics, message):
+    with pytest.raises(ValueError, match=message):
+        validate_reading_metrics(metrics)
+
+
+def test_comprehension_risk_is_nan_when_not_sent():
+    risk = comprehension_risk([{'comprehensionScore': 80}, {}])
+    assert risk[0] == pytest.approx(0.2)
+    assert np.isnan(risk[1])
+
+
+def test_artifact_rejects_unknown_format(reading_artifact_payload, tmp_path):
+    with pytest.raises(ValueError, match='format version'):
+        ReadingArtifact({**reading_artifact_payload, 'format_version': 99}, tmp_path / 'a.joblib')
+
+
+def test_api_scores_reading_metrics(client):
+    response = client.post('/api/ml/reading/analyze', json={'metrics': {**METRICS, 'comprehensionScore': 90}})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert 0 <= body['risk_score'] <= 1
+    assert set(body['features']) == set(MAPPED_FEATURES)
+
+
+@pytest.mark.parametrize('metrics', [{}, {'totalReadingTime': 50_000}, {'totalReadingTime': None, 'totalRevisits': 2}])
+def test_api_rejects_incomplete_metrics(client, metrics):
+    assert client.post('/api/ml/reading/analyze', json={'metrics': metrics}).status_code == 422
+    batch = {'items': [{'metrics': METRICS}, {'metrics': metrics}]}
+    assert client.post('/api/ml/reading/analyze_batch', json=batch).status_code == 422
+
+
+def test_api_reports_model_errors_as_server_faults(client, monkeypatch):
+    import main
+
+    class MismatchedModel:
+        feature_names = MAPPED_FEATURES
+        proxy_constants = {}
+
+        def predict_proba(self, X):
+            raise ValueError('Expected 12 features, got 10')
+
+    monkeypatch.setattr(main, 'get_model', lambda name: (MismatchedModel(), 'broken'))
+    assert client.post('/api/ml/reading/analyze', json={'metrics': METRICS}).status_code == 500
+    batch = {'items': [{'metrics': METRICS}]}
+    assert client.post('/api/ml/reading/analyze_batch', json=batch).status_code == 500
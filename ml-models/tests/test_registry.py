@@ -0,0 +1,139 @@
+import os
+import threading
+
+import pytest
+
+from serving.registry import ModelNotAvailable, ModelRegistry
+
+
+class Artifact:
+    def __init__(self, path):
+        self.text = path.read_text()
+
+
+def make_registry(tmp_path, **kwargs):
+    registry = ModelRegistry(eager=False, watch_interval=0)
+
+    def locate():
+        paths = sorted(tmp_path.glob('model_v*.txt'))
+        return paths[-1] if paths else None
+
+    registry.register('model', locate, Artifact, **kwargs)
+    return registry
+
+
+def write(tmp_path, version, text):
+    path = tmp_path / f'model_v{version}.txt'
+    path.write_text(text)
+    return path
+
+
+def test_loads_lazily_on_first_use(tmp_path):
+    write(tmp_path, 1, 'one')
+    registry = make_registry(tmp_path)
+    assert registry.status()['model']['state'] == 'not_loaded'
+
+    model, version = registry.get_versioned('model')
+    assert (model.text, version) == ('one', '1')
+    assert registry.get('model') is model
+    assert registry.status()['model']['state'] == 'loaded'
+
+
+def test_missing_artifact_raises(tmp_path):
+    registry = make_registry(tmp_path)
+    with pytest.raises(ModelNotAvailable):
+        registry.get('model')
+    assert registry.status()['model']['state'] == 'missing'
+
+
+def test_missing_artifact_is_not_searched_for_on_every_call(tmp_path, monkeypatch):
+    import serving.registry as registry_module
+
+    now = [100.0]
+    monkeypatch.setattr(registry_module.time, 'monotonic', lambda: now[0])
+    registry = ModelRegistry(eager=False, watch_interval=0, missing_retry=5)
+    lookups = []
+
+    def locate():
+        lookups.append(1)
+        paths = sorted(tmp_path.glob('model_v*.txt'))
+        return paths[-1] if paths else None
+
+    registry.register('model', locate, Artifact, required=False)
+    for _ in range(3):
+        with pytest.raises(ModelNotAvailable):
+            registry.get('model')
+    assert len(lookups) == 1
+
+    # An artifact published later is found once the retry interval passes
+    write(tmp_path, 1, 'one')
+    now[0] += 6
+    assert registry.get('model').text == 'one'
+    assert len(lookups) == 2
+
+
+def test_refresh_hot_swaps_a_new_version(tmp_path):
+    write(tmp_path, 1, 'one')
+    registry = make_registry(tmp_path)
+    old_model, _ = registry.get_versioned('model')
+
+    write(tmp_path, 2, 'two')
+    registry.refresh()
+
+    model, version = registry.get_versioned('model')
+    assert (model.text, version) == ('two', '2')
+    # Requests holding the previous model keep a working object
+    assert old_model.text == 'one'
+
+
+def test_refresh_reloads_a_rewritten_artifact(tmp_path):
+    path = write(tmp_path, 1, 'one')
+    registry = make_registry(tmp_path)
+    registry.get('model')
+
+    path.write_text('one, retrained')
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    registry.refresh()
+    assert registry.get('model').text == 'one, retrained'
+
+
+def test_broken_artifact_keeps_serving_the_previous_version(tmp_path):
+    write(tmp_path, 1, 'one')
+    registry = make_registry(tmp_path)
+    registry.get('model')
+
+    (tmp_path / 'model_v2.txt').mkdir()  # read_text fails on a directory
+    registry.refresh()
+
+    model, version = registry.get_versioned('model')
+    assert (model.text, version) == ('one', '1')
+    assert registry.status()['model']['error'] is not None
+
+
+def test_model_and_version_always_come_from_the_same_load(tmp_path):
+    write(tmp_path, '001', 'text 1')
+    registry = make_registry(tmp_path, version_of=lambda model, path: model.text)
+    registry.get('model')
+
+    mismatches = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            model, version = registry.get_versioned('model')
+            if model.text != version:
+                mismatches.append((model.text, version))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(2, 40):
+            write(tmp_path, f'{i:03d}', f'text {i}')
+            registry.refresh()
+    finally:
+        stop.set()
+        reader.join()
+
+    assert registry.get_versioned('model')[1] == 'text 39'
+    assert not mismatches
@@ -0,0 +1,51 @@
+import pytest
+
+from serving.startup import parse_importtime, summarize
+
+# `python -X importtime -c 'import main'` stderr, trimmed. Children are
+# printed before their parent, one extra two-space indent per level.
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       700 |        700 | json
+import time:      1500 |       1500 |       numpy.core
+import time:       800 |       2300 |     numpy
+import time:      4000 |       4000 |     sklearn
+import time:       300 |       6600 |   keystroke.model
+import time:      2000 |       2000 |       scipy.linalg
+import time:      1000 |       3000 |     scipy
+import time:       500 |       3500 |   joblib
+import time:       200 |      10300 | main
+Traceback lines and other stderr are ignored
+"""
+
+
+def test_parse_importtime_depth_and_first_party_importer():
+    rows = {row["module"]: row for row in parse_importtime(IMPORTTIME)}
+
+    assert list(rows) == ['json', 'numpy.core', 'numpy', 'sklearn', 'keystroke.model',
+                          'scipy.linalg', 'scipy', 'joblib', 'main']
+    assert {name: row["depth"] for name, row in rows.items()} == {
+        'json': 0, 'numpy.core': 3, 'numpy': 2, 'sklearn': 2, 'keystroke.model': 1,
+        'scipy.linalg': 3, 'scipy': 2, 'joblib': 1, 'main': 0,
+    }
+    assert rows['keystroke.model']["self_us"] == 300 and rows['keystroke.model']["cumulative_us"] == 6600
+
+    importers = {name: row["imported_by"] for name, row in rows.items()}
+    # The nearest first-party ancestor wins, even through third-party modules
+    assert importers['sklearn'] == importers['numpy.core'] == 'keystroke.model'
+    assert importers['scipy.linalg'] == importers['joblib'] == importers['keystroke.model'] == 'main'
+    assert importers['main'] is None and importers['json'] is None
+
+
+def test_summarize_flags_heavy_frameworks():
+    summary = summarize(parse_importtime(IMPORTTIME), top=2)
+
+    assert summary["modules"] == 9
+    assert summary["total_import_s"] == pytest.approx(0.011)
+    assert [item["module"] for item in summary["slowest_modules"]] == ['main', 'keystroke.model']
+    assert summary["packages"][0] == {"package": 'sklearn', "self_s": 0.004, "share": 0.3636}
+    assert summary["heavy_modules"] == {
+        'sklearn': {"import_s": 0.004, "imported_by": 'keystroke.model'},
+        'scipy': {"import_s": 0.003, "imported_by": 'main'},
+        'joblib': {"import_s": 0.0035, "imported_by": 'main'},
+    }
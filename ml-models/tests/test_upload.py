@@ -0,0 +1,62 @@
+import io
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from handwriting.upload import UploadTooLarge, check_image_limits, image_dimensions, read_upload
+
+
+def encode(ext, width=40, height=30):
+    ok, data = cv2.imencode(ext, np.full((height, width), 200, np.uint8))
+    assert ok
+    return bytearray(data.tobytes())
+
+
+@pytest.mark.parametrize('ext', ['.png', '.jpg', '.bmp'])
+def test_reads_dimensions_from_the_header(ext):
+    assert image_dimensions(encode(ext)) == (40, 30)
+
+
+def test_reads_gif_dimensions():
+    header = b'GIF89a' + struct.pack('<HH', 640, 480) + bytes(20)
+    assert image_dimensions(header) == (640, 480)
+
+
+def test_rejects_images_over_the_pixel_limit():
+    with pytest.raises(UploadTooLarge):
+        check_image_limits(encode('.png', 200, 100), max_pixels=10_000)
+    assert check_image_limits(encode('.png', 100, 100), max_pixels=10_000) == (100, 100)
+
+
+@pytest.mark.parametrize('ext', ['.webp', '.tiff'])
+def test_rejects_formats_without_a_readable_header(ext):
+    try:
+        data = encode(ext)
+    except cv2.error:
+        pytest.skip(f'OpenCV built without {ext}')
+    with pytest.raises(ValueError, match='Unsupported image format'):
+        check_image_limits(data)
+
+
+def test_read_upload_fills_one_buffer():
+    payload = bytes(range(256)) * 5000
+    buffer = read_upload(io.BytesIO(payload))
+    assert isinstance(buffer, bytearray)
+    assert buffer == payload
+
+
+def test_read_upload_enforces_byte_limit_and_empty_files():
+    with pytest.raises(UploadTooLarge):
+        read_upload(io.BytesIO(b'x' * 11), max_bytes=10)
+    with pytest.raises(ValueError, match='Empty'):
+        read_upload(io.BytesIO(b''))
+
+
+@pytest.mark.parametrize('endpoint', ['/api/ml/handwriting/analyze', '/api/ml/handwriting/jobs'])
+def test_api_rejects_unsupported_formats(client, endpoint):
+    tiff = b'II*\x00' + bytes(60)
+    response = client.post(endpoint, files={'file': ('sample.tiff', tiff, 'image/tiff')})
+    assert response.status_code == 422
+    assert 'Unsupported image format' in response.json()['detail']
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import pytest
+
+from serving.workers import BoundedProcessPool, PoolSaturated, WorkerCrashed
+
+
+def square(x):
+    return x * x
+
+
+def die(_):
+    os._exit(1)
+
+
+def sleep_and_return(seconds):
+    import time
+    time.sleep(seconds)
+    return seconds
+
+
+def test_runs_in_a_worker_process():
+    pool = BoundedProcessPool(max_workers=1, max_pending=0)
+    try:
+        assert asyncio.run(pool.run(square, 7)) == 49
+    finally:
+        pool.shutdown()
+
+
+def test_rejects_beyond_capacity():
+    pool = BoundedProcessPool(max_workers=1, max_pending=0)
+
+    async def scenario():
+        first = asyncio.create_task(pool.run(sleep_and_return, 0.3))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolSaturated):
+            await pool.run(square, 2)
+        return await first
+
+    try:
+        assert asyncio.run(scenario()) == 0.3
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_recovers_after_a_worker_dies():
+    pool = BoundedProcessPool(max_workers=1, max_pending=1)
+
+    async def scenario():
+        with pytest.raises(WorkerCrashed):
+            await pool.run(die, None)
+        return await pool.run(square, 3)
+
+    try:
+        assert asyncio.run(scenario()) == 9
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_replaces_an_executor_shut_down_before_submit():
+    pool = BoundedProcessPool(max_workers=1, max_pending=0)
+
+    async def scenario():
+        executor = pool.start()
+        executor.shutdown()
+        return await pool.run(square, 4)
+
+    try:
+        assert asyncio.run(scenario()) == 16
+        assert pool.in_flight == 0
+    finally:
+        pool.shutdown()
+
+
+def test_cancelled_callers_keep_their_slot_until_the_worker_finishes():
+    pool = BoundedProcessPool(max_workers=1, max_pending=0)
+
+    async def scenario():
+        await pool.run(square, 1)  # start the worker process
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.run(sleep_and_return, 0.5), 0.1)
+        # The job is still running in the worker, so the pool is still full
+        assert pool.in_flight == 1
+        with pytest.raises(PoolSaturated):
+            await pool.run(square, 2)
+        await asyncio.sleep(0.6)
+        assert pool.in_flight == 0
+        return await pool.run(square, 3)
+
+    try:
+        assert asyncio.run(scenario()) == 9
+    finally:
+        pool.shutdown()
+
+
+def test_stats_use_snake_case():
+    assert BoundedProcessPool(max_workers=2, max_pending=3).stats() == {
+        'workers': 2, 'max_pending': 3, 'in_flight': 0,
+    }